@@ -1,8 +1,25 @@
+import os
 import sys
+import atexit
 import argparse
 from mathexlab.kernel.session import KernelSession
 from mathexlab.kernel.executor import execute
 
+_HISTORY_FILE = os.path.expanduser("~/.mathexlab_history")
+
+def _enable_history():
+    """Line editing and persistent history for interactive sessions."""
+    try:
+        import readline
+    except ImportError:  # e.g. Windows without pyreadline
+        return
+    try:
+        readline.read_history_file(_HISTORY_FILE)
+    except OSError:
+        pass
+    readline.set_history_length(1000)
+    atexit.register(readline.write_history_file, _HISTORY_FILE)
+
 def main():
     parser = argparse.ArgumentParser(description="MathexLab CLI")
     parser.add_argument('file', nargs='?', help="Script file to run")
@@ -18,8 +35,12 @@ def main():
             execute(code, session)
         except Exception as e:
             print(f"Error reading file: {e}")
+    elif not sys.stdin.isatty():
+        # Piped input (cat script.m | mathexlab): run it as one program
+        execute(sys.stdin.read(), session)
     else:
         # Start REPL
+        _enable_history()
         print("MathexLab CLI 1.0. Type 'exit' to quit.")
         while True:
             try:
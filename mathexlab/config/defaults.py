@@ -2,80 +2,100 @@
 """
 MathexLab global matplotlib defaults.
 Max Potential: Research Standard Dark Theme
+
+Matplotlib is imported only when the theme is actually applied, so
+non-plotting (CLI) sessions never pay for it.
 """
 
 from __future__ import annotations
-import matplotlib
-from cycler import cycler
 
-def apply():
-    """Apply MathexLab 'Research Standard' Dark Theme."""
-    try:
-        rc = matplotlib.rcParams
+# Neon/Pastel Hybrid palette for Dark Mode
+_COLORS = (
+    "#00E5FF",  # Cyan
+    "#FF4081",  # Pink
+    "#76FF03",  # Lime
+    "#FFEA00",  # Yellow
+    "#EA80FC",  # Violet
+    "#FF9100",  # Orange
+    "#FFFFFF",  # White
+)
+
+_BG_DARK = "#1e1e1e"
+_BG_LIGHTER = "#252526"
+
+_RC_DICT: dict = {
+    # ==========================================================
+    # 1. LAYOUT & RESOLUTION
+    # ==========================================================
+    # Use 'constrained_layout' for professional spacing (prevents overlap)
+    "figure.constrained_layout.use": True,
+
+    # High DPI for crisp rendering
+    "figure.dpi": 100,
+    "savefig.dpi": 300,
+    "savefig.bbox": "tight",
 
-        # ==========================================================
-        # 1. LAYOUT & RESOLUTION
-        # ==========================================================
-        # Use 'constrained_layout' for professional spacing (prevents overlap)
-        rc["figure.constrained_layout.use"] = True
-        
-        # High DPI for crisp rendering
-        rc["figure.dpi"] = 100
-        rc["savefig.dpi"] = 300
-        rc["savefig.bbox"] = "tight"
+    # ==========================================================
+    # 2. TYPOGRAPHY
+    # ==========================================================
+    "font.family": "sans-serif",
+    "font.sans-serif": ["DejaVu Sans", "Arial", "Helvetica"],
+    "font.size": 11,
+    "mathtext.fontset": "stixsans",  # Math matches text
 
-        # ==========================================================
-        # 2. TYPOGRAPHY
-        # ==========================================================
-        rc["font.family"] = "sans-serif"
-        rc["font.sans-serif"] = ["DejaVu Sans", "Arial", "Helvetica"]
-        rc["font.size"] = 11
-        rc["mathtext.fontset"] = "stixsans"  # Math matches text
+    # ==========================================================
+    # 3. COLORS
+    # ==========================================================
+    # "axes.prop_cycle" is built from _COLORS in _rc_params()
 
-        # ==========================================================
-        # 3. COLORS (Neon/Pastel Hybrid for Dark Mode)
-        # ==========================================================
-        colors = [
-            "#00E5FF",  # Cyan
-            "#FF4081",  # Pink
-            "#76FF03",  # Lime
-            "#FFEA00",  # Yellow
-            "#EA80FC",  # Violet
-            "#FF9100",  # Orange
-            "#FFFFFF"   # White
-        ]
-        rc["axes.prop_cycle"] = cycler(color=colors)
+    # ==========================================================
+    # 4. COMPONENT STYLING
+    # ==========================================================
+    "figure.facecolor": _BG_DARK,
+    "axes.facecolor": _BG_LIGHTER,
+    "axes.edgecolor": "#666666",
+    "axes.labelcolor": "#E0E0E0",
+    "axes.titlecolor": "#FFFFFF",
+    "text.color": "#E0E0E0",
+    "xtick.color": "#CCCCCC",
+    "ytick.color": "#CCCCCC",
 
-        # ==========================================================
-        # 4. COMPONENT STYLING
-        # ==========================================================
-        bg_dark = "#1e1e1e"
-        bg_lighter = "#252526"
-        
-        rc["figure.facecolor"] = bg_dark
-        rc["axes.facecolor"] = bg_lighter
-        rc["axes.edgecolor"] = "#666666"
-        rc["axes.labelcolor"] = "#E0E0E0"
-        rc["axes.titlecolor"] = "#FFFFFF"
-        rc["text.color"] = "#E0E0E0"
-        rc["xtick.color"] = "#CCCCCC"
-        rc["ytick.color"] = "#CCCCCC"
+    # ==========================================================
+    # 5. DATA REPRESENTATION
+    # ==========================================================
+    "lines.linewidth": 2.0,
+    "lines.markersize": 7,
+    "axes.grid": True,
+    "grid.color": "#555555",
+    "grid.linestyle": "-",
+    "grid.linewidth": 0.6,
+    "grid.alpha": 0.4,
 
-        # ==========================================================
-        # 5. DATA REPRESENTATION
-        # ==========================================================
-        rc["lines.linewidth"] = 2.0
-        rc["lines.markersize"] = 7
-        rc["axes.grid"] = True
-        rc["grid.color"] = "#555555"
-        rc["grid.linestyle"] = "-"
-        rc["grid.linewidth"] = 0.6
-        rc["grid.alpha"] = 0.4
-        
-        # Legend styling
-        rc["legend.frameon"] = True
-        rc["legend.framealpha"] = 0.9
-        rc["legend.facecolor"] = "#2d2d2d"
+    # Legend styling
+    "legend.frameon": True,
+    "legend.framealpha": 0.9,
+    "legend.facecolor": "#2d2d2d",
+}
 
+_applied = False
+
+def _rc_params() -> dict:
+    from cycler import cycler
+    return {**_RC_DICT, "axes.prop_cycle": cycler(color=list(_COLORS))}
+
+def apply():
+    """Apply MathexLab 'Research Standard' Dark Theme (once per process)."""
+    global _applied
+    if _applied:
+        return
+    try:
+        import matplotlib
+        matplotlib.rcParams.update(_rc_params())
+        _applied = True
     except Exception:
-        pass
\ No newline at end of file
+        pass
+
+def rc_context():
+    """Context manager applying the theme only within a 'with' block."""
+    import matplotlib
+    return matplotlib.rc_context(_rc_params())
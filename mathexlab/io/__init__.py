@@ -1,6 +1,27 @@
 # from .saver import save_workspace, load_workspace
 from .mfile import read_mfile
 # from .exporter import writematrix, saveas
-from .saver import save_workspace, load_workspace
-from .exporter import writematrix, saveas
-from .datareader import readtable, readmatrix, csvread  # <--- NEW
\ No newline at end of file
+
+# The readers/writers pull in pandas, pyarrow and h5py, so they are
+# imported on first attribute access rather than with the package.
+_LAZY_ATTRS = {
+    "save_workspace": ".saver",
+    "load_workspace": ".saver",
+    "writematrix": ".exporter",
+    "saveas": ".exporter",
+    "readtable": ".datareader",
+    "readmatrix": ".datareader",
+    "csvread": ".datareader",
+}
+
+__all__ = ["read_mfile", *_LAZY_ATTRS]
+
+
+def __getattr__(name):
+    mod = _LAZY_ATTRS.get(name)
+    if mod is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(mod, __name__), name)
+    globals()[name] = value
+    return value
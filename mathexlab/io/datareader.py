@@ -1,27 +1,134 @@
 import os
+import re
+import importlib.util
 import pandas as pd
 import numpy as np
 import scipy.io
+from scipy.io.matlab import mat_struct
 from mathexlab.math.arrays import MatlabArray
 from mathexlab.math.structs import MatlabStruct
 
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+# Arrow's multithreaded CSV parser is optional; the C engine is the fallback.
+_HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+# Rust-based streaming workbook reader, much faster than openpyxl's DOM parse
+_HAS_CALAMINE = importlib.util.find_spec("python_calamine") is not None
+
+_EXCEL_EXTS = ('.xls', '.xlsx', '.xlsm', '.xlsb', '.ods')
+
+# Text columns are converted by Arrow's C kernels when pyarrow is present
+_STRING_DTYPE = "string[pyarrow]" if _HAS_PYARROW else "string"
+
+# Characters not allowed in a MATLAB identifier (stripped from column names)
+_COL_CLEAN = re.compile(r"[^0-9A-Za-z_]")
+
+# Files above this size are streamed by readmatrix instead of parsed whole
+_STREAM_THRESHOLD = 64 * 1024 * 1024
+_CHUNK_ROWS = 200_000
+# Rows parsed up front to find the column count of a streamed file
+_PROBE_ROWS = 1024
+
+
+def _read_csv(filename, **kwargs):
+    """
+    Parses a CSV in a single typed pass (pyarrow engine, else pandas' C engine).
+    """
+    if _HAS_PYARROW:
+        try:
+            return pd.read_csv(filename, engine="pyarrow", **kwargs)
+        except (TypeError, ValueError):
+            # pyarrow rejects some kwargs (e.g. skipfooter) and ragged rows
+            pass
+    return pd.read_csv(filename, engine="c", low_memory=False, **kwargs)
+
+
+def _read_excel(filename, **kwargs):
+    """
+    Reads a workbook with calamine when available, else pandas' default engine.
+    nrows/usecols pass straight through so callers can skip unneeded cells.
+    """
+    if _HAS_CALAMINE and 'engine' not in kwargs:
+        kwargs['engine'] = "calamine"
+    return pd.read_excel(filename, **kwargs)
+
+
+def _coerce_numeric(df):
+    """Coerces only the non-numeric columns; numeric ones are already typed."""
+    for col in df.columns:
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    return df
+
+
+def _read_csv_chunked(filename, **kwargs):
+    """
+    Streams a large CSV into a preallocated float64 buffer chunk by chunk,
+    so peak memory stays near one chunk instead of the whole parsed frame.
+    """
+    names = kwargs.pop("names", None)
+    # One spare column catches rows wider than ncols, which pandas would
+    # otherwise drop or shift into the index. An explicit usecols already
+    # fixes the width.
+    spare = "usecols" not in kwargs
+    if spare and names is not None:
+        ncols = len(names)
+    else:
+        probe = pd.read_csv(filename, header=None, nrows=_PROBE_ROWS, names=names, **kwargs)
+        ncols = probe.shape[1]
+
+    # Estimate the row count from the line density of the first 64KB
+    with open(filename, 'rb') as f:
+        head = f.read(1 << 16)
+    rows_per_byte = max(head.count(b'\n'), 1) / max(len(head), 1)
+    capacity = int(os.path.getsize(filename) * rows_per_byte) + 1
+
+    out = np.empty((capacity, ncols), dtype=np.float64)
+    write = 0
+    kwargs["names"] = range(ncols + 1) if spare else names
+    reader = pd.read_csv(
+        filename, header=None, chunksize=_CHUNK_ROWS, engine="c", **kwargs
+    )
+    for chunk in reader:
+        if spare:
+            extra = chunk.pop(ncols)
+            if extra.notna().any():
+                row = extra.index[extra.notna().argmax()] + 1
+                raise ValueError(f"Row {row} has more than {ncols} fields")
+        block = _coerce_numeric(chunk).to_numpy(dtype=np.float64, na_value=np.nan)
+        n = block.shape[0]
+        if write + n > out.shape[0]:
+            # Estimate was short: double the capacity
+            grown = np.empty((max(2 * out.shape[0], write + n), ncols), dtype=np.float64)
+            grown[:write] = out[:write]
+            out = grown
+        np.copyto(out[write:write + n], block)
+        write += n
+
+    out = out[:write]
+    # Drop rows/cols that are all NaN (headers/index)
+    nan_mask = np.isnan(out)
+    return out[~nan_mask.all(axis=1)][:, ~nan_mask.all(axis=0)]
+
 def readtable(filename, **kwargs):
     """
     T = readtable(filename)
     Returns a struct of arrays (since we don't have a Table class yet).
     """
-    if not os.path.exists(filename):
-        raise FileNotFoundError(f"File not found: {filename}")
-
     # Auto-detect format
     ext = os.path.splitext(filename)[1].lower()
     
     try:
-        if ext in ('.xls', '.xlsx'):
-            df = pd.read_excel(filename, **kwargs)
+        if ext in _EXCEL_EXTS:
+            df = _read_excel(filename, **kwargs)
         else:
             # Default to CSV for everything else
-            df = pd.read_csv(filename, **kwargs)
+            df = _read_csv(filename, **kwargs)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found: {filename}") from None
     except Exception as e:
         raise IOError(f"Could not read table: {str(e)}")
 
@@ -29,16 +136,16 @@ def readtable(filename, **kwargs):
     data = {}
     for col in df.columns:
         # Clean column name (MATLAB valid identifier)
-        safe_col = "".join(c for c in col if c.isalnum() or c=='_')
-        if not safe_col: safe_col = "Var"
-        
-        val = df[col].values
+        safe_col = _COL_CLEAN.sub("", str(col)) or "Var"
+
+        series = df[col]
         # Convert strings/objects, keep numbers
-        if val.dtype == object:
-            # Convert to list of strings
-            val = [str(x) for x in val]
-        
-        data[safe_col] = MatlabArray(val)
+        if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            val = series.to_numpy()
+        else:
+            val = series.astype(_STRING_DTYPE).to_numpy(dtype=object, na_value="")
+
+        data[safe_col] = MatlabArray(val, copy=False)
 
     return MatlabStruct(**data)
 
@@ -49,17 +156,21 @@ def readmatrix(filename, **kwargs):
     """
     # Force pandas to ignore headers and return numpy array
     try:
-        if filename.endswith(('.xls', '.xlsx')):
-            df = pd.read_excel(filename, header=None, **kwargs)
+        if filename.lower().endswith(_EXCEL_EXTS):
+            df = _read_excel(filename, header=None, **kwargs)
+        elif os.path.getsize(filename) > _STREAM_THRESHOLD:
+            return MatlabArray(_read_csv_chunked(filename, **kwargs), copy=False)
         else:
-            df = pd.read_csv(filename, header=None, **kwargs)
-            
-        # Attempt to find the numeric block
-        df_numeric = df.apply(pd.to_numeric, errors='coerce')
+            df = _read_csv(filename, header=None, **kwargs)
+
+        # Attempt to find the numeric block (header text becomes NaN)
+        df_numeric = _coerce_numeric(df)
         # Drop rows/cols that are all NaN (headers/index)
         df_numeric = df_numeric.dropna(how='all', axis=0).dropna(how='all', axis=1)
-        
-        return MatlabArray(df_numeric.values)
+
+        return MatlabArray(np.ascontiguousarray(df_numeric.to_numpy()), copy=False)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found: {filename}") from None
     except Exception as e:
         raise IOError(f"Could not read matrix: {str(e)}")
 
@@ -67,30 +178,108 @@ def csvread(filename):
     """Legacy MATLAB csvread."""
     return readmatrix(filename)
 
-def loadmat(filename):
+def _wrap_mat_value(v):
+    """Wraps one scipy.io.loadmat value for the workspace."""
+    if isinstance(v, np.ndarray):
+        # scipy allocated this array for us: wrap it without another copy
+        return MatlabArray(v, copy=False)
+    if isinstance(v, mat_struct):
+        return MatlabStruct(**{f: _wrap_mat_value(getattr(v, f)) for f in v._fieldnames})
+    return MatlabArray(v)
+
+def _mat73_class(obj):
+    cls = obj.attrs.get("MATLAB_class", b"double")
+    return cls.decode() if isinstance(cls, bytes) else str(cls)
+
+def _mat73_array(filename, ds):
+    """
+    Reads a v7.3 numeric dataset. Contiguous, uncompressed datasets are
+    memory-mapped (copy-on-write) so only the pages used are read.
+    """
+    offset = ds.id.get_offset()
+    if (offset is not None and ds.chunks is None and ds.compression is None
+            and ds.dtype.names is None and ds.size):
+        arr = np.memmap(filename, dtype=ds.dtype, mode="c", offset=offset, shape=ds.shape)
+    else:
+        arr = ds[()]
+    if arr.dtype.names and {"real", "imag"} <= set(arr.dtype.names):
+        arr = arr["real"] + 1j * arr["imag"]
+    # HDF5 stores MATLAB's column-major data with reversed dimensions
+    return arr.T
+
+def _mat73_value(f, filename, obj):
+    """Converts one v7.3 (HDF5) dataset or group to a workspace value."""
+    if isinstance(obj, h5py.Group):
+        # struct: one member per field
+        return MatlabStruct(**{k: _mat73_value(f, filename, v) for k, v in obj.items()})
+
+    cls = _mat73_class(obj)
+    if obj.attrs.get("MATLAB_empty", 0):
+        return MatlabArray(np.zeros((0, 0)))
+    if cls == "char":
+        chars = np.asarray(obj[()], dtype=np.uint16).T
+        rows = ["".join(map(chr, row)) for row in chars]
+        # Wrapped like _wrap_mat_value wraps scipy's str / char arrays
+        return MatlabArray(rows[0] if len(rows) == 1 else np.array(rows))
+    if cls == "cell":
+        refs = obj[()].T
+        cells = np.empty(refs.shape, dtype=object)
+        for idx, ref in np.ndenumerate(refs):
+            cells[idx] = _mat73_value(f, filename, f[ref])
+        return MatlabArray(np.squeeze(cells), copy=False)
+
+    arr = _mat73_array(filename, obj)
+    if cls == "logical":
+        arr = arr.astype(bool)
+    return MatlabArray(np.squeeze(arr), copy=False)
+
+def _loadmat_v73(filename, variable_names=None):
+    """Reads a MATLAB -v7.3 (HDF5) .mat file with h5py."""
+    if h5py is None:
+        raise IOError("h5py is required to read -v7.3 .mat files (HDF5 based).")
+    data = {}
+    with h5py.File(filename, "r") as f:
+        for name, obj in f.items():
+            if name.startswith("#"):
+                continue  # #refs# / #subsystem# hold cell contents and metadata
+            if variable_names is not None and name not in variable_names:
+                continue
+            data[name] = _mat73_value(f, filename, obj)
+    return MatlabStruct(**data)
+
+def loadmat(filename, variable_names=None, **kwargs):
     """
     S = loadmat(filename)
-    Reads MATLAB .mat files (versions 4, 5, 7.1).
+    Reads MATLAB .mat files (versions 4, 5, 7.1, and 7.3 through h5py).
+    variable_names limits parsing to the listed variables.
+    Extra kwargs (mat_dtype, ...) go to scipy.io.loadmat.
     """
-    if not os.path.exists(filename):
-        raise FileNotFoundError(f"File not found: {filename}")
-        
     try:
         # struct_as_record=False loads structs as objects, simpler for us to wrap
-        mat_dict = scipy.io.loadmat(filename, struct_as_record=False, squeeze_me=True)
-        
+        mat_dict = scipy.io.loadmat(
+            filename, variable_names=variable_names,
+            struct_as_record=False, squeeze_me=True, **kwargs
+        )
+
         clean_data = {}
         for k, v in mat_dict.items():
             # Skip internal metadata keys (__header__, etc.)
             if k.startswith('__'):
                 continue
-            
-            # Wrap in MatlabArray
-            clean_data[k] = MatlabArray(v)
-            
+
+            clean_data[k] = _wrap_mat_value(v)
+
         return MatlabStruct(**clean_data)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found: {filename}") from None
     except NotImplementedError:
-        raise IOError("MathexLab cannot read -v7.3 .mat files (HDF5 based) yet. Please save as -v7.")
+        # scipy refuses -v7.3 files, which are HDF5 containers
+        pass
+    except Exception as e:
+        raise IOError(f"Failed to load .mat file: {str(e)}")
+
+    try:
+        return _loadmat_v73(filename, variable_names)
     except Exception as e:
         raise IOError(f"Failed to load .mat file: {str(e)}")
 
@@ -1,16 +1,59 @@
 import numpy as np
+import scipy.sparse
 from mathexlab.math.arrays import MatlabArray
 from mathexlab.plotting.state import plot_manager
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+
+# Rows formatted per write() in the numpy fallback
+_WRITE_BLOCK = 4096
+
+def _write_csv_arrow(M, filename):
+    # Arrow formats numbers in C; columns are zero-copy views of M
+    table = pa.table({str(i): M[:, i] for i in range(M.shape[1])})
+    pacsv.write_csv(table, filename, pacsv.WriteOptions(include_header=False))
+
+def _format_number(v):
+    # Same text Arrow writes: shortest round-trip digits, positional for
+    # 1e-6 <= |v| < 1e10, otherwise scientific with an unpadded exponent
+    if not np.isfinite(v) or v == 0 or 1e-6 <= abs(v) < 1e10:
+        return np.format_float_positional(v, unique=True, trim="-")
+    return np.format_float_scientific(v, unique=True, trim="-", exp_digits=1)
+
+def _write_csv_numpy(M, filename):
+    fmt = str if M.dtype.kind in "iu" else _format_number
+    with open(filename, "w") as f:
+        for start in range(0, M.shape[0], _WRITE_BLOCK):
+            block = M[start:start + _WRITE_BLOCK]
+            f.write("\n".join([",".join(map(fmt, row)) for row in block]))
+            f.write("\n")
+
 def writematrix(M, filename):
     """
     Exports a matrix to a CSV/Text file.
     """
     if isinstance(M, MatlabArray):
         M = M._data
-        
+    if scipy.sparse.issparse(M):
+        M = M.toarray()
+
     try:
-        np.savetxt(filename, M, delimiter=",", fmt="%.6g")
+        M = np.asarray(M)
+        if M.ndim < 2:
+            M = M.reshape(-1, 1)
+        if M.dtype == bool:
+            M = M.astype(np.uint8)
+
+        if M.ndim != 2 or M.dtype.kind not in "iuf":
+            np.savetxt(filename, M, delimiter=",", fmt="%.6g")
+        elif pa is not None:
+            _write_csv_arrow(M, filename)
+        else:
+            _write_csv_numpy(M, filename)
         print(f"Matrix exported to {filename}")
     except Exception as e:
         print(f"Export failed: {e}")
@@ -1,10 +1,28 @@
+from collections import OrderedDict
 from pathlib import Path
 
+# (path, mtime_ns, size) -> decoded source; bounded LRU
+_MFILE_CACHE: "OrderedDict[tuple, str]" = OrderedDict()
+_MFILE_CACHE_SIZE = 256
+
 def read_mfile(filepath: str) -> str:
-    """Reads content of a MATLAB script file."""
+    """Reads content of a MATLAB script file (cached until the file changes)."""
     path = Path(filepath)
-    if not path.exists():
+    try:
+        st = path.stat()
+    except FileNotFoundError:
         raise FileNotFoundError(f"Script not found: {filepath}")
-    
-    with open(path, 'r', encoding='utf-8') as f:
-        return f.read()
\ No newline at end of file
+
+    key = (str(path), st.st_mtime_ns, st.st_size)
+    hit = _MFILE_CACHE.get(key)
+    if hit is not None:
+        _MFILE_CACHE.move_to_end(key)
+        return hit
+
+    # Decode in one shot; normalise newlines the way text mode would
+    code = path.read_bytes().decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+    _MFILE_CACHE[key] = code
+    if len(_MFILE_CACHE) > _MFILE_CACHE_SIZE:
+        _MFILE_CACHE.popitem(last=False)
+    return code
@@ -1,56 +1,188 @@
+import os
+import types
 import scipy.io
+import scipy.sparse
 import numpy as np
 from pathlib import Path
 from mathexlab.math.arrays import MatlabArray
 
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+# Values that are never workspace data (functions, modules, classes)
+_SKIP_TYPES = (
+    types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+    types.MethodType, type,
+)
+_SAVE_ALLOWED = (int, float, str, list, tuple, np.ndarray)
+
+# Snapshot formats: .mat (MATLAB v5), .npz (NumPy), .h5/.hdf5 (HDF5)
+_WORKSPACE_EXTS = ('.mat', '.npz', '.h5', '.hdf5')
+
+def _workspace_path(filename):
+    if not filename.lower().endswith(_WORKSPACE_EXTS):
+        filename += ".mat"
+    return filename
+
+def _dense(val):
+    """npz/HDF5 have no sparse type: store sparse data densely."""
+    if scipy.sparse.issparse(val):
+        return val.toarray()
+    return np.asarray(val)
+
+def _skip_warning(name, reason):
+    print(f"Warning: Variable '{name}' not saved ({reason}). Use a .mat file for cells and structs.")
+
+def _storable(data):
+    """
+    Dense arrays for npz/HDF5. Cells and other object arrays would need
+    pickling, so they are skipped one by one (with a warning).
+    """
+    out = {}
+    for name, val in data.items():
+        arr = _dense(val)
+        if arr.dtype.kind == 'O':
+            _skip_warning(name, "object data")
+            continue
+        out[name] = arr
+    return out
+
+def _write_atomic(filename, write):
+    """
+    Runs write(path) on a temp file next to 'filename', then moves it into
+    place: a failed save never leaves a truncated file behind.
+    """
+    tmp = f"{filename}.{os.getpid()}.tmp"
+    try:
+        write(tmp)
+        os.replace(tmp, filename)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+def _save_npz(filename, data):
+    arrays = _storable(data)
+    def write(tmp):
+        # A file object keeps numpy from appending '.npz' to the temp name
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, **arrays)
+    _write_atomic(filename, write)
+
+def _write_hdf5(f, arrays):
+    for name, arr in arrays.items():
+        try:
+            if arr.dtype.kind == 'U':
+                f.create_dataset(name, data=arr.astype(object), dtype=h5py.string_dtype())
+            elif arr.ndim and arr.size:
+                # Chunked + lzf: cheap compression, fast per-dataset reads
+                f.create_dataset(name, data=arr, compression="lzf")
+            else:
+                f.create_dataset(name, data=arr)
+        except (TypeError, ValueError) as e:
+            _skip_warning(name, e)
+
+def _save_hdf5(filename, data):
+    arrays = _storable(data)
+    def write(tmp):
+        with h5py.File(tmp, "w") as f:
+            _write_hdf5(f, arrays)
+    _write_atomic(filename, write)
+
+def _load_npz(filename, variable_names=None):
+    # NpzFile decompresses each member only when it is accessed
+    with np.load(filename, allow_pickle=False) as npz:
+        for name in npz.files:
+            if variable_names is None or name in variable_names:
+                try:
+                    val = npz[name]
+                except ValueError:
+                    # Pickled member (object array): never unpickled
+                    print(f"Warning: Variable '{name}' skipped (pickled data).")
+                    continue
+                yield name, val
+
+def _load_hdf5(filename, variable_names=None):
+    with h5py.File(filename, "r") as f:
+        for name, ds in f.items():
+            if variable_names is not None and name not in variable_names:
+                continue
+            if not isinstance(ds, h5py.Dataset):
+                continue
+            if h5py.check_string_dtype(ds.dtype):
+                yield name, np.asarray(ds.asstr()[()])
+            else:
+                # np.asarray: 0-d datasets read back as NumPy scalars
+                yield name, np.asarray(ds[()])
+
 def save_workspace(session, filename="mathexlab_workspace.mat"):
     """
-    Saves the current variables to a .mat file.
+    Saves the current variables to a .mat, .npz or .h5 file.
     """
-    if not filename.endswith(".mat"):
-        filename += ".mat"
-        
+    filename = _workspace_path(filename)
+
     data = {}
     # Extract variables from session
     for name, val in session.globals.items():
-        if name.startswith("_") or callable(val) or isinstance(val, type(np)):
+        if name[0] == "_" or isinstance(val, _SKIP_TYPES):
             continue
-            
+
         # Unwrap MatlabArray to numpy for compatibility
         if isinstance(val, MatlabArray):
             data[name] = val._data
-        elif isinstance(val, (int, float, str, list, tuple, np.ndarray)):
+        elif isinstance(val, _SAVE_ALLOWED):
             data[name] = val
-            
+
     try:
-        scipy.io.savemat(filename, data)
+        ext = Path(filename).suffix.lower()
+        if ext == ".npz":
+            _save_npz(filename, data)
+        elif ext in (".h5", ".hdf5"):
+            if h5py is None:
+                raise ImportError("h5py is required for HDF5 workspaces")
+            _save_hdf5(filename, data)
+        else:
+            _write_atomic(filename, lambda tmp: scipy.io.savemat(
+                tmp, data, appendmat=False, do_compression=True, oned_as="column"))
         print(f"Workspace saved to {filename}")
     except Exception as e:
         print(f"Error saving workspace: {e}")
 
-def load_workspace(session, filename="mathexlab_workspace.mat"):
+def load_workspace(session, filename="mathexlab_workspace.mat", variable_names=None):
     """
-    Loads variables from a .mat file into the session.
+    Loads variables from a .mat, .npz or .h5 file into the session.
+    If variable_names is given, only those variables are read.
     """
-    if not filename.endswith(".mat"):
-        filename += ".mat"
-        
+    filename = _workspace_path(filename)
+
     if not Path(filename).exists():
         print(f"File not found: {filename}")
         return
 
     try:
-        data = scipy.io.loadmat(filename)
-        
-        for name, val in data.items():
+        ext = Path(filename).suffix.lower()
+        if ext == ".npz":
+            items = _load_npz(filename, variable_names)
+        elif ext in (".h5", ".hdf5"):
+            if h5py is None:
+                raise ImportError("h5py is required for HDF5 workspaces")
+            items = _load_hdf5(filename, variable_names)
+        else:
+            items = scipy.io.loadmat(filename, variable_names=variable_names).items()
+
+        for name, val in items:
             if name.startswith("__"): continue # Skip metadata
-            
+
             # Wrap numpy arrays back into MatlabArray
             if isinstance(val, np.ndarray):
                 session.set_variable(name, MatlabArray(val))
             else:
                 session.set_variable(name, val)
-                
+
         print(f"Loaded variables from {filename}")
     except Exception as e:
-        print(f"Error loading workspace: {e}")
\ No newline at end of file
+        print(f"Error loading workspace: {e}")
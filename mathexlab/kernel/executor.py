@@ -1,10 +1,79 @@
 import ast
+import re
 import traceback
 import sys
+import time
+from collections import OrderedDict
 from mathexlab.language.transpiler import transpile
-from mathexlab.kernel.session import KernelSession
+from mathexlab.kernel.session import KernelSession, lazy_names
 from mathexlab.kernel.loader import load_and_register
 from mathexlab.language.functions import registry
+from mathexlab.plotting.handles import HANDLE_TYPES as _HANDLE_TYPES
+
+# Hidden global that receives the value of a trailing expression
+_RESULT = "__mathexlab_result__"
+
+# code -> compiled snippet; bounded LRU. Only snippets that took at least
+# _CACHE_MIN_NS to compile are admitted, so one-off trivial lines cannot
+# evict the expensive ones.
+_COMPILE_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+_COMPILE_CACHE_SIZE = 4096
+_CACHE_MIN_NS = 100_000
+
+def _compile(code: str):
+    """Cached front end of _compile_uncached (same return value)."""
+    hit = _COMPILE_CACHE.get(code)
+    if hit is not None:
+        _COMPILE_CACHE.move_to_end(code)
+        return hit
+
+    t0 = time.perf_counter_ns()
+    result = _compile_uncached(code)
+    if time.perf_counter_ns() - t0 >= _CACHE_MIN_NS:
+        _COMPILE_CACHE[code] = result
+        if len(_COMPILE_CACHE) > _COMPILE_CACHE_SIZE:
+            _COMPILE_CACHE.popitem(last=False)
+    return result
+
+def _compile_uncached(code: str):
+    """
+    Transpiles and compiles one MATLAB snippet.
+
+    Returns (code_obj, line_map, kind, last_is_name, echo_name, lazy) where
+    kind is "def" (function definition), "expr" (ends in an expression, whose
+    value is stored in _RESULT) or "stmts". echo_name is the target of a lone
+    'x = ...' assignment, for MATLAB's assign-echo. lazy holds the deferred
+    builtins the snippet refers to.
+    """
+    # [FIX] Unpack tuple: (python_code, line_number_map)
+    py, line_map = transpile(code)
+    tree = ast.parse(py, mode="exec")
+    body = tree.body
+
+    kind = "stmts"
+    last_is_name = False
+    echo_name = None
+
+    if body and isinstance(body[0], ast.FunctionDef):
+        kind = "def"
+    elif body and isinstance(body[-1], ast.Expr):
+        kind = "expr"
+        last = body[-1]
+        last_is_name = isinstance(last.value, ast.Name)
+        # Rewrite the trailing expression into an assignment so the whole
+        # snippet compiles as one module
+        body[-1] = ast.copy_location(
+            ast.Assign(targets=[ast.Name(_RESULT, ast.Store())], value=last.value),
+            last,
+        )
+        ast.fix_missing_locations(tree)
+    elif len(body) == 1 and isinstance(body[0], ast.Assign):
+        target = body[0].targets[0]
+        if isinstance(target, ast.Name):
+            echo_name = target.id
+
+    code_obj = compile(tree, "<ml>", "exec")
+    return code_obj, line_map, kind, last_is_name, echo_name, lazy_names(code_obj)
 
 # -----------------------------------------------------------
 # MAIN EXECUTOR (PURE MATLAB)
@@ -25,139 +94,172 @@ def execute(code: str, session: KernelSession):
     if suppress:
         code = code[:-1].strip()
 
+    line_map = {}
     try:
-        # [FIX] Unpack tuple: (python_code, line_number_map)
-        py, line_map = transpile(code)
-        
-        tree = ast.parse(py, mode="exec")
-
-        # ------------------------------------------------
-        # FUNCTION DEFINITIONS
-        # ------------------------------------------------
-        if tree.body and isinstance(tree.body[0], ast.FunctionDef):
-            exec(py, session.globals)
-            return None
+        code_obj, line_map, kind, last_is_name, echo_name, lazy = _compile(code)
 
-        # ------------------------------------------------
-        # FINAL EXPRESSION
-        # ------------------------------------------------
-        if tree.body and isinstance(tree.body[-1], ast.Expr):
-            last = tree.body[-1]
-            body = tree.body[:-1]
-
-            if body:
-                exec(
-                    compile(ast.Module(body=body, type_ignores=[]), "<ml>", "exec"),
-                    session.globals,
-                )
-
-            value = eval(
-                compile(ast.Expression(last.value), "<ml>", "eval"),
-                session.globals,
-            )
-
-            # ------------------------------
-            # MATLAB COMMAND EXECUTION
-            # ------------------------------
-            # 1. Check for explicit command flag
-            is_cmd = getattr(value, "__mathexlab_command__", False)
-
-            # 2. [CRITICAL FIX] Implicit Call Strategy
-            if not is_cmd and callable(value) and isinstance(last.value, ast.Name):
-                is_cmd = True
-
-            if callable(value) and is_cmd:
-                try:
-                    # [FIX] Check if it is a SCRIPT that needs the workspace
-                    if getattr(value, "__mathexlab_script__", False):
-                        value(session.globals)
-                    else:
-                        # Standard function/command call
-                        try:
-                            value()
-                        except TypeError as e:
-                            # [CRITICAL FIX] Handle "Not enough input arguments" gracefully
-                            msg = str(e)
-                            if "required" in msg or "missing" in msg or "argument" in msg:
-                                print(f"Error: Not enough input arguments.")
-                                return None
-                            raise e
-                            
-                    return None
-                except Exception as e:
-                    raise e
-
-            # ------------------------------
-            # PLOTTING CALL (DO NOT PRINT)
-            # ------------------------------
-            if hasattr(value, "__class__") and value.__class__.__name__.endswith("Handle"):
-                session.globals["ans"] = value
-                return None
-
-            # ------------------------------
-            # NORMAL EXPRESSION
-            # ------------------------------
-            if value is not None:
-                session.globals["ans"] = value
-                if not suppress:
-                    if hasattr(value, "_data"):
-                        print(f"ans =\n{value}")
-                    else:
-                        print(f"ans = {value}")
-            return None
-
-        # ------------------------------------------------
-        # STATEMENTS ONLY
-        # ------------------------------------------------
-        exec(py, session.globals)
-
-        if (
-            not suppress
-            and len(tree.body) == 1
-            and isinstance(tree.body[0], ast.Assign)
-        ):
-            target = tree.body[0].targets[0]
-            if isinstance(target, ast.Name):
-                name = target.id
-                val = session.globals.get(name)
-                if hasattr(val, "_data"):
-                    print(f"{name} =\n{val}")
-                else:
-                    print(f"{name} = {val}")
+        # Deferred builtins are bound before the snippet runs: binding them
+        # on NameError would mean running its earlier statements twice
+        session.bind_lazy_builtins(lazy)
 
-    except NameError as e:
         # ==========================================================
         # MAGIC: Auto-Discovery & Lazy Loading
         # ==========================================================
-        try:
-            var_name = str(e).split("'")[1]
-            if load_and_register(var_name):
-                entry = registry.get(var_name)
-                if entry:
-                    session.globals[var_name] = entry.func
-                    # Recursively execute now that it's loaded
-                    return execute(code, session)
-        except Exception:
-            pass
-        
-        # [FIX] PRINT TRACEBACK TO TERMINAL BEFORE UI HANDLING
-        traceback.print_exc(file=sys.stderr)
-
-        l_map = locals().get('line_map', {})
-        _handle_matlab_error(e, code, l_map)
-        return e 
+        # Retry the already-compiled code after loading each missing .m file
+        tried = set()
+        while True:
+            try:
+                return _run_compiled(code_obj, kind, last_is_name, echo_name, suppress, session)
+            except NameError as e:
+                if not _autoload(e, session, tried):
+                    raise
 
     except Exception as e:
         # [FIX] PRINT TRACEBACK TO TERMINAL BEFORE UI HANDLING
         traceback.print_exc(file=sys.stderr)
 
-        l_map = locals().get('line_map', {})
-        _handle_matlab_error(e, code, l_map)
-        return e 
-    
+        _handle_matlab_error(e, code, line_map)
+        return e
+
+
+def _autoload(e: NameError, session: KernelSession, tried: set) -> bool:
+    """
+    Loads the .m file for the name missing in 'e'.
+    Returns True if the caller should retry.
+    """
+    var_name = getattr(e, "name", None)
+    if var_name is None:
+        try:
+            var_name = str(e).split("'")[1]
+        except IndexError:
+            return False
+    if var_name in tried:
+        return False
+    tried.add(var_name)
+
+    try:
+        if load_and_register(var_name, session):
+            entry = registry.map.get(var_name)
+            if entry:
+                session.globals[var_name] = entry.func
+                return True
+    except Exception:
+        pass
+    return False
+
+
+def _run_compiled(code_obj, kind, last_is_name, echo_name, suppress, session):
+    """
+    Executes a compiled snippet in the session and prints its result.
+    """
+    # ------------------------------------------------
+    # FUNCTION DEFINITIONS
+    # ------------------------------------------------
+    if kind == "def":
+        exec(code_obj, session.globals)
+        return None
+
+    # ------------------------------------------------
+    # FINAL EXPRESSION
+    # ------------------------------------------------
+    if kind == "expr":
+        try:
+            exec(code_obj, session.globals)
+            value = session.globals[_RESULT]
+        finally:
+            session.globals.pop(_RESULT, None)
+
+        # ------------------------------
+        # MATLAB COMMAND EXECUTION
+        # ------------------------------
+        # Explicit command flag, or [CRITICAL FIX] implicit call of a bare name
+        is_cmd = last_is_name or getattr(value, "__mathexlab_command__", False)
+
+        if is_cmd and callable(value):
+            # [FIX] Check if it is a SCRIPT that needs the workspace
+            if getattr(value, "__mathexlab_script__", False):
+                value(session.globals)
+            else:
+                # Standard function/command call
+                try:
+                    value()
+                except TypeError as e:
+                    # [CRITICAL FIX] Handle "Not enough input arguments" gracefully
+                    msg = str(e)
+                    if "required" in msg or "missing" in msg or "argument" in msg:
+                        print(f"Error: Not enough input arguments.")
+                        return None
+                    raise e
+            return None
+
+        # ------------------------------
+        # PLOTTING CALL (DO NOT PRINT)
+        # ------------------------------
+        if type(value) in _HANDLE_TYPES:
+            session.globals["ans"] = value
+            return None
+
+        # ------------------------------
+        # NORMAL EXPRESSION
+        # ------------------------------
+        if value is not None:
+            session.globals["ans"] = value
+            if not suppress:
+                if hasattr(value, "_data"):
+                    print(f"ans =\n{value}")
+                else:
+                    print(f"ans = {value}")
+        return None
+
+    # ------------------------------------------------
+    # STATEMENTS ONLY
+    # ------------------------------------------------
+    exec(code_obj, session.globals)
+
+    if not suppress and echo_name is not None:
+        val = session.globals.get(echo_name)
+        if hasattr(val, "_data"):
+            print(f"{echo_name} =\n{val}")
+        else:
+            print(f"{echo_name} = {val}")
+
     return None
 
 
+# Messages NumPy uses for mismatched operand dimensions
+_DIM_MISMATCH = re.compile(r"broadcast|shape")
+
+def _fmt_syntax(e, code, prefix):
+    print(f"{prefix} Invalid syntax near '{code.strip()}'")
+
+def _fmt_name(e, code, prefix):
+    try:
+        var_name = str(e).split("'")[1]
+        print(f"{prefix} Undefined function or variable '{var_name}'.")
+    except IndexError:
+        print(f"{prefix} Undefined function or variable.")
+
+def _fmt_index(e, code, prefix):
+    print(f"{prefix} Index exceeds the number of array elements.")
+
+def _fmt_value(e, code, prefix):
+    msg = str(e)
+    if _DIM_MISMATCH.search(msg):
+        print(f"{prefix} Matrix dimensions must agree.")
+    else:
+        print(f"{prefix} {msg}")
+
+def _fmt_generic(e, code, prefix):
+    print(f"{prefix} {e}")
+
+# Exception class -> formatter; subclasses resolve through the MRO
+_ERROR_HANDLERS = {
+    SyntaxError: _fmt_syntax,
+    NameError: _fmt_name,
+    IndexError: _fmt_index,
+    ValueError: _fmt_value,
+}
+
 def _handle_matlab_error(e, code, line_map=None):
     """
     Translates Python exceptions to MATLAB error messages.
@@ -168,13 +270,11 @@ def _handle_matlab_error(e, code, line_map=None):
     # ------------------------------------------------------------------
     # 1. Determine Location (Line Number Mapping)
     # ------------------------------------------------------------------
-    _, _, tb = sys.exc_info()
     py_line = -1
-    
-    for frame in traceback.extract_tb(tb):
-        if frame.filename in ("<ml>", "<string>"):
-            py_line = frame.lineno
-    
+    for frame, lineno in traceback.walk_tb(e.__traceback__):
+        if frame.f_code.co_filename in ("<ml>", "<string>"):
+            py_line = lineno
+
     matlab_line_str = ""
     if py_line > 0:
         m_line = line_map.get(py_line, "?")
@@ -183,30 +283,11 @@ def _handle_matlab_error(e, code, line_map=None):
     # ------------------------------------------------------------------
     # 2. User Facing Error Message
     # ------------------------------------------------------------------
-    msg = str(e)
-    exc_type = type(e).__name__
-    
     prefix = f"Error{matlab_line_str}:"
 
-    if "SyntaxError" in exc_type:
-        print(f"{prefix} Invalid syntax near '{code.strip()}'")
-        return
-
-    if isinstance(e, NameError):
-        try:
-            var_name = str(e).split("'")[1]
-            print(f"{prefix} Undefined function or variable '{var_name}'.")
-        except IndexError:
-            print(f"{prefix} Undefined function or variable.")
-        return
-
-    if isinstance(e, IndexError):
-        print(f"{prefix} Index exceeds the number of array elements.")
-        return
-
-    if isinstance(e, ValueError):
-        if "broadcast" in msg or "shape" in msg:
-            print(f"{prefix} Matrix dimensions must agree.")
-            return
-
-    print(f"{prefix} {msg}")
\ No newline at end of file
+    handler = _fmt_generic
+    for cls in type(e).__mro__:
+        if cls in _ERROR_HANDLERS:
+            handler = _ERROR_HANDLERS[cls]
+            break
+    handler(e, code, prefix)
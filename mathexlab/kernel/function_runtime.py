@@ -7,7 +7,7 @@ Responsibilities:
     * pushes a frame
     * invokes the FunctionEntry.func with isolation and timeouts (no threads here)
     * pops the frame and returns result
-- Provide utilities to create isolated local scopes for debugging.
+- Run functions against the live session globals (no per-call copies).
 """
 
 import time
@@ -50,20 +50,6 @@ class CallStack:
 # Global (singleton) call stack used by the kernel
 call_stack = CallStack()
 
-def create_local_scope_from_session(session_globals: dict) -> Dict[str, Any]:
-    """
-    Create a fresh globals mapping for executing a user function.
-    We copy the session_globals shallowly so the function has access to the same
-    module-level names but modifications won't clobber the session unless they set globals directly.
-    """
-    # Shallow copy is intentional - functions will see current values but changes to mutable objects reflect back.
-    g = dict(session_globals)
-    # Ensure __builtins__ present for Python runtime functions
-    if '__builtins__' not in g:
-        import builtins
-        g['__builtins__'] = builtins.__dict__
-    return g
-
 def call_function(name: str, args: Tuple[Any, ...], kwargs: Optional[Dict[str, Any]], session) -> Any:
     """
     Call a registered function by name.
@@ -74,30 +60,19 @@ def call_function(name: str, args: Tuple[Any, ...], kwargs: Optional[Dict[str, A
     """
     if kwargs is None: kwargs = {}
 
-    entry = registry.get(name)
+    entry = registry.map.get(name)
     if entry is None:
         raise FunctionRuntimeError(f"Function '{name}' is not registered.")
 
-    # Create a fresh execution globals mapping based on session
-    exec_globals = create_local_scope_from_session(session.globals)
-
-    # Update function's __globals__ if it was compiled with a different dict.
-    # WARNING: changing a function's __globals__ affects closures; do this cautiously.
     func = entry.func
 
-    # Create call frame and push
-    frame = CallFrame(name=name, entry=entry, locals={}, globals=exec_globals)
+    # Create call frame and push. The frame shares session.globals: functions
+    # loaded for a session are compiled against that same dict, so they
+    # already see current values without copying or re-binding names.
+    frame = CallFrame(name=name, entry=entry, locals={}, globals=session.globals)
     call_stack.push(frame)
 
     try:
-        # Execute: if the function is a bound FunctionType, simply call it.
-        # The function's globals were set at compile time (register_from_source used exec with a copy of session.globals).
-        # This call will run using its own __globals__, but we ensure the session values are up-to-date by optionally re-binding names.
-        # Optionally rebind common names:
-        for k, v in session.globals.items():
-            if k in func.__globals__:
-                func.__globals__[k] = v
-
         result = func(*args, **kwargs)
 
         # update 'ans' in session
@@ -1,14 +1,77 @@
 import os
-import ast
+import builtins as _py_builtins
 from mathexlab.io.mfile import read_mfile
-from mathexlab.language.transpiler import transpile
+from mathexlab.language.transpiler import transpile_unit
 from mathexlab.kernel.path_manager import path_manager
-from mathexlab.language.functions import registry, FunctionEntry
+from mathexlab.language.functions import registry, FunctionEntry, _referenced_names
 
-def load_and_register(name: str):
+# filepath -> (mtime_ns, py_code, code_object, function_name or None)
+_CODE_CACHE = {}
+
+def _compile_mfile(filepath: str):
+    """
+    Reads, transpiles and compiles an .m file, reusing the previous result
+    while the file's mtime is unchanged. Raises SyntaxError on bad output.
+    """
+    mtime = os.stat(filepath).st_mtime_ns
+    hit = _CODE_CACHE.get(filepath)
+    if hit is not None and hit[0] == mtime:
+        return hit[1:]
+
+    code = read_mfile(filepath)
+
+    # The transpiler reports whether the file defines a function,
+    # so the generated Python is parsed only once, by compile()
+    py_code, _, func_name = transpile_unit(code)
+
+    # Compile against the real path so tracebacks point at the .m file
+    code_obj = compile(py_code, filepath, "exec")
+
+    _CODE_CACHE[filepath] = (mtime, py_code, code_obj, func_name)
+    return py_code, code_obj, func_name
+
+class _FileScope(dict):
+    """
+    Module namespace of one .m function file: builtins plus the file's own
+    functions. Workspace variables are not visible (MATLAB function scope);
+    other .m functions and deferred builtins are resolved on first use.
+    """
+    __slots__ = ("_session",)
+
+    def __missing__(self, name):
+        value = _resolve_global(name, self._session)
+        self[name] = value
+        return value
+
+def _resolve_global(name, session):
+    """Deferred builtin or .m function 'name'; KeyError if there is none."""
+    value = session.lazy_builtin(name)
+    if value is not None:
+        return value
+    entry = registry.map.get(name)
+    if entry is None and load_and_register(name, session):
+        entry = registry.map.get(name)
+    if entry is None:
+        raise KeyError(name)
+    return entry.func
+
+# Python builtins, pre-seeded so lookups of range, len, ... never reach __missing__
+_PY_BUILTINS = {k: v for k, v in vars(_py_builtins).items() if not k.startswith("__")}
+
+def _file_scope(session):
+    scope = _FileScope(_PY_BUILTINS)
+    scope.update(session.builtin_namespace())
+    scope._session = session
+    return scope
+
+def load_and_register(name: str, session=None):
     """
     Attempts to find, transpile, and register a function named 'name'.
     Strictly handles .m files only.
+
+    If session is given, each function file gets a private namespace
+    seeded with that session's builtins, so it resolves zeros, sqrt, ...
+    at call time without seeing (or overwriting) workspace variables.
     """
     # 1. Resolve File Path (Strict .m lookup via PathManager)
     filepath = path_manager.resolve(name)
@@ -16,35 +79,24 @@ def load_and_register(name: str):
         return False
 
     try:
-        # 2. Read & Transpile
-        code = read_mfile(filepath)
-        if code is None: 
-            return False
-
-        # Unpack the tuple returned by transpile
-        py_code, _ = transpile(code)
-        
-        # 3. Detect Type (Function vs Script) WITHOUT Executing
+        # 2. Read, Transpile & Compile (cached per file mtime)
         try:
-            tree = ast.parse(py_code)
+            py_code, code_obj, func_name = _compile_mfile(filepath)
         except SyntaxError as e:
             print(f"Syntax Error in {os.path.basename(filepath)}: {e}")
             return False
 
-        is_function = False
-        func_name_in_code = name
-
-        if tree.body and isinstance(tree.body[0], ast.FunctionDef):
-            is_function = True
-            func_name_in_code = tree.body[0].name
+        # 3. Detect Type (Function vs Script) WITHOUT Executing
+        is_function = func_name is not None
+        func_name_in_code = func_name or name
 
         # -------------------------------------------------------
         # CASE A: FUNCTION (function y = f(x))
         # -------------------------------------------------------
         if is_function:
-            scope = {}
-            # Execute definition into a temporary scope to create the function object
-            exec(py_code, scope)
+            scope = _file_scope(session) if session is not None else {}
+            # Execute definition into the scope to create the function object
+            exec(code_obj, scope)
             
             # Retrieve the function object 
             # Note: We look for the name DEFINED in the file, not necessarily the filename
@@ -62,14 +114,18 @@ def load_and_register(name: str):
         # We create a runner that executes the RAW python code 
         # inside the USER'S globals (the Console Workspace).
         
+        refs = _referenced_names(code_obj) if session is not None else ()
+
         def script_runner(globals_dict=None):
             if globals_dict is None:
                 # Should not happen in Executor, but failsafe
                 globals_dict = {}
+            if refs and globals_dict is session.globals:
+                session.bind_lazy_builtins(refs)
             
             # [CRITICAL FIX] Execute code DIRECTLY into the session globals
             # This ensures 'x=1' sticks in the workspace.
-            exec(py_code, globals_dict)
+            exec(code_obj, globals_dict)
 
         # Flags for Executor
         script_runner.__mathexlab_command__ = True
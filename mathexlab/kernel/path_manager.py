@@ -9,6 +9,8 @@ class PathManager:
         # We store explicit paths added via addpath()
         self.paths = []
         self._cache = {}
+        # dir -> (mtime_ns, {name: filename}, {lowercase name: filename})
+        self._dir_listings = {}
 
     def add_path(self, path):
         p = os.path.abspath(path)
@@ -24,6 +26,36 @@ class PathManager:
 
     def clear_cache(self):
         self._cache = {}
+        self._dir_listings = {}
+
+    def _listing(self, directory):
+        """
+        Returns the .m files of a directory as ({name: filename}, {lower: filename}).
+        Re-scanned only when the directory's mtime changes.
+        """
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return {}, {}
+
+        hit = self._dir_listings.get(directory)
+        if hit is not None and hit[0] == mtime:
+            return hit[1], hit[2]
+
+        exact, lower = {}, {}
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    fname = entry.name
+                    if fname.endswith(".m"):
+                        stem = fname[:-2]
+                        exact[stem] = fname
+                        lower.setdefault(stem.lower(), fname)
+        except OSError:
+            pass
+
+        self._dir_listings[directory] = (mtime, exact, lower)
+        return exact, lower
 
     def resolve(self, name):
         """
@@ -33,14 +65,16 @@ class PathManager:
         Priority:
         1. Current Working Directory (CWD)
         2. Explicit Paths (addpath)
+        3. Case-insensitive match in the same order
         """
-        filename = f"{name}.m"
-        
-        # 1. Check CWD (Dynamic!)
+        # No negative cache: a miss costs one stat per directory (the
+        # listings are mtime-checked), and a new .m file is seen at once
         cwd = os.getcwd()
-        cwd_file = os.path.join(cwd, filename)
-        if os.path.exists(cwd_file):
-            return cwd_file
+
+        # 1. Check CWD (Dynamic!)
+        exact, _ = self._listing(cwd)
+        if name in exact:
+            return os.path.join(cwd, exact[name])
 
         # 2. Check Cache
         if name in self._cache:
@@ -48,12 +82,20 @@ class PathManager:
 
         # 3. Search in explicit paths
         for p in self.paths:
-            full_path = os.path.join(p, filename)
-            if os.path.exists(full_path):
+            exact, _ = self._listing(p)
+            if name in exact:
+                full_path = os.path.join(p, exact[name])
                 self._cache[name] = full_path
                 return full_path
-        
+
+        # 4. Case-insensitive fallback
+        key = name.lower()
+        for d in (cwd, *self.paths):
+            _, lower = self._listing(d)
+            if key in lower:
+                return os.path.join(d, lower[key])
+
         return None
 
 # Global instance
-path_manager = PathManager()
\ No newline at end of file
+path_manager = PathManager()
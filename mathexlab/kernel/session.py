@@ -1,10 +1,12 @@
 import time
 import os
+import sys
+import importlib
 import numpy as np
 from mathexlab.language import builtins
 from mathexlab.kernel.path_manager import path_manager
 from mathexlab.kernel.loader import load_and_register
-from mathexlab.language.functions import registry
+from mathexlab.language.functions import registry, _referenced_names
 
 # [FIX] Explicitly import constants to ensure they exist in session
 from mathexlab.math.physics import (
@@ -12,10 +14,6 @@ from mathexlab.math.physics import (
     convtemp, convlength, convmass, convforce, convpres, convenergy,
     c, G, h, k, g  # Imported directly from physics.py
 )
-try:
-    from PySide6.QtWidgets import QApplication
-except Exception:
-    QApplication = None
 
 # ------------------------------------------------------------
 # Core Math Engine
@@ -23,7 +21,7 @@ except Exception:
 from mathexlab.math import functions as _mlfun
 from mathexlab.math.arrays import (
     MatlabArray, mat, zeros, ones, eye, linspace, arange,
-    sparse, full, colon, cell, _shape
+    sparse, full, colon, cell, _shape, _cp
 )
 
 # ------------------------------------------------------------
@@ -44,17 +42,6 @@ from mathexlab.math.statistics import (
     corrcoef, cov, histcounts, nlinfit
 )
 
-# ------------------------------------------------------------
-# Optimization
-# ------------------------------------------------------------
-try:
-    from mathexlab.math.optim import (
-        fminsearch, fzero, lsqcurvefit,
-        fmincon, linprog
-    )
-except ImportError:
-    fminsearch = fzero = lsqcurvefit = fmincon = linprog = None
-
 # ------------------------------------------------------------
 # Advanced Toolbox
 # ------------------------------------------------------------
@@ -77,22 +64,78 @@ from mathexlab.toolbox import (
 import mathexlab.plotting as _plt_mod
 from mathexlab.plotting.state import plot_manager
 from mathexlab.plotting.engine import PlotEngine
+from mathexlab.plotting.handles import HANDLE_TYPES
 
 # ------------------------------------------------------------
 # I/O & Structs
 # ------------------------------------------------------------
-from mathexlab.io import (
-    save_workspace, load_workspace, writematrix, saveas,
-    readtable, readmatrix, csvread
-)
+from mathexlab.io.saver import save_workspace, load_workspace
 from mathexlab.math.structs import MatlabStruct
 
+# Qt is resolved on the first GUI flush; headless runs never load it
+_QApplication = ...
+
+def _get_qapp():
+    global _QApplication
+    if _QApplication is ...:
+        try:
+            from PySide6.QtWidgets import QApplication as _QApplication
+        except Exception:
+            _QApplication = None
+    return _QApplication
+
 # ------------------------------------------------------------
-# Symbolic Math
+# Lazily Loaded Builtins
 # ------------------------------------------------------------
-from mathexlab.math.symbolic import (
-    syms, diff, int_func, expand, simplify, factor, solve, subs, limit
-)
+# name -> (module, attribute). These modules are slow to import (sympy,
+# pandas/pyarrow, scipy.optimize, the control toolbox), so the names are
+# bound into the workspace just before code that references one of them
+# runs; see lazy_names and KernelSession.bind_lazy_builtins.
+_LAZY_BUILTINS = {
+    # Symbolic Math
+    "syms": ("mathexlab.math.symbolic", "syms"),
+    "diff": ("mathexlab.math.symbolic", "diff"),
+    "int": ("mathexlab.math.symbolic", "int_func"),
+    "expand": ("mathexlab.math.symbolic", "expand"),
+    "simplify": ("mathexlab.math.symbolic", "simplify"),
+    "factor": ("mathexlab.math.symbolic", "factor"),
+    "solve": ("mathexlab.math.symbolic", "solve"),
+    "subs": ("mathexlab.math.symbolic", "subs"),
+    "limit": ("mathexlab.math.symbolic", "limit"),
+
+    # Optimization
+    "fminsearch": ("mathexlab.math.optim", "fminsearch"),
+    "fzero": ("mathexlab.math.optim", "fzero"),
+    "lsqcurvefit": ("mathexlab.math.optim", "lsqcurvefit"),
+    "fmincon": ("mathexlab.math.optim", "fmincon"),
+    "linprog": ("mathexlab.math.optim", "linprog"),
+
+    # I/O
+    "writematrix": ("mathexlab.io.exporter", "writematrix"),
+    "saveas": ("mathexlab.io.exporter", "saveas"),
+    "readmatrix": ("mathexlab.io.datareader", "readmatrix"),
+    "readtable": ("mathexlab.io.datareader", "readtable"),
+    "csvread": ("mathexlab.io.datareader", "csvread"),
+
+    # Control Toolbox
+    "tf": ("mathexlab.toolbox.control", "tf"),
+    "step": ("mathexlab.toolbox.control", "step"),
+    "impulse": ("mathexlab.toolbox.control", "impulse"),
+    "bode": ("mathexlab.toolbox.control", "bode"),
+    "series": ("mathexlab.toolbox.control", "series"),
+    "parallel": ("mathexlab.toolbox.control", "parallel"),
+    "feedback": ("mathexlab.toolbox.control", "feedback"),
+    "rlocus": ("mathexlab.toolbox.control", "rlocus"),
+}
+
+def lazy_names(code) -> frozenset:
+    """The deferred builtins a code object (or any nested body) refers to."""
+    return frozenset(_referenced_names(code).intersection(_LAZY_BUILTINS))
+
+# Reduced Planck constant (derived from h if the struct lacks it)
+_HBAR = getattr(constants_struct, 'hbar', None)
+if _HBAR is None:
+    _HBAR = constants_struct.h / (2 * np.pi)
 
 # ============================================================
 # Helpers & Commands
@@ -106,17 +149,13 @@ def randn(*args):
     shape = _shape(args)
     return MatlabArray(np.random.randn(*shape))
 
-_tic_timer = 0.0
-
-def tic():
-    global _tic_timer
-    _tic_timer = time.time()
+class TicToken(int):
+    """
+    Value returned by tic (perf_counter_ns start time), for t = tic; toc(t).
+    Registered as a handle type so a bare 'tic' does not print it.
+    """
 
-def toc():
-    global _tic_timer
-    val = time.time() - _tic_timer
-    print(f"Elapsed time is {val:.6f} seconds.")
-    return val
+HANDLE_TYPES.add(TicToken)
 
 def addpath(p):
     path_manager.add_path(p)
@@ -141,8 +180,9 @@ def pwd():
 
 def ls(p='.'):
     try:
-        items = os.listdir(str(p))
-        print("\n".join(sorted(items)))
+        with os.scandir(str(p)) as it:
+            items = sorted(entry.name for entry in it)
+        sys.stdout.write("\n".join(items) + "\n")
     except Exception as e:
         print(str(e))
 
@@ -151,6 +191,183 @@ cd.__mathexlab_command__ = True
 pwd.__mathexlab_command__ = True
 ls.__mathexlab_command__ = True
 
+# ============================================================
+# Builtin Table
+# ============================================================
+
+# Public names of the math and plotting namespaces, read straight from
+# the module __dict__ (no getattr per name)
+_MLFUN_EXPORTS = {
+    n: v for n, v in _mlfun.__dict__.items()
+    if not n.startswith("_") and n not in _LAZY_BUILTINS
+    and n not in ("MatlabArray", "scipy", "np", "sympy")
+}
+_PLT_EXPORTS = {n: v for n, v in _plt_mod.__dict__.items() if not n.startswith("_")}
+
+# Console commands that need no session state (name, callable)
+_IO_BINDINGS = (
+    ("disp", builtins.disp),
+    ("clc", builtins.clc),
+    ("pause", builtins.precise_sleep),
+)
+
+def _build_builtin_table():
+    """
+    Builds the session-independent builtins once, at import time.
+    KernelSession.reset() copies this dict instead of rebuilding it.
+    """
+    table = {}
+
+    # Constants
+    table.update({
+        "pi": np.pi,
+        "e": np.e,
+        "i": 1j,
+        "j": 1j,
+        "nan": np.nan,
+        "inf": np.inf,
+        "ans": 0,
+    })
+
+    # Arrays
+    table.update({
+        "MatlabArray": MatlabArray,
+        "mat": mat,
+        "zeros": zeros,
+        "ones": ones,
+        "eye": eye,
+        "linspace": linspace,
+        "arange": arange,
+        "rand": rand,
+        "randn": randn,
+        "sparse": sparse,
+        "full": full,
+        "colon": colon,
+        "cell": cell,
+        "_cp": _cp,
+    })
+
+    # Helpers
+    table.update({
+        "size": builtins.size,
+        "length": builtins.length,
+        "numel": builtins.numel,
+        "struct": builtins.struct,
+        "MatlabStruct": MatlabStruct,
+        "deal": builtins.deal,
+        "num2str": builtins.num2str,
+    })
+
+    # Path & File System
+    table.update({
+        "addpath": addpath,
+        "rmpath": rmpath,
+        "cd": cd,
+        "pwd": pwd,
+        "ls": ls,
+        "dir": ls,
+    })
+
+    # Linear Algebra
+    table.update({
+        "inv": inv, "det": det, "eig": eig, "rank": rank, "norm": norm,
+        "lu": lu, "svd": svd, "qr": qr, "pinv": pinv, "null": null, "orth": orth,
+        "expm": expm, "sqrtm": sqrtm, "hess": hess, "schur": schur, "chol": chol,
+        "gmres": gmres, "pcg": pcg, "cond": cond, 
+        "eigs": eigs,
+    })
+
+    # Statistics
+    table.update({
+        "mean": mean, "std": std, "max": max_func, "min": min_func, "sum": sum_func,
+        "corrcoef": corrcoef, "cov": cov, "histcounts": histcounts, 
+        "nlinfit": nlinfit,
+    })
+
+    # Physics Constants & Converters
+    # [FIX] Use explicit imports for c, G, h, k to guarantee availability
+    table.update({
+        "physconst": physconst,
+        "PhysicalConstants": constants_struct,
+        "c": c,       # From explicit import
+        "G": G,       # From explicit import
+        "h": h,       # From explicit import
+        "hbar": _HBAR,
+        "k": k,       # From explicit import
+        "g": g,       # From explicit import
+        "convtemp": convtemp,
+        "convlength": convlength,
+        "convmass": convmass,
+        "convforce": convforce,
+        "convpres": convpres,
+        "convenergy": convenergy,
+    })
+
+    # Toolbox
+    table.update({
+        "meshgrid": meshgrid, "sphere": sphere, "cylinder": cylinder,
+        "gradient": gradient, "cross": cross, "dot": dot,
+        "ode45": ode45, "ode23": ode23, "ode15s": ode15s, "bvp4c": bvp4c,
+        "fft": fft, "ifft": ifft, "roots": roots, "polyval": polyval,
+        "trapz": trapz, "cumtrapz": cumtrapz, "integral": integral,
+        "interp1": interp1, "interp2": interp2, "griddata": griddata,
+        "fftshift": fftshift, "ifftshift": ifftshift, "spectrogram": spectrogram,
+        "pdepe": pdepe,
+        # [NEW] Register Signal Tools
+        "fft2": fft2,
+        "ifft2": ifft2,
+        "filter": filter,
+    })
+
+    # [CRITICAL FIX] Manually register core math functions.
+    # This guarantees they exist and are protected from 'clear'.
+    table.update({
+        "sin": _mlfun.sin, "cos": _mlfun.cos, "tan": _mlfun.tan,
+        "asin": _mlfun.asin, "acos": _mlfun.acos, "atan": _mlfun.atan, "atan2": _mlfun.atan2,
+        "sinh": _mlfun.sinh, "cosh": _mlfun.cosh, "tanh": _mlfun.tanh,
+        "exp": _mlfun.exp, "log": _mlfun.log, "log10": _mlfun.log10, "sqrt": _mlfun.sqrt,
+        "abs": _mlfun.abs, "sign": _mlfun.sign,
+        "floor": _mlfun.floor, "ceil": _mlfun.ceil, "round": _mlfun.round, "fix": _mlfun.fix,
+        "mod": _mlfun.mod, "rem": _mlfun.rem,
+        
+        # COMPLEX NUMBER SUPPORT
+        "angle": _mlfun.angle,
+        "real": _mlfun.real,
+        "imag": _mlfun.imag,
+        "conj": _mlfun.conj,
+        "diag": _mlfun.diag,
+    })
+
+    # Auto-import remaining functions (backup)
+    for name, val in _MLFUN_EXPORTS.items():
+        if name not in table:
+            table[name] = val
+
+    # Plotting API
+    table.update(_PLT_EXPORTS)
+
+    table.update({
+        "clf": lambda: plot_manager.clf(),
+        "hold": lambda mode=True: plot_manager.hold(mode),
+    })
+
+    table.update(_IO_BINDINGS)
+
+    return table
+
+_BUILTIN_TABLE = _build_builtin_table()
+
+# Names bound per session in KernelSession.reset()
+_SESSION_BUILTINS = (
+    "tic", "toc", "cla", "save", "load", "clear", "who", "whos", "exist",
+)
+
+# Everything 'clear' must keep (lazy builtins are protected before they are bound).
+# Interned so membership tests can short-circuit on identity; shared by all sessions.
+_BUILTIN_KEYS = frozenset(
+    sys.intern(k) for k in (*_BUILTIN_TABLE, *_SESSION_BUILTINS, *_LAZY_BUILTINS)
+)
+
 # ============================================================
 # Kernel Session
 # ============================================================
@@ -164,10 +381,14 @@ class KernelSession:
         self.globals = {}
         # We need to know what keys are "System Builtins" so we don't delete them on 'clear'
         self._builtins_set = set() 
+        # Start of the last plain 'tic' (perf_counter_ns)
+        self._tic_start = None
+        # plot_manager.gui_generation at the last GUI flush
+        self._gui_seen = plot_manager.gui_generation
         self.reset()
 
     def reset(self):
-        self.globals = {}
+        self.globals = _BUILTIN_TABLE.copy()
 
         if getattr(plot_manager, "widget", None):
             try:
@@ -175,210 +396,22 @@ class KernelSession:
             except Exception:
                 pass
 
-        # Constants
-        self.globals.update({
-            "pi": np.pi,
-            "e": np.e,
-            "i": 1j,
-            "j": 1j,
-            "nan": np.nan,
-            "inf": np.inf,
-            "ans": 0,
-        })
-
-        # Arrays
-        self.globals.update({
-            "MatlabArray": MatlabArray,
-            "mat": mat,
-            "zeros": zeros,
-            "ones": ones,
-            "eye": eye,
-            "linspace": linspace,
-            "arange": arange,
-            "rand": rand,
-            "randn": randn,
-            "sparse": sparse,
-            "full": full,
-            "colon": colon,
-            "cell": cell,
-        })
-
-        # Helpers
-        self.globals.update({
-            "size": builtins.size,
-            "length": builtins.length,
-            "numel": builtins.numel,
-            "tic": tic,
-            "toc": toc,
-            "struct": builtins.struct,
-            "MatlabStruct": MatlabStruct,
-            "deal": builtins.deal,
-            "num2str": builtins.num2str,
-        })
-
-        # Path & File System
-        self.globals.update({
-            "addpath": addpath,
-            "rmpath": rmpath,
-            "cd": cd,
-            "pwd": pwd,
-            "ls": ls,
-            "dir": ls,
-        })
-
-        # Linear Algebra
-        self.globals.update({
-            "inv": inv, "det": det, "eig": eig, "rank": rank, "norm": norm,
-            "lu": lu, "svd": svd, "qr": qr, "pinv": pinv, "null": null, "orth": orth,
-            "expm": expm, "sqrtm": sqrtm, "hess": hess, "schur": schur, "chol": chol,
-            "gmres": gmres, "pcg": pcg, "cond": cond, 
-            "eigs": eigs,
-        })
-
-        # Statistics
-        self.globals.update({
-            "mean": mean, "std": std, "max": max_func, "min": min_func, "sum": sum_func,
-            "corrcoef": corrcoef, "cov": cov, "histcounts": histcounts, 
-            "nlinfit": nlinfit,
-        })
-
-        # Symbolic & Calculus
-        self.globals.update({
-            "syms": syms,
-            "diff": diff,
-            "int": int_func,
-            "expand": expand,
-            "simplify": simplify,
-            "factor": factor,
-            "solve": solve,
-            "subs": subs,
-            "limit": limit,
-        })
-        
-        # Physics Constants & Converters
-        hbar_val = getattr(constants_struct, 'hbar', None)
-        if hbar_val is None:
-             hbar_val = constants_struct.h / (2 * np.pi)
-
-        # [FIX] Use explicit imports for c, G, h, k to guarantee availability
-        self.globals.update({
-            "physconst": physconst,
-            "PhysicalConstants": constants_struct,
-            "c": c,       # From explicit import
-            "G": G,       # From explicit import
-            "h": h,       # From explicit import
-            "hbar": hbar_val,
-            "k": k,       # From explicit import
-            "g": g,       # From explicit import
-            "convtemp": convtemp,
-            "convlength": convlength,
-            "convmass": convmass,
-            "convforce": convforce,
-            "convpres": convpres,
-            "convenergy": convenergy,
-        })
-
-        # Optimization
-        if fminsearch:
-            self.globals.update({
-                "fminsearch": fminsearch,
-                "fzero": fzero,
-                "lsqcurvefit": lsqcurvefit,
-                "fmincon": fmincon,
-                "linprog": linprog,
-            })
-
-        # Toolbox
-        self.globals.update({
-            "meshgrid": meshgrid, "sphere": sphere, "cylinder": cylinder,
-            "gradient": gradient, "cross": cross, "dot": dot,
-            "ode45": ode45, "ode23": ode23, "ode15s": ode15s, "bvp4c": bvp4c,
-            "fft": fft, "ifft": ifft, "roots": roots, "polyval": polyval,
-            "trapz": trapz, "cumtrapz": cumtrapz, "integral": integral,
-            "interp1": interp1, "interp2": interp2, "griddata": griddata,
-            "fftshift": fftshift, "ifftshift": ifftshift, "spectrogram": spectrogram,
-            "pdepe": pdepe,
-            # [NEW] Register Signal Tools
-            "fft2": fft2,
-            "ifft2": ifft2,
-            "filter": filter,
-        })
-
-        # [CRITICAL FIX] Manually register core math functions.
-        # This guarantees they exist and are protected from 'clear'.
-        self.globals.update({
-            "sin": _mlfun.sin, "cos": _mlfun.cos, "tan": _mlfun.tan,
-            "asin": _mlfun.asin, "acos": _mlfun.acos, "atan": _mlfun.atan, "atan2": _mlfun.atan2,
-            "sinh": _mlfun.sinh, "cosh": _mlfun.cosh, "tanh": _mlfun.tanh,
-            "exp": _mlfun.exp, "log": _mlfun.log, "log10": _mlfun.log10, "sqrt": _mlfun.sqrt,
-            "abs": _mlfun.abs, "sign": _mlfun.sign,
-            "floor": _mlfun.floor, "ceil": _mlfun.ceil, "round": _mlfun.round, "fix": _mlfun.fix,
-            "mod": _mlfun.mod, "rem": _mlfun.rem,
-            
-            # COMPLEX NUMBER SUPPORT
-            "angle": _mlfun.angle,
-            "real": _mlfun.real,
-            "imag": _mlfun.imag,
-            "conj": _mlfun.conj,
-            "diag": _mlfun.diag,
-        })
-
-        # Auto-import remaining functions (backup)
-        try:
-            for name in dir(_mlfun):
-                if not name.startswith("_") and name not in self.globals and name not in ("MatlabArray", "scipy", "np", "sympy"):
-                    self.globals[name] = getattr(_mlfun, name)
-        except Exception:
-            pass
-
-        # Plotting API
-        for name in dir(_plt_mod):
-            if not name.startswith("_"):
-                try:
-                    self.globals[name] = getattr(_plt_mod, name)
-                except Exception:
-                    pass
-
-        self.globals.update({
-            "clf": lambda: plot_manager.clf(),
+        # Session-bound commands & I/O (stateless ones live in _IO_BINDINGS)
+        self._session_bindings = {
+            "tic": self._tic,
+            "toc": self._toc,
             "cla": self._cla,
-            "hold": lambda mode=True: plot_manager.hold(mode),
-        })
-
-        # I/O
-        self.globals.update({
             "save": lambda f="workspace.mat": save_workspace(self, f),
-            "load": lambda f="workspace.mat": load_workspace(self, f),
-            "writematrix": writematrix,
-            "readmatrix": readmatrix,
-            "readtable": readtable,
-            "csvread": csvread,
-            "saveas": saveas,
-            "disp": builtins.disp,
+            "load": lambda f="workspace.mat", *names: load_workspace(self, f, list(names) or None),
             "clear": self._clear_user,
-            "clc": builtins.clc,
-            "pause": time.sleep,
-            "who": lambda: builtins.who(self.globals),
-            "whos": lambda: builtins.whos(self.globals),
+            "who": lambda: builtins.who(self.globals, self._builtins_set, self._builtin_defaults()),
+            "whos": lambda: builtins.whos(self.globals, self._builtins_set, self._builtin_defaults()),
             "exist": lambda n, k=None: builtins.exist(n, k, self.globals),
-        })
-        
-        # Control Toolbox
-        try:
-            from mathexlab.toolbox.control import (
-                tf, step, impulse, bode, series, parallel, feedback,
-                rlocus 
-            )
-            self.globals.update({
-                "tf": tf, "step": step, "impulse": impulse,
-                "bode": bode, "series": series, "parallel": parallel,
-                "feedback": feedback, "rlocus": rlocus,
-            })
-        except ImportError:
-            pass
+        }
+        self.globals.update(self._session_bindings)
         
-        # Snapshot built-ins to protect them from 'clear'
-        self._builtins_set = set(self.globals.keys())
+        # Built-ins are protected from 'clear'
+        self._builtins_set = _BUILTIN_KEYS
 
     def execute(self, code: str):
         from mathexlab.kernel.executor import execute as _exec
@@ -387,20 +420,108 @@ class KernelSession:
         finally:
             self._after_execute()
 
+    def builtin_namespace(self):
+        """Fresh dict of this session's builtins (no workspace variables)."""
+        ns = _BUILTIN_TABLE.copy()
+        ns.update(self._session_bindings)
+        return ns
+
+    def _builtin_defaults(self):
+        """
+        Pristine value of each builtin name, for who/whos: session-bound
+        commands included, and lazy builtins whose module is loaded (if it
+        is not, a name like 'step' can only be a user variable).
+        """
+        ns = self.builtin_namespace()
+        for name, (module, attr) in _LAZY_BUILTINS.items():
+            mod = sys.modules.get(module)
+            if mod is not None:
+                ns[name] = getattr(mod, attr, None)
+        return ns
+
+    def lazy_builtin(self, name):
+        """The deferred builtin 'name', imported on demand; None if there is none."""
+        spec = _LAZY_BUILTINS.get(name)
+        if spec is None:
+            return None
+        try:
+            return getattr(importlib.import_module(spec[0]), spec[1])
+        except ImportError:
+            return None
+
+    def bind_lazy_builtins(self, names):
+        """
+        Binds the deferred builtins among 'names' (see lazy_names) before
+        the code using them runs, so it never has to be retried.
+        """
+        for name in _LAZY_BUILTINS.keys() & names:
+            if name not in self.globals:
+                self.load_lazy_builtin(name)
+
+    def load_lazy_builtin(self, name):
+        """
+        Binds a deferred builtin (and the rest of its module's group) into
+        the workspace. Returns False if 'name' is not a lazy builtin.
+        """
+        spec = _LAZY_BUILTINS.get(name)
+        if spec is None or name in self.globals:
+            return False
+        module = spec[0]
+        try:
+            mod = importlib.import_module(module)
+        except ImportError:
+            return False
+        for key, (mod_name, attr) in _LAZY_BUILTINS.items():
+            if mod_name == module and key not in self.globals:
+                self.globals[key] = getattr(mod, attr)
+        return True
+
+    def set_variable(self, name, value):
+        """Assigns a workspace variable (used by load and the function runtime)."""
+        self.globals[name] = value
+
     def _after_execute(self):
+        # Only pump the Qt event loop if plotting requested a draw since the last flush
+        gen = plot_manager.gui_generation
+        if gen == self._gui_seen:
+            return
+        self._gui_seen = gen
+
         try:
             PlotEngine.show()
         except Exception:
             pass
+        # Only a running UI has an event loop to pump; it has loaded Qt
+        # itself, so headless runs never import it from here
+        if "PySide6.QtWidgets" not in sys.modules:
+            return
         try:
-            if QApplication:
-                QApplication.processEvents()
+            q = _get_qapp()
+            if q:
+                q.processEvents()
         except Exception:
             pass
 
     def _drawnow(self):
         self._after_execute()
 
+    def _tic(self, *args):
+        # Timer ids such as tic('loop') are accepted and ignored: there is
+        # one plain timer, and t = tic; toc(t) covers independent timings
+        self._tic_start = TicToken(time.perf_counter_ns())
+        return self._tic_start
+
+    def _toc(self, t=None):
+        if t is None:
+            start = self._tic_start
+            if start is None:
+                raise RuntimeError("You must call tic before calling toc.")
+        else:
+            start = int(t._data.item()) if isinstance(t, MatlabArray) else int(t)
+        val = (time.perf_counter_ns() - start) / 1e9
+        print(f"Elapsed time is {val:.6f} seconds.")
+        return val
+
     def _cla(self):
         ax = plot_manager.gca()
         if ax:
@@ -425,20 +546,12 @@ class KernelSession:
                     vars_to_clear.append(s)
 
         if should_clear_all:
-            # [FIX] Iterate over a COPY of the keys
-            for k in list(self.globals.keys()):
-                if k in self._builtins_set:
-                    continue
-                if k == "ans": 
-                    self.globals[k] = 0
-                    continue
-                try:
-                    del self.globals[k]
-                except Exception:
-                    pass
+            # Only user keys are visited; the set difference is computed in C
+            for k in self.globals.keys() - self._builtins_set:
+                self.globals.pop(k, None)
+            self.globals["ans"] = 0
             return
 
         for name in vars_to_clear:
-             if name in self.globals and name not in self._builtins_set:
-                 try: del self.globals[name]
-                 except: pass
\ No newline at end of file
+            if name not in self._builtins_set:
+                self.globals.pop(name, None)
\ No newline at end of file
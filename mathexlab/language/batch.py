@@ -0,0 +1,112 @@
+# mathexlab/language/batch.py
+"""
+Bulk transpilation of .m files (e.g. a whole toolbox folder).
+
+Sources are transpiled across worker processes, so parsing and codegen
+are not serialised by the GIL, and each result is kept in a disk cache
+keyed by a hash of the source so later runs skip unchanged files.
+"""
+import hashlib
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+
+from mathexlab.io.mfile import read_mfile
+from .transpiler import transpile_unit
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "mathexlab")
+
+# Modules whose source determines the generated Python
+_COMPILER_MODULES = ("tokenizer.py", "parser.py", "ast_nodes.py", "transpiler.py")
+
+@lru_cache(maxsize=None)
+def _compiler_fingerprint() -> bytes:
+    """Digest of the compiler sources: any change invalidates old entries."""
+    h = hashlib.blake2b(digest_size=16)
+    here = os.path.dirname(__file__)
+    for name in _COMPILER_MODULES:
+        with open(os.path.join(here, name), "rb") as f:
+            h.update(f.read())
+    return h.digest()
+
+def _cache_path(code: str, cache_dir: str) -> str:
+    h = hashlib.blake2b(_compiler_fingerprint(), digest_size=16)
+    h.update(code.encode("utf-8"))
+    return os.path.join(cache_dir, h.hexdigest() + ".pkl")
+
+def _load_cached(path):
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+
+def _store_cached(path, result):
+    # Write then rename, so a concurrent reader never sees a partial file
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+def transpile_many(paths, max_workers=None, cache_dir=CACHE_DIR):
+    """
+    Transpiles the given .m files.
+    Returns: {path: (python_code, line_map, func_name)}, as transpile_unit.
+    A file that cannot be read or transpiled maps to the exception raised
+    for it instead; the other files are still transpiled and cached.
+    max_workers=1 transpiles in-process; cache_dir=None disables the cache.
+    """
+    results = {}
+    pending = []  # (path, source, cache file or None)
+
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+
+    for path in paths:
+        try:
+            code = read_mfile(path)
+        except Exception as e:
+            results[path] = e
+            continue
+        cache_file = _cache_path(code, cache_dir) if cache_dir is not None else None
+        hit = _load_cached(cache_file) if cache_file is not None else None
+        if hit is not None:
+            results[path] = hit
+        else:
+            pending.append((path, code, cache_file))
+
+    def _done(path, cache_file, result):
+        if cache_file is not None:
+            _store_cached(cache_file, result)
+        results[path] = result
+
+    if len(pending) > 1 and max_workers != 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(transpile_unit, code): (path, cache_file)
+                       for path, code, cache_file in pending}
+            for fut in as_completed(futures):
+                path, cache_file = futures[fut]
+                try:
+                    result = fut.result()
+                except Exception as e:
+                    results[path] = e
+                else:
+                    _done(path, cache_file, result)
+    else:
+        for path, code, cache_file in pending:
+            try:
+                result = transpile_unit(code)
+            except Exception as e:
+                results[path] = e
+            else:
+                _done(path, cache_file, result)
+
+    # Report in the order the paths were given
+    return {path: results[path] for path in paths}
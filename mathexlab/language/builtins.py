@@ -1,43 +1,66 @@
 import numpy as np
 import os
+import sys
 import time
+from math import prod as _pyprod
+from stat import S_ISDIR
+from functools import lru_cache
+from itertools import repeat
+from operator import itemgetter
 from mathexlab.math.arrays import MatlabArray
 from mathexlab.math.structs import MatlabStruct
 from mathexlab.plotting.state import plot_manager
+from mathexlab.language.functions import registry
 
 # ==========================================================
 # MATLAB Built-ins
 # ==========================================================
 
+# Bound once: skips parsing the format string on every call
+_F4 = "{:.4f}".format
+
+def _fmt_complex(z):
+    # MATLAB style: 1+2i (no parentheses, 'i' suffix); + 0.0 turns -0 into 0
+    return f"{z.real + 0.0:g}{z.imag:+g}i"
+
+_COMPLEX_TYPES = frozenset((complex, np.complex128, np.complex64))
+
 # [FIX] Added num2str function (Safely wraps string in MatlabArray)
 def num2str(x, format_spec=None):
     """
     s = num2str(x)
     Converts number to string representation.
     """
+    # Fast path: plain Python scalars need no numpy probing
+    # (MatlabArray wraps the str itself; no intermediate np.array)
+    t = type(x)
+    if t is int or t is float:
+        return MatlabArray(_F4(x) if format_spec else str(x))
+    if t is complex:
+        return MatlabArray(_fmt_complex(x))
+
     # Unwrap MatlabArray
-    if isinstance(x, MatlabArray):
-        val = x._data
-    else:
-        val = x
-        
-    # Handle Scalar
-    if np.isscalar(val) or (isinstance(val, np.ndarray) and val.size == 1):
-        if isinstance(val, np.ndarray): val = val.item()
-        
-        # Complex handling (Python uses j, MATLAB uses i)
-        if isinstance(val, (complex, np.complex128, np.complex64)):
-            s = str(val).replace('j', 'i')
-        elif format_spec:
-            s = "{:.4f}".format(val)
-        else:
-            s = str(val)
-        
-        # [FIX] Return as MatlabArray so it can be concatenated with other arrays
-        return MatlabArray(np.array(s))
-        
+    val = x._data if t is MatlabArray or isinstance(x, MatlabArray) else x
+
     # Handle Array (simplified default string representation)
-    return MatlabArray(np.array(str(val)))
+    if type(val) is np.ndarray:
+        if val.size != 1:
+            return MatlabArray(str(val))
+        val = val.item()
+    elif not np.isscalar(val):
+        return MatlabArray(str(val))
+
+    # Handle Scalar
+    # Complex handling (Python uses j, MATLAB uses i)
+    if type(val) in _COMPLEX_TYPES:
+        s = _fmt_complex(val)
+    elif format_spec:
+        s = _F4(val)
+    else:
+        s = str(val)
+
+    # [FIX] Return as MatlabArray so it can be concatenated with other arrays
+    return MatlabArray(s)
 
 
 # [FIX] Added deal function for Phase 3 anonymous functions
@@ -54,10 +77,12 @@ def deal(*args):
 
 
 def disp(x=None):
+    # One write per call (print() issues two: the text, then the newline).
+    # Looked up per call so redirect_stdout (the GUI worker's buffer) applies.
     if x is None:
-        print()
+        sys.stdout.write("\n")
     else:
-        print(x)
+        sys.stdout.write(f"{x}\n")
 
 disp.__mathexlab_command__ = True
 
@@ -83,6 +108,29 @@ def drawnow():
 drawnow.__mathexlab_command__ = True
 
 
+# pause() sleeps coarsely, then spins on perf_counter for this tail:
+# OS timers (~15 ms on Windows) would otherwise blow a 60 fps frame budget
+_SPIN_TAIL = 0.003
+
+def precise_sleep(sec):
+    """
+    Sleeps 'sec' seconds. With a GUI attached the last few ms are a
+    perf_counter spin for accurate frame pacing; headless runs keep the
+    plain time.sleep.
+    """
+    sec = float(sec)
+    if sec <= 0:
+        return
+    if not plot_manager.gui_attached:
+        time.sleep(sec)
+        return
+    deadline = time.perf_counter() + sec
+    if sec > _SPIN_TAIL:
+        time.sleep(sec - _SPIN_TAIL)
+    while time.perf_counter() < deadline:
+        pass
+
+
 def pause(n=None):
     """
     pause(n) - Pause for n seconds.
@@ -95,10 +143,8 @@ def pause(n=None):
         time.sleep(0.01)
         return
     
-    # n might be MatlabArray, cast to float
-    sec = float(n)
-    if sec > 0:
-        time.sleep(sec)
+    # n might be MatlabArray; precise_sleep casts to float
+    precise_sleep(n)
 
 pause.__mathexlab_command__ = True
 
@@ -106,55 +152,89 @@ pause.__mathexlab_command__ = True
 # --- END ANIMATION COMMANDS ---
 
 
+_SCALAR_SHAPE = (1, 1)
+
+
+@lru_cache(maxsize=128)
+def _scalar_template(n):
+    return MatlabArray(n)
+
+
+def _ml_scalar(n):
+    """Scalar MatlabArray for an int, cloned from a cached template.
+    Results are fresh copies: callers may mutate them in place (set_val)."""
+    m = MatlabArray.__new__(MatlabArray)
+    m._data = _scalar_template(n)._data.copy()
+    return m
+
 def size(x, dim=None):
     """
     MATLAB-compatible size():
       size(x)      -> [m n] (returns MatlabArray)
       size(x, dim) -> scalar (returns MatlabArray)
     """
-    # Handle standard Python types gracefully
-    if not hasattr(x, "shape"):
-        # Scalars have size [1 1]
-        return MatlabArray([1, 1])
-
-    shape = x.shape
+    # Handle standard Python types gracefully: scalars have size [1 1]
+    shape = getattr(x, "shape", None)
+    if shape is None:
+        shape = _SCALAR_SHAPE
 
     if dim is not None:
         # MATLAB uses 1-based indexing for dimensions
         # If dim is larger than ndim, returns 1
-        d = int(dim)
+        # dim usually arrives as a 1x1 MatlabArray: read the element directly
+        d = int(dim._data.item()) if type(dim) is MatlabArray else int(dim)
         if d < 1 or d > len(shape):
-            return MatlabArray(1)
-        return MatlabArray(shape[d - 1])
+            return _ml_scalar(1)
+        return _ml_scalar(shape[d - 1])
 
     # Return shape as a MatlabArray row vector
-    return MatlabArray(list(shape))
+    # (built straight from the int tuple; a list would go through np.block)
+    return MatlabArray(np.array(shape), copy=False)
 
 
 def length(x):
     """
     MATLAB length(): max(size(x))
     """
-    if not hasattr(x, "shape"):
-        return MatlabArray(1)
-    return MatlabArray(max(x.shape) if x.shape else 1)
+    shape = getattr(x, "shape", None)
+    return _ml_scalar(max(shape) if shape else 1)
 
 
 def numel(x):
     """
     MATLAB numel(): total number of elements
     """
-    if not hasattr(x, "shape"):
-        return MatlabArray(1)
-    return MatlabArray(int(np.prod(x.shape)))
+    shape = getattr(x, "shape", None)
+    if shape is None:
+        return _ml_scalar(1)
+    # math.prod over the shape tuple: no temporary ndarray
+    return _ml_scalar(_pyprod(shape))
 
 
-def who(namespace):
+def _user_items(namespace, builtins_set, defaults=None):
+    """
+    (name, value) pairs of workspace variables. With the session's
+    builtins_set, builtins and loaded .m functions are skipped by name;
+    without it, by the old callable() test. A builtin name rebound to a
+    new value (e.g. c = 5) is a user variable when 'defaults' (the
+    pristine builtin table) is given.
+    """
+    if builtins_set is None:
+        return [(k, v) for k, v in namespace.items()
+                if not k.startswith("__") and not callable(v)]
+    functions = registry.map
+    if defaults is None:
+        return [(k, v) for k, v in namespace.items()
+                if k not in builtins_set and k not in functions and not k.startswith("__")]
+    return [(k, v) for k, v in namespace.items()
+            if not (k in builtins_set and defaults.get(k, v) is v)
+            and k not in functions and not k.startswith("__")]
+
+
+def who(namespace, builtins_set=None, defaults=None):
     print("Your variables are:")
-    names = sorted(
-        k for k, v in namespace.items()
-        if not k.startswith("__") and not callable(v)
-    )
+    names = [k for k, _ in _user_items(namespace, builtins_set, defaults)]
+    names.sort()
     if names:
         print("  " + "  ".join(names))
     else:
@@ -164,34 +244,51 @@ def who(namespace):
 who.__mathexlab_command__ = True
 
 
-def whos(namespace):
+# Exact-type fast path for whos' Class column
+_CLASS_DISPATCH = {
+    int: "double", float: "double", complex: "double", bool: "double",
+    str: "char", MatlabStruct: "struct",
+}
+
+def _whos_class(val):
+    # Subclasses and unseen types: the original isinstance ladder
+    if isinstance(val, (int, float, complex)):
+        return "double"
+    if isinstance(val, str):
+        return "char"
+    if isinstance(val, MatlabStruct):
+        return "struct"
+    return type(val).__name__
+
+
+def _array_class(val):
+    if val.is_sparse:
+        return "sparse double"
+    if val._data.dtype == object:
+        return "struct array"
+    return "double"
+
+
+def whos(namespace, builtins_set=None, defaults=None):
     print(f"{'Name':<12} {'Size':<16} {'Class'}")
     print("-" * 40)
 
-    for name, val in sorted(namespace.items()):
-        if name.startswith("__") or callable(val):
-            continue
-
+    # Filtered first, then sorted in place by name only (never compares values)
+    items = _user_items(namespace, builtins_set, defaults)
+    items.sort(key=itemgetter(0))
+    for name, val in items:
         if hasattr(val, "shape"):
-            dims = "x".join(str(d) for d in val.shape)
-            size_str = dims
+            size_str = "x".join(map(str, val.shape))
         else:
             size_str = "1x1"
 
-        if isinstance(val, MatlabArray):
-            cls = "double" 
-            if val.is_sparse:
-                cls = "sparse double"
-            elif val._data.dtype == object:
-                cls = "struct array"
-        elif isinstance(val, (int, float, complex)):
-            cls = "double"
-        elif isinstance(val, str):
-            cls = "char"
-        elif isinstance(val, MatlabStruct):
-            cls = "struct"
+        tv = type(val)
+        if tv is MatlabArray:
+            cls = _array_class(val)
         else:
-            cls = type(val).__name__
+            cls = _CLASS_DISPATCH.get(tv)
+            if cls is None:
+                cls = _array_class(val) if isinstance(val, MatlabArray) else _whos_class(val)
 
         print(f"{name:<12} {size_str:<16} {cls}")
 
@@ -200,6 +297,20 @@ def whos(namespace):
 whos.__mathexlab_command__ = True
 
 
+def _stat_kind(name):
+    """7 for a folder, 2 for a file or .m file, else 0."""
+    # One stat for the name itself; a second only when it is missing
+    try:
+        return 7 if S_ISDIR(os.stat(name).st_mode) else 2
+    except OSError:
+        pass
+    try:
+        os.stat(name + ".m")
+        return 2
+    except OSError:
+        return 0
+
+
 def exist(name, kind=None, namespace=None):
     """
     exist name [kind]
@@ -212,16 +323,15 @@ def exist(name, kind=None, namespace=None):
             return 1
             
     if kind == 'file' or kind == 'dir' or kind is None:
-        if os.path.exists(name):
-            if os.path.isdir(name):
-                return 7
-            return 2
-        if os.path.exists(name + ".m"):
-            return 2
+        # Not cached: scripts create files (save, writematrix, ...) and
+        # then test for them, and one or two stats cost microseconds
+        return _stat_kind(name)
             
     return 0
 
 
+_OBJ_DTYPE = np.dtype(object)
+
 def struct(*args):
     """
     s = struct('field1', val1, 'field2', val2, ...)
@@ -241,10 +351,14 @@ def struct(*args):
         
         val = args[i+1]
         
-        if isinstance(val, MatlabArray) and val._data.dtype == object:
-             val = val._data.flatten().tolist()
-        
-        if isinstance(val, (list, tuple)):
+        # Exact-type checks: MatlabArray has no subclasses, and the object
+        # dtype is a numpy singleton
+        tv = type(val)
+        if tv is MatlabArray and val._data.dtype is _OBJ_DTYPE:
+            val = val._data.flatten().tolist()
+            tv = list
+
+        if tv is list or tv is tuple or isinstance(val, (list, tuple)):
             has_cells = True
             max_len = max(max_len, len(val))
         
@@ -255,17 +369,16 @@ def struct(*args):
         data = {k: v for k, v in zip(keys, values)}
         return MatlabStruct(**data)
 
-    struct_list = []
-    for idx in range(max_len):
-        data = {}
-        for k, v in zip(keys, values):
-            if isinstance(v, (list, tuple)):
-                if idx < len(v):
-                    data[k] = v[idx]
-                else:
-                    data[k] = None
-            else:
-                data[k] = v
-        struct_list.append(MatlabStruct(**data))
-
-    return MatlabArray(np.array(struct_list, dtype=object).reshape(1, max_len))
\ No newline at end of file
+    # One column per field, padded to max_len; rows are then zipped in C
+    cols = []
+    for v in values:
+        if isinstance(v, (list, tuple)):
+            cols.append(list(v) + [None] * (max_len - len(v)))
+        else:
+            cols.append(repeat(v, max_len))
+    # fromiter fills the object array straight from the generator (no
+    # intermediate list, no sequence probing of each MatlabStruct)
+    arr = np.fromiter((MatlabStruct(**dict(zip(keys, row))) for row in zip(*cols)),
+                      dtype=object, count=max_len)
+
+    return MatlabArray(arr.reshape(1, max_len), copy=False)
@@ -5,11 +5,21 @@ A small function registry + loader used by the transpiler/executor to
 register user-defined functions (from .m files) and call them later.
 """
 
-from types import FunctionType
+from types import CodeType, FunctionType
 from typing import Dict, Optional, List
 import textwrap
 
+def _referenced_names(code: CodeType) -> set:
+    """Names a code object (and every nested function/class body) may load."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            names |= _referenced_names(const)
+    return names
+
 class FunctionEntry:
+    __slots__ = ('name', 'func', 'source', 'filename')
+
     def __init__(self, name: str, func: FunctionType, source: Optional[str]=None, filename: Optional[str]=None, source_file: Optional[str]=None):
         self.name = name
         self.func = func
@@ -26,6 +36,9 @@ class FunctionRegistry:
     """
     def __init__(self):
         self._map: Dict[str, FunctionEntry] = {}
+        # Public view of the same dict: hot paths use map.get(name) / 'in map'
+        # directly instead of going through exists()/__contains__
+        self.map = self._map
 
     def register(self, entry: FunctionEntry):
         """
@@ -38,10 +51,14 @@ class FunctionRegistry:
         """
         Compile python source and register.
         """
-        # Defensive copy of globals
-        exec_scope = dict(global_scope)
         try:
-            exec(py_source, exec_scope)
+            code = compile(py_source, filename or "<string>", "exec")
+            # Defensive copy of globals, limited to the names the source can
+            # reach: O(referenced names) instead of O(size of the workspace)
+            exec_scope = {k: global_scope[k] for k in _referenced_names(code) if k in global_scope}
+            if "__builtins__" in global_scope:
+                exec_scope["__builtins__"] = global_scope["__builtins__"]
+            exec(code, exec_scope)
         except Exception as e:
             raise RuntimeError(f"Failed to compile function source for '{name}': {e}")
 
@@ -90,7 +107,8 @@ class FunctionRegistry:
         return sorted(list(self._map.keys()))
 
     def clear(self):
-        self._map = {}
+        # In place, so the 'map' alias stays valid
+        self._map.clear()
 
 # Singleton default registry
 registry = FunctionRegistry()
\ No newline at end of file
@@ -1,5 +1,5 @@
 from typing import List
-from .tokenizer import Token
+from .tokenizer import Token, Tokenizer
 from .ast_nodes import (
     Node, Program, Assign, MultiAssign, BinOp, UnaryOp, Number, String,
     Variable, Call, Index, Member, Matrix, CellArray, Range, Command,
@@ -7,6 +7,30 @@ from .ast_nodes import (
     FunctionDef, Return, AnonymousFunc, TryBlock, SwitchBlock, ClassDef
 )
 
+# Binary operators per precedence level (hashed membership, not tuple scans)
+_OR_OPS = frozenset({'|', '||'})
+_AND_OPS = frozenset({'&', '&&'})
+_REL_OPS = frozenset({'==', '~=', '<', '>', '<=', '>='})
+_TERM_OPS = frozenset({'+', '-'})
+_FACTOR_OPS = frozenset({'*', '/', '\\', '.*', './', '.\\'})
+_POWER_OPS = frozenset({'^', '.^'})
+
+# Statement separators, statement ends, and keywords that close a block
+_STMT_SEPS = frozenset({'NEWLINE', ';'})
+_LIST_SEPS = frozenset({'NEWLINE', ';', ','})
+_STMT_END = frozenset({'NEWLINE', ';', 'EOF'})
+_BLOCK_TERMINATORS = frozenset({'end', 'else', 'elseif', 'catch', 'case', 'otherwise'})
+
+# Tokens after a NUMBER that make it a complete matrix/cell element
+_LITERAL_FOLLOW = frozenset({'NUMBER', ',', ';', 'NEWLINE', ']', '}'})
+
+# Command syntax ("hold on"): argument token types, and values that make it an expression
+_CMD_ARG_TYPES = frozenset({'ID', 'STRING', 'NUMBER'})
+_CMD_BLOCKERS = frozenset({'(', '.', '=', ',', ';', '+', '-', '*', '/', '^', '[', '{'})
+
+# Returned by lookahead() past the end of the stream (never mutated)
+_EOF = Token('EOF', '')
+
 # ==========================================================
 # PARSER IMPLEMENTATION
 # ==========================================================
@@ -15,6 +39,32 @@ class Parser:
         self.tokens = tokens
         self.pos = 0
 
+        # Keyword -> statement parser (one hash lookup per statement)
+        self._stmt_kw = {
+            'classdef': self.parse_classdef,
+            'function': self.parse_function,
+            'if': self.parse_if,
+            'switch': self.parse_switch,
+            'try': self.parse_try,
+            'for': self.parse_for,
+            'while': self.parse_while,
+            'break': self._parse_break,
+            'continue': self._parse_continue,
+            'global': self.parse_global,
+            'return': self.parse_return,
+        }
+        # Token kind -> base-node parser for atom(), indexed by Token.kind
+        # (NUMBER, STRING, ID, AT, '[', '{', '(' are kinds 0..6)
+        self._atom_table = (
+            self._atom_number,
+            self._atom_string,
+            self._atom_id,
+            self._atom_at,
+            self.parse_matrix,
+            self.parse_cell,
+            self._atom_paren,
+        )
+
     # ---------------- Token helpers ----------------
     def curr(self) -> Token:
         return self.tokens[self.pos]
@@ -30,23 +80,31 @@ class Parser:
 
     def lookahead(self, n=1) -> Token:
         p = self.pos + n
-        return self.tokens[p] if p < len(self.tokens) else Token('EOF', '')
+        return self.tokens[p] if p < len(self.tokens) else _EOF
+
+    def at_keyword(self, value) -> bool:
+        """True if the current token is the keyword 'value' (one token read)."""
+        t = self.tokens[self.pos]
+        return t.type == 'KEYWORD' and t.value == value
 
     def match(self, value) -> bool:
         if self.curr().value == value:
-            self.consume()
+            self.pos += 1
             return True
         return False
 
     # ---------------- Program ----------------
     def parse(self) -> Program:
         stmts = []
-        while self.curr().type != 'EOF':
-            if self.curr().type in ('NEWLINE', ';'):
-                self.consume()
+        tokens = self.tokens
+        while True:
+            tt = tokens[self.pos].type
+            if tt == 'EOF':
+                return Program(stmts)
+            if tt in _STMT_SEPS:
+                self.pos += 1
                 continue
             stmts.append(self.statement())
-        return Program(stmts)
 
     # ---------------- Statement ----------------
     def statement(self) -> Node:
@@ -54,35 +112,22 @@ class Parser:
 
         # 1. Keywords
         if t.type == 'KEYWORD':
-            if t.value == 'classdef': return self.parse_classdef()
-            if t.value == 'function': return self.parse_function()
-            if t.value == 'if': return self.parse_if()
-            if t.value == 'switch': return self.parse_switch()
-            if t.value == 'try': return self.parse_try()
-            if t.value == 'for': return self.parse_for()
-            if t.value == 'while': return self.parse_while()
-            if t.value == 'break': self.consume(); return Break()
-            if t.value == 'continue': self.consume(); return Continue()
-            if t.value == 'global': return self.parse_global()
-            if t.value == 'return':
-                self.consume()
-                if self.curr().type not in ('NEWLINE',';','EOF'):
-                    return Return(self.expression())
-                return Return(None)
-        
+            h = self._stmt_kw.get(t.value)
+            if h is not None:
+                return h()
+
         # 2. Command Syntax: "hold on", "grid off"
-        if (t.type=='ID' and 
-            self.lookahead().type in ('ID','STRING','NUMBER') and 
-            self.lookahead().value not in ('(', '.', '=', ',', ';', '+', '-', '*', '/', '^', '[', '{') 
-            ): 
-            return self.parse_command()
+        if t.type == 'ID':
+            nxt = self.lookahead()
+            if nxt.type in _CMD_ARG_TYPES and nxt.value not in _CMD_BLOCKERS:
+                return self.parse_command()
 
         # 3. Expression or Assignment
         expr = self.expression()
 
         # Check for Assignment '='
-        if self.curr().value == '=':
-            self.consume(value='=')
+        if self.tokens[self.pos].value == '=':
+            self.pos += 1
             rhs = self.expression()
 
             if isinstance(expr, Variable):
@@ -108,6 +153,20 @@ class Parser:
 
         return expr
 
+    def _parse_break(self) -> Break:
+        self.pos += 1
+        return Break()
+
+    def _parse_continue(self) -> Continue:
+        self.pos += 1
+        return Continue()
+
+    def parse_return(self) -> Return:
+        self.pos += 1
+        if self.curr().type not in _STMT_END:
+            return Return(self.expression())
+        return Return(None)
+
     # ---------------- Function ----------------
     def parse_function(self) -> FunctionDef:
         self.consume('KEYWORD','function')
@@ -149,14 +208,15 @@ class Parser:
     # ---------------- Block ----------------
     def parse_block(self) -> List[Node]:
         body = []
-        while self.curr().type != 'EOF' and not (
-            self.curr().type == 'KEYWORD' and self.curr().value in ('end','else','elseif','catch','case','otherwise')
-        ):
-            if self.curr().type in ('NEWLINE',';'):
-                self.consume()
+        tokens = self.tokens
+        while True:
+            t = tokens[self.pos]
+            if t.type == 'EOF' or (t.type == 'KEYWORD' and t.value in _BLOCK_TERMINATORS):
+                return body
+            if t.type in _STMT_SEPS:
+                self.pos += 1
                 continue
             body.append(self.statement())
-        return body
 
     # ---------------- Control Flow ----------------
     def parse_if(self) -> IfBlock:
@@ -167,13 +227,13 @@ class Parser:
         conditions = [(cond, body)]
         else_body = None
 
-        while self.curr().type == 'KEYWORD' and self.curr().value == 'elseif':
-            self.consume()
+        while self.at_keyword('elseif'):
+            self.pos += 1
             cond = self.expression()
             conditions.append((cond, self.parse_block()))
 
-        if self.curr().type == 'KEYWORD' and self.curr().value == 'else':
-            self.consume()
+        if self.at_keyword('else'):
+            self.pos += 1
             else_body = self.parse_block()
 
         self.consume('KEYWORD','end')
@@ -186,8 +246,8 @@ class Parser:
         catch_var = None
         catch_body = []
         
-        if self.curr().type == 'KEYWORD' and self.curr().value == 'catch':
-            self.consume()
+        if self.at_keyword('catch'):
+            self.pos += 1
             # Optional capture: catch ME
             if self.curr().type == 'ID':
                 catch_var = self.consume('ID').value
@@ -205,21 +265,21 @@ class Parser:
         otherwise_body = None
         
         # Skip optional newlines after switch expression
-        while self.curr().type in ('NEWLINE', ';'):
-            self.consume()
+        while self.tokens[self.pos].type in _STMT_SEPS:
+            self.pos += 1
             
-        while self.curr().type == 'KEYWORD' and self.curr().value == 'case':
-            self.consume()
+        while self.at_keyword('case'):
+            self.pos += 1
             case_val = self.expression()
             # Handle potential comma/newline after case value
-            if self.curr().type in ('NEWLINE', ';', ','):
-                self.consume()
+            if self.curr().type in _LIST_SEPS:
+                self.pos += 1
             
             body = self.parse_block()
             cases.append((case_val, body))
             
-        if self.curr().type == 'KEYWORD' and self.curr().value == 'otherwise':
-            self.consume()
+        if self.at_keyword('otherwise'):
+            self.pos += 1
             otherwise_body = self.parse_block()
             
         self.consume('KEYWORD', 'end')
@@ -251,10 +311,14 @@ class Parser:
 
     def parse_command(self) -> Command:
         cmd = self.consume('ID').value
-        args = []
-        while self.curr().type in ('ID','STRING','NUMBER'):
-            args.append(self.consume().value)
-        return Command(cmd, args)
+        # Scan to the end of the argument run, then slice it out in one go
+        # (the token list always ends with EOF, so no bounds check)
+        tokens = self.tokens
+        start = end = self.pos
+        while tokens[end].type in _CMD_ARG_TYPES:
+            end += 1
+        self.pos = end
+        return Command(cmd, [t.value for t in tokens[start:end]])
 
     # ---------------- Expressions ----------------
     def expression(self) -> Node:
@@ -263,141 +327,172 @@ class Parser:
 
     def logic_or(self) -> Node:
         node = self.logic_and()
-        while self.curr().type == 'OP' and self.curr().value in ('|', '||'):
-            op = self.consume().value
-            node = BinOp(node, op, self.logic_and())
-        return node
+        tokens = self.tokens
+        while True:
+            t = tokens[self.pos]
+            if t.type != 'OP' or t.value not in _OR_OPS:
+                return node
+            self.pos += 1
+            node = BinOp(node, t.value, self.logic_and())
 
     def logic_and(self) -> Node:
         node = self.relational()
-        while self.curr().type == 'OP' and self.curr().value in ('&', '&&'):
-            op = self.consume().value
-            node = BinOp(node, op, self.relational())
-        return node
+        tokens = self.tokens
+        while True:
+            t = tokens[self.pos]
+            if t.type != 'OP' or t.value not in _AND_OPS:
+                return node
+            self.pos += 1
+            node = BinOp(node, t.value, self.relational())
 
     def relational(self) -> Node:
         node = self.range_expr()
+        tokens = self.tokens
         # Handle ==, ~=, <, >, <=, >=
-        while self.curr().type == 'OP' and self.curr().value in ('==', '~=', '<', '>', '<=', '>='):
-            op = self.consume().value
-            node = BinOp(node, op, self.range_expr())
-        return node
+        while True:
+            t = tokens[self.pos]
+            if t.type != 'OP' or t.value not in _REL_OPS:
+                return node
+            self.pos += 1
+            node = BinOp(node, t.value, self.range_expr())
 
     def range_expr(self) -> Node:
         node = self.term()
-        if self.curr().value == ':':
-            self.consume()
+        tokens = self.tokens
+        if tokens[self.pos].value == ':':
+            self.pos += 1
             end = self.term()
-            if self.curr().value == ':':
-                self.consume()
+            if tokens[self.pos].value == ':':
+                self.pos += 1
                 step = end
                 end = self.term()
                 return Range(node, step, end)
             return Range(node, None, end)
         return node
 
+    # Hot loops below read tokens through a local and advance self.pos
+    # directly: the operator has already been validated by the set lookup.
     def term(self) -> Node:
         node = self.factor()
-        while self.curr().value in ('+','-'):
-            op = self.consume().value
+        tokens = self.tokens
+        while True:
+            op = tokens[self.pos].value
+            if op not in _TERM_OPS:
+                return node
+            self.pos += 1
             node = BinOp(node, op, self.factor())
-        return node
 
     def factor(self) -> Node:
         node = self.power()
-        while self.curr().value in ('*','/','\\','.*','./','.\\'):
-            op = self.consume().value
+        tokens = self.tokens
+        while True:
+            op = tokens[self.pos].value
+            if op not in _FACTOR_OPS:
+                return node
+            self.pos += 1
             node = BinOp(node, op, self.power())
-        return node
 
     def power(self) -> Node:
         node = self.atom()
-        while self.curr().value in ('^','.^'):
-            op = self.consume().value
+        tokens = self.tokens
+        while True:
+            op = tokens[self.pos].value
+            if op not in _POWER_OPS:
+                return node
+            self.pos += 1
             node = BinOp(node, op, self.atom())
-        return node
 
     # ---------------- Atom ----------------
     def atom(self) -> Node:
-        t = self.curr()
+        t = self.tokens[self.pos]
 
         # 1. Unary Operators
-        if t.value == '-': self.consume(); return UnaryOp('-', self.atom())
-        if t.value == '~': self.consume(); return UnaryOp('~', self.atom())
+        if t.type == 'OP':
+            if t.value == '-': self.pos += 1; return UnaryOp('-', self.atom())
+            if t.value == '~': self.pos += 1; return UnaryOp('~', self.atom())
+            if t.value == ':':
+                self.pos += 1
+                node = String(':')
+            else:
+                raise SyntaxError(f"Unexpected token {t.type}:{t.value}")
 
         # [FIX] Handle 'end' as a String node instead of a Variable
-        if t.type == 'KEYWORD' and t.value == 'end':
-            self.consume()
+        elif t.type == 'KEYWORD' and t.value == 'end':
+            self.pos += 1
             return String('end')
 
         # 2. Base Nodes
-        node = None
-        if t.type == 'AT':
-            self.consume('AT')
-            
-            # [FIX] Handle function handles: @funcName
-            if self.curr().type == 'ID':
-                name = self.consume('ID').value
-                node = Variable(name)
-            
-            # Handle anonymous functions: @(args) ...
-            elif self.curr().value == '(':
-                args = []
-                self.consume('(')
-                if self.curr().type == 'ID':
-                    args.append(self.consume('ID').value)
-                    while self.curr().value == ',':
-                        self.consume(',')
-                        args.append(self.consume('ID').value)
-                self.consume(')')
-                node = AnonymousFunc(args, self.expression())
-            
-            else:
-                raise SyntaxError("Expected identifier or '(' after '@'")
-
-        elif t.type == 'NUMBER': self.consume(); node = Number(t.value)
-        elif t.type == 'STRING': self.consume(); node = String(t.value)
-
-        elif t.type == 'ID':
-            node = Variable(self.consume().value)
-            
-        elif t.type == '[': node = self.parse_matrix()
-        elif t.type == '{': node = self.parse_cell()
+        elif 0 <= t.kind < len(self._atom_table):
+            node = self._atom_table[t.kind]()
 
-        elif t.value == '(':
-            self.consume()
-            node = self.expression()
-            self.consume(')')
-            
-        elif t.value == ':':
-            self.consume()
-            node = String(':') 
-        
         else:
             raise SyntaxError(f"Unexpected token {t.type}:{t.value}")
 
         # 3. Trailers: .field, (args), {args}, ' (transpose)
+        tokens = self.tokens
         while True:
-            if self.curr().value == '.':
-                self.consume('.')
+            t = tokens[self.pos]
+            v = t.value
+            if v == '.':
+                self.pos += 1
                 field = self.consume('ID').value
                 node = Member(node, field)
-            elif self.curr().value == '(':
+            elif v == '(':
                 node = self.parse_call_args(node)
-            
-            elif self.curr().type == 'OP' and self.curr().value == "'":
-                self.consume()
+
+            elif t.type == 'OP' and v == "'":
+                self.pos += 1
                 node = Member(node, 'H') # Conjugate Transpose
-            
-            elif self.curr().type == 'OP' and self.curr().value == ".'":
-                self.consume()
+
+            elif t.type == 'OP' and v == ".'":
+                self.pos += 1
                 node = Member(node, 'T') # Array Transpose
 
             else:
-                break
-        
+                return node
+
+    def _atom_number(self) -> Number:
+        t = self.tokens[self.pos]
+        self.pos += 1
+        return Number(t.value)
+
+    def _atom_string(self) -> String:
+        t = self.tokens[self.pos]
+        self.pos += 1
+        return String(t.value)
+
+    def _atom_id(self) -> Variable:
+        t = self.tokens[self.pos]
+        self.pos += 1
+        return Variable(t.value)
+
+    def _atom_paren(self) -> Node:
+        self.pos += 1
+        node = self.expression()
+        self.consume(')')
         return node
 
+    def _atom_at(self) -> Node:
+        self.consume('AT')
+
+        # [FIX] Handle function handles: @funcName
+        if self.curr().type == 'ID':
+            return Variable(self.consume('ID').value)
+
+        # Handle anonymous functions: @(args) ...
+        if self.curr().value == '(':
+            args = []
+            self.consume('(')
+            if self.curr().type == 'ID':
+                args.append(self.consume('ID').value)
+                while self.curr().value == ',':
+                    self.consume(',')
+                    args.append(self.consume('ID').value)
+            self.consume(')')
+            return AnonymousFunc(args, self.expression())
+
+        raise SyntaxError("Expected identifier or '(' after '@'")
+
     def parse_call_args(self, target: Node) -> Node:
         self.consume('(')
         args = []
@@ -416,33 +511,38 @@ class Parser:
     # ---------------- Matrix / Cell ----------------
     def parse_matrix(self) -> Matrix:
         self.consume('[')
-        rows = []
-        row = []
-        while self.curr().type != ']':
-            if self.curr().type in ('NEWLINE',';'):
-                if row:
-                    rows.append(row); row=[]
-                self.consume(); continue
-            if self.curr().value == ',':
-                self.consume(); continue
-            row.append(self.expression())
-        if row: rows.append(row)
-        self.consume(']')
-        return Matrix(rows)
+        return Matrix(self._parse_rows(']'))
 
     def parse_cell(self) -> CellArray:
         self.consume('{')
-        rows = []; row=[]
-        while self.curr().type != '}':
-            if self.curr().type in ('NEWLINE',';'):
-                if row: rows.append(row); row=[]
-                self.consume(); continue
-            if self.curr().value == ',':
-                self.consume(); continue
+        return CellArray(self._parse_rows('}'))
+
+    def _parse_rows(self, close) -> List[List[Node]]:
+        """Rows of a [...] or {...} literal, up to and including 'close'."""
+        tokens = self.tokens
+        rows = []
+        row = []
+        while True:
+            t = tokens[self.pos]
+            tt = t.type
+            if tt == close:
+                break
+            if tt in _STMT_SEPS:
+                if row:
+                    rows.append(row); row = []
+                self.pos += 1; continue
+            if tt == ',':
+                self.pos += 1; continue
+            # Fast path: a bare numeric literal ([1 2 3], {1, 2}) needs no
+            # trip down the precedence chain
+            if tt == 'NUMBER' and tokens[self.pos + 1].type in _LITERAL_FOLLOW:
+                self.pos += 1
+                row.append(Number(t.value))
+                continue
             row.append(self.expression())
         if row: rows.append(row)
-        self.consume('}')
-        return CellArray(rows)
+        self.consume(close)
+        return rows
     
     # ---------------- OOP / Classes ----------------
     def parse_classdef(self) -> ClassDef:
@@ -454,11 +554,11 @@ class Parser:
         
         # Loop until the class 'end'
         while self.curr().type != 'EOF' and not (
-            self.curr().type == 'KEYWORD' and self.curr().value == 'end'
+            self.at_keyword('end')
         ):
             # Skip newlines/semicolons
-            if self.curr().type in ('NEWLINE', ';'):
-                self.consume()
+            if self.curr().type in _STMT_SEPS:
+                self.pos += 1
                 continue
             
             # Check for blocks
@@ -469,9 +569,9 @@ class Parser:
                     methods.extend(self.parse_methods())
                 else:
                     # Likely an event or attribute we don't support yet, consume to avoid loop
-                    self.consume()
+                    self.pos += 1
             else:
-                self.consume()
+                self.pos += 1
 
         self.consume('KEYWORD', 'end')
         return ClassDef(name, properties, methods)
@@ -487,12 +587,12 @@ class Parser:
                     self.consume('=')
                     self.expression() # Consume logic but ignore for now (Step 1)
             
-            elif self.curr().type in ('NEWLINE', ';', ','):
-                self.consume()
+            elif self.curr().type in _LIST_SEPS:
+                self.pos += 1
             else:
                 # Unexpected token inside properties block, break to avoid inf loop
                 if self.curr().value == 'methods': break 
-                self.consume()
+                self.pos += 1
                 
         self.consume('KEYWORD', 'end')
         return props
@@ -501,13 +601,18 @@ class Parser:
         self.consume('KEYWORD', 'methods')
         funcs = []
         while self.curr().value != 'end' and self.curr().type != 'EOF':
-            if self.curr().type == 'KEYWORD' and self.curr().value == 'function':
+            if self.at_keyword('function'):
                 funcs.append(self.parse_function())
-            elif self.curr().type in ('NEWLINE', ';'):
-                self.consume()
+            elif self.curr().type in _STMT_SEPS:
+                self.pos += 1
             else:
                 # Unexpected token
                 if self.curr().value == 'properties': break
-                self.consume()
+                self.pos += 1
         self.consume('KEYWORD', 'end')
-        return funcs
\ No newline at end of file
+        return funcs
+
+
+def parse_source(code: str) -> Program:
+    """Tokenizes and parses 'code'."""
+    return Parser(Tokenizer(code).tokenize()).parse()
@@ -1,23 +1,108 @@
 # mathexlab/language/tokenizer.py
 
+import re
+import sys
 from dataclasses import dataclass
 from typing import List
 
 
-@dataclass
+# Integer tag per token type, fixed at construction. The parser indexes
+# its atom dispatch list with it instead of hashing the type string.
+TOKEN_KINDS = {
+    'NUMBER': 0, 'STRING': 1, 'ID': 2, 'AT': 3, '[': 4, '{': 5, '(': 6,
+    'OP': 7, 'KEYWORD': 8, 'NEWLINE': 9, ';': 10, ',': 11, ')': 12,
+    ']': 13, '}': 14, '.': 15, 'EOF': 16,
+}
+KIND_KEYWORD = TOKEN_KINDS['KEYWORD']
+
+
+@dataclass(slots=True)
 class Token:
     type: str
     value: str
     line: int = 0
+    kind: int = -1
+
+    def __post_init__(self):
+        if self.kind < 0:
+            self.kind = TOKEN_KINDS.get(self.type, -1)
 
 
 # MATLAB keywords (lowercase compare)
-KEYWORDS = {
+KEYWORDS = frozenset(sys.intern(kw) for kw in (
     'if', 'elseif', 'else', 'end', 'for', 'while', 'break', 'continue',
     'global', 'switch', 'case', 'otherwise', 'try', 'catch',
     'function', 'return',
     'classdef', 'properties', 'methods', 'events'
-}
+))
+
+# Keywords bucketed by length: an identifier of any other length is
+# rejected with one dict probe, and lowercase names skip str.lower()
+KEYWORDS_BY_LEN = {}
+for _kw in KEYWORDS:
+    KEYWORDS_BY_LEN.setdefault(len(_kw), set()).add(_kw)
+KEYWORDS_BY_LEN = {n: frozenset(kws) for n, kws in KEYWORDS_BY_LEN.items()}
+del _kw
+
+
+def _is_keyword(name: str) -> bool:
+    bucket = KEYWORDS_BY_LEN.get(len(name))
+    if bucket is None:
+        return False
+    return (name if name.islower() else name.lower()) in bucket
+
+
+# ASCII character classes indexed by ord(); MATLAB source is almost
+# always ASCII, anything else falls back to the str methods
+_C_OTHER, _C_SPACE, _C_ID_START, _C_DIGIT = 0, 1, 2, 3
+_ASCII_CLASS = bytes(
+    _C_SPACE if chr(i).isspace() else
+    _C_ID_START if chr(i).isalpha() or chr(i) == '_' else
+    _C_DIGIT if chr(i).isdigit() else
+    _C_OTHER
+    for i in range(128)
+)
+IS_DIGIT = bytes(chr(i).isdigit() for i in range(128))
+
+
+def _char_class(ch: str) -> int:
+    if ch < '\x80':
+        return _ASCII_CLASS[ord(ch)]
+    if ch.isspace():
+        return _C_SPACE
+    if ch.isalpha():
+        return _C_ID_START
+    return _C_DIGIT if ch.isdigit() else _C_OTHER
+
+
+def _is_digit(ch: str) -> bool:
+    # '' (past the end) is not a digit
+    return IS_DIGIT[ord(ch)] == 1 if ch and ch < '\x80' else ch.isdigit()
+
+
+# Rest of an identifier: \w is exactly str.isalnum() plus '_'
+_match_ident_tail = re.compile(r'\w*').match
+
+# Runs of whitespace other than newline ([^\S\n] follows str.isspace)
+_match_blank_run = re.compile(r'[^\S\n]+').match
+
+# Numeric literal without the i/j suffix; exponent only when digits follow
+_NUMBER_BODY = r'\d*(?:\.(?!\.\.)\d*)?(?:[eE][+-]?\d+)?'
+_match_number = re.compile(_NUMBER_BODY).match
+# Signed literal ('-5', '+.5'): the sign must be followed by a digit or '.digit'
+_match_signed_number = re.compile(r'[+-](?=\.?\d)' + _NUMBER_BODY).match
+
+# Multi-char operators: element-wise ops and .' (transpose),
+# comparisons == ~= <= >=, short-circuit && ||
+_TWO_CHAR_OPS = {op: op for op in (
+    '.*', './', '.\\', '.^', ".'",
+    '==', '~=', '<=', '>=',
+    '&&', '||',
+)}
+# Characters that start an operator/punctuation token, and the
+# punctuation that is its own token type
+_OP_CHARS = frozenset("+-*/^=<>:;(),[]{}\\.~&|")
+_PUNCT = frozenset("()[]{}.,;")
 
 
 class Tokenizer:
@@ -30,32 +115,48 @@ class Tokenizer:
         self.line = 1
 
     def tokenize(self) -> List[Token]:
+        # The scan runs on locals (text, n, pos, line); helpers take the
+        # current position and return (token, new_pos)
+        text = self.text
+        n = len(text)
+        pos = self.pos
+        line = self.line
         tokens: List[Token] = []
-        # [FIX] Track if we just skipped space to distinguish '1 -5' from '1-5'
-        space_skipped = True 
-
-        while self.pos < len(self.text):
-            ch = self.text[self.pos]
+        append = tokens.append
+        # Operator/punctuation tokens of the current line, by text: repeats
+        # on a line share one Token (nothing mutates them after the scan)
+        line_ops = {}
+        # [FIX] Track if we just skipped space to distinguish '1 -5' from '1-5':
+        # prev is the token just emitted, or None right after space/newline
+        prev = None
+
+        while pos < n:
+            ch = text[pos]
+            cls = _ASCII_CLASS[ord(ch)] if ch < '\x80' else _char_class(ch)
 
             # whitespace / newline
-            if ch.isspace():
+            if cls == _C_SPACE:
                 if ch == '\n':
-                    tokens.append(Token('NEWLINE', '\n', self.line))
-                    self.line += 1
-                self.pos += 1
-                space_skipped = True
+                    append(Token('NEWLINE', '\n', line))
+                    line += 1
+                    pos += 1
+                    line_ops = {}
+                else:
+                    # Skip the whole run of non-newline whitespace in one C call
+                    pos = _match_blank_run(text, pos).end()
+                prev = None
                 continue
 
             # comment %
             if ch == '%':
-                self._skip_comment()
-                space_skipped = True
+                pos = self._skip_comment(pos)
+                prev = None
                 continue
 
             # continuation ...
-            if ch == '.' and self._peek(1) == '.' and self._peek(2) == '.':
-                self._skip_line_continuation()
-                space_skipped = True
+            if ch == '.' and text.startswith('..', pos + 1):
+                pos = self._skip_line_continuation(pos)
+                prev = None
                 continue
             
             # -----------------------------------------------------------
@@ -63,30 +164,30 @@ class Tokenizer:
             # -----------------------------------------------------------
             # If we see + or - followed by a digit/point, AND we just saw space/newline,
             # treat it as a signed number rather than an operator.
-            if ch in ('+', '-') and space_skipped:
-                nxt = self._peek(1)
-                is_digit = nxt.isdigit()
-                is_float = (nxt == '.' and self._peek(2).isdigit())
-                
-                if is_digit or is_float:
-                    # It's a signed number!
-                    tokens.append(self._read_number())
-                    space_skipped = False
+            if (ch == '+' or ch == '-') and prev is None:
+                m = _match_signed_number(text, pos)
+                if m is not None:
+                    # It's a signed number! One match checks and scans it
+                    tok, pos = self._number_token(pos, m.end(), line)
+                    append(tok)
+                    prev = tok
                     continue
 
             # identifiers & keywords A_z0
-            if ch.isalpha() or ch == '_':
-                tok = self._read_identifier()
-                if tok.value.lower() in KEYWORDS:
+            if cls == _C_ID_START:
+                tok, pos = self._read_identifier(pos, line)
+                if _is_keyword(tok.value):
                     tok.type = 'KEYWORD'
-                tokens.append(tok)
-                space_skipped = False
+                    tok.kind = KIND_KEYWORD
+                append(tok)
+                prev = tok
                 continue
 
             # numbers, decimals, sci, 3i
-            if ch.isdigit() or (ch == '.' and self._peek().isdigit()):
-                tokens.append(self._read_number())
-                space_skipped = False
+            if cls == _C_DIGIT or (ch == '.' and _is_digit(text[pos + 1:pos + 2])):
+                tok, pos = self._read_number(pos, line)
+                append(tok)
+                prev = tok
                 continue
 
             # -----------------------------------------------------------
@@ -95,144 +196,103 @@ class Tokenizer:
             if ch == "'":
                 is_transpose = False
                 # [FIX] Transpose requires ADJACENCY. If space was skipped, it's a string.
-                if tokens and not space_skipped:
-                    prev = tokens[-1]
+                if prev is not None:
                     # Transpose valid after: ID, Number, ), ], }, '
                     if prev.type in ('ID', 'NUMBER') or prev.value in (')', ']', '}', "'"):
                         is_transpose = True
                 
                 if is_transpose:
-                    tokens.append(Token('OP', "'", self.line))
-                    self.pos += 1
+                    tok = Token('OP', "'", line)
+                    pos += 1
                 else:
-                    tokens.append(self._read_string())
-                space_skipped = False
+                    tok, pos = self._read_string(pos, line)
+                append(tok)
+                prev = tok
                 continue
 
             # anonymous function @
             if ch == '@':
-                tokens.append(Token('AT', '@', self.line))
-                self.pos += 1
-                space_skipped = False
-                continue
-
-            # cell { } handled literally
-            if ch in "{}":
-                tokens.append(Token(ch, ch, self.line))
-                self.pos += 1
-                space_skipped = False
+                prev = Token('AT', '@', line)
+                append(prev)
+                pos += 1
                 continue
 
-            # operators / punctuation / symbols
-            if ch in "+-*/^=<>:;(),[]\\.~&|":
-                tokens.append(self._read_operator())
-                space_skipped = False
+            # operators / punctuation / symbols (cell { } included)
+            if ch in _OP_CHARS:
+                tok, pos = self._read_operator(pos, line, line_ops)
+                append(tok)
+                prev = tok
                 continue
 
-            raise SyntaxError(f"Unexpected character '{ch}' at line {self.line}")
+            raise SyntaxError(f"Unexpected character '{ch}' at line {line}")
 
-        tokens.append(Token('EOF', '', self.line))
+        append(Token('EOF', '', line))
+        self.pos = pos
+        self.line = line
         return tokens
 
     # ---------------------------------------------------
-    # Helpers
+    # Helpers: each takes the scan position and returns the new one
     # ---------------------------------------------------
-    def _peek(self, offset: int = 1) -> str:
-        p = self.pos + offset
-        return self.text[p] if p < len(self.text) else ''
-
-    def _skip_comment(self):
-        while self.pos < len(self.text) and self.text[self.pos] != '\n':
-            self.pos += 1
-
-    def _skip_line_continuation(self):
-        self.pos += 3
-        while self.pos < len(self.text) and self.text[self.pos] != '\n':
-            self.pos += 1
-
-    def _read_identifier(self) -> Token:
-        start = self.pos
-        while self.pos < len(self.text) and (
-            self.text[self.pos].isalnum() or self.text[self.pos] == '_'
-        ):
-            self.pos += 1
-        return Token('ID', self.text[start:self.pos], self.line)
-
-    def _read_number(self) -> Token:
-        start = self.pos
-        
-        # [FIX] Consume sign if present (for signed numbers)
-        if self.text[self.pos] in ('+', '-'):
-            self.pos += 1
-
-        # integer part
-        while self.pos < len(self.text) and self.text[self.pos].isdigit():
-            self.pos += 1
-
-        # decimal part
-        if self.pos < len(self.text) and self.text[self.pos] == '.':
-            if not (self._peek(1) == '.' and self._peek(2) == '.'):
-                self.pos += 1
-                while self.pos < len(self.text) and self.text[self.pos].isdigit():
-                    self.pos += 1
-
-        # scientific notation
-        if self.pos < len(self.text) and self.text[self.pos] in ('e', 'E'):
-            p = self.pos + 1
-            if p < len(self.text) and self.text[p] in ('+', '-'):
-                p += 1
-            if p < len(self.text) and self.text[p].isdigit():
-                self.pos = p
-                while self.pos < len(self.text) and self.text[self.pos].isdigit():
-                    self.pos += 1
+    def _skip_comment(self, pos: int) -> int:
+        # Up to (not past) the newline, which is still emitted as a token
+        end = self.text.find('\n', pos)
+        return len(self.text) if end < 0 else end
+
+    def _skip_line_continuation(self, pos: int) -> int:
+        return self._skip_comment(pos + 3)
+
+    def _read_identifier(self, pos: int, line: int):
+        # First char is already known to start an identifier; the rest is
+        # one C-level regex scan rather than a Python loop per character
+        text = self.text
+        end = _match_ident_tail(text, pos + 1).end()
+        # Interned: names repeat heavily and are later used as dict keys
+        return Token('ID', sys.intern(text[pos:end]), line), end
+
+    def _read_number(self, pos: int, line: int):
+        # Integer part, decimal part (a '.' opening '...' is a
+        # continuation), exponent: one regex match
+        text = self.text
+        end = _match_number(text, pos).end()
+        if end == pos:
+            raise SyntaxError(f"Unexpected character '{text[pos]}' at line {line}")
+        return self._number_token(pos, end, line)
+
+    def _number_token(self, pos: int, end: int, line: int):
+        # Literal text[pos:end] plus an optional imaginary suffix
+        text = self.text
 
         # imaginary number (3i, 4j)
-        if self.pos < len(self.text) and self.text[self.pos] in ('i', 'j'):
-            nxt = self._peek(1)
+        if end < len(text) and text[end] in ('i', 'j'):
+            nxt = text[end + 1:end + 2]
             # ensure it's not part of a variable name
             if not nxt.isalnum() and nxt != '_':
-                num = self.text[start:self.pos] + 'j'
-                self.pos += 1
-                return Token('NUMBER', num, self.line)
-
-        return Token('NUMBER', self.text[start:self.pos], self.line)
-
-    def _read_string(self) -> Token:
-        self.pos += 1
-        start = self.pos
-        while self.pos < len(self.text) and self.text[self.pos] != "'":
-            self.pos += 1
-        val = self.text[start:self.pos]
-        if self.pos < len(self.text):
-            self.pos += 1
-        return Token('STRING', val, self.line)
-
-    def _read_operator(self) -> Token:
-        ch = self.text[self.pos]
-        nxt = self._peek()
-
-        # [FIX] Handle .' (transpose)
-        if ch == '.' and nxt in ('*', '/', '\\', '^', "'"): 
-            op = ch + nxt
-            self.pos += 2
-            return Token('OP', op, self.line)
-
-        # two-char ops == ~= <= >=
-        if ch in ('=', '~', '<', '>') and nxt == '=':
-            op = ch + nxt
-            self.pos += 2
-            return Token('OP', op, self.line)
-
-        # [FIX] Handle && and ||
-        if ch in ('&', '|') and nxt == ch:
-            op = ch + nxt
-            self.pos += 2
-            return Token('OP', op, self.line)
-
-        # lone char
-        self.pos += 1
-        if ch in "()[]{}.,;":
-            return Token(ch, ch, self.line)
-
-        # arithmetic + - * / \ ^ ~ & | < >
-        return Token('OP', ch, self.line)
\ No newline at end of file
+                return Token('NUMBER', text[pos:end] + 'j', line), end + 1
+
+        return Token('NUMBER', text[pos:end], line), end
+
+    def _read_string(self, pos: int, line: int):
+        # Closing quote found with one str.find; unterminated runs to the end
+        text = self.text
+        end = text.find("'", pos + 1)
+        if end < 0:
+            return Token('STRING', text[pos + 1:], line), len(text)
+        return Token('STRING', text[pos + 1:end], line), end + 1
+
+    def _read_operator(self, pos: int, line: int, line_ops: dict):
+        text = self.text
+        # Two-char ops: one slice + dict probe. The dict hands back the
+        # shared constant, so operator text stays interned.
+        op = _TWO_CHAR_OPS.get(text[pos:pos + 2])
+        if op is not None:
+            end = pos + 2
+        else:
+            # lone char: punctuation or arithmetic + - * / \ ^ ~ & | < >
+            op = text[pos]
+            end = pos + 1
+
+        tok = line_ops.get(op)
+        if tok is None:
+            tok = line_ops[op] = Token(op if op in _PUNCT else 'OP', op, line)
+        return tok, end
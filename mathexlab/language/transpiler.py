@@ -1,5 +1,6 @@
-from .tokenizer import Tokenizer
-from .parser import Parser
+import sys
+from collections import OrderedDict
+from .parser import parse_source
 from .ast_nodes import (
     Program, Assign, BinOp, UnaryOp, Number, Variable, Call,
     Matrix, CellArray, Range, Command, String, Index, Member,
@@ -8,460 +9,500 @@ from .ast_nodes import (
     ClassDef
 )
 
-# List of commands that should be auto-called if found as bare variables
-AUTO_CALL_COMMANDS = {
+# List of commands that should be auto-called if found as bare variables.
+# Interned like the tokenizer's identifiers, so membership hits compare
+# by identity.
+AUTO_CALL_COMMANDS = frozenset(sys.intern(name) for name in (
     'clc', 'clear', 'clf', 'cla', 'hold', 'grid', 'box',
     'tic', 'toc', 'who', 'whos', 'pwd', 'drawnow', 
     'axis', 'shading', 'lighting', 'view', 'figure', 'shg'
-}
+))
+
+# Indentation strings by level; grown on demand in ASTCompiler.indent()
+_INDENTS = tuple("    " * i for i in range(128))
 
 class ASTCompiler:
     def __init__(self):
         self.indent_level = 0
         # Maps generated Python line number -> Original MATLAB line number
         self.line_map = {} 
-        self.current_py_line = 1
+
+        # Exact node type -> generator: one dict probe per node instead of a
+        # chain of isinstance tests. Statements that may span several lines
+        # have emitters that append fully indented lines straight into the
+        # caller's buffer; every generator returns a single line.
+        self._emitters = {
+            ClassDef: self._emit_class,
+            FunctionDef: self._emit_function,
+            IfBlock: self._emit_if,
+            TryBlock: self._emit_try,
+            SwitchBlock: self._emit_switch,
+            ForLoop: self._emit_for,
+            WhileLoop: self._emit_while,
+            Assign: self._emit_assign,
+        }
+        self._generators = {
+            Program: self._gen_program,
+            MultiAssign: self._gen_multi_assign,
+            Return: self._gen_return,
+            BinOp: self._gen_binop,
+            UnaryOp: self._gen_unaryop,
+            Break: self._gen_break,
+            Continue: self._gen_continue,
+            GlobalDecl: self._gen_global,
+            Command: self._gen_command,
+            Range: self._gen_range,
+            Call: self._gen_call,
+            Member: self._gen_member,
+            Index: self._gen_index,
+            AnonymousFunc: self._gen_anonymous,
+            Matrix: self._gen_matrix,
+            CellArray: self._gen_cell,
+            Number: self._gen_number,
+            String: self._gen_string,
+            Variable: self._gen_variable,
+        }
 
     def indent(self):
-        return "    " * self.indent_level
+        global _INDENTS
+        try:
+            return _INDENTS[self.indent_level]
+        except IndexError:
+            _INDENTS += tuple("    " * i for i in range(len(_INDENTS), 2 * self.indent_level + 1))
+            return _INDENTS[self.indent_level]
 
     def _append_stmt(self, lines, stmt):
         """Helper to append a statement with correct indentation handling."""
-        generated = self.generate(stmt)
-        if not generated.strip():
-            return
+        start = len(lines)
+        emit = self._emitters.get(type(stmt))
+        if emit is not None:
+            # Blocks append fully indented lines to the shared buffer, so
+            # nested bodies are never joined and re-split at every level
+            emit(lines, stmt)
+        else:
+            # Single line: statements carry their indent, bare expressions don't
+            generated = self.generate(stmt)
+            if not generated or generated.isspace():
+                return
+            lines.append(generated if generated[0] == " " else self.indent() + generated)
 
         # Record Line Mapping
-        # If the parser attached a line number, map the current Python block start to it.
+        # If the parser attached a line number, map the generated lines to it.
         matlab_line = getattr(stmt, 'lineno', None)
-        
-        for line in generated.split("\n"):
-            # Map current Python line to the Node's original line
-            if matlab_line is not None:
-                self.line_map[self.current_py_line] = matlab_line
-
-            if line.startswith(" "):
-                lines.append(line)
-            else:
-                lines.append(self.indent() + line)
-            
-            # Increment Python line counter
-            self.current_py_line += 1
+        if matlab_line is not None:
+            for py_line in range(start + 1, len(lines) + 1):
+                self.line_map[py_line] = matlab_line
 
     # --------------------------------------------------
     def generate(self, node):
-        # ---------------- Program ----------------
-        if isinstance(node, Program):
+        gen = self._generators.get(type(node))
+        if gen is not None:
+            return gen(node)
+
+        # Multi-line statements rendered on their own
+        emit = self._emitters.get(type(node))
+        if emit is not None:
             lines = []
-            for s in node.stmts:
-                self._append_stmt(lines, s)
+            emit(lines, node)
             return "\n".join(lines)
 
-        # ---------------- ClassDef ----------------
-        if isinstance(node, ClassDef):
-            lines = [f"{self.indent()}class {node.name}:"]
-            self.current_py_line += 1 # Account for class def line
-            self.indent_level += 1
+        return ""
 
-            # 1. Identify Constructor (Method name == Class name)
-            ctor = None
-            for m in node.methods:
-                if m.name == node.name:
-                    ctor = m
-                    break
+    # ---------------- ClassDef ----------------
+    def _emit_class(self, lines, node):
+        # Indent strings are looked up once per level: nested bodies always
+        # restore indent_level before returning
+        lines.append(f"{self.indent()}class {node.name}:")
+        self.indent_level += 1
+        member = self.indent()
+
+        # 1. Identify Constructor (Method name == Class name)
+        ctor = None
+        for m in node.methods:
+            if m.name == node.name:
+                ctor = m
+                break
+
+        # 2. Build Python __init__
+        lines.append(f"{member}def __init__(self, *args):")
+        self.indent_level += 1
+        body = self.indent()
+
+        lines.append(f"{body}nargin = len(args)")
+
+        # Initialize Properties
+        if node.properties:
+            for p in node.properties:
+                lines.append(f"{body}self.{p} = None")
+
+        # Transpile Constructor Body
+        if ctor:
+            # Unpack args manually
+            for i, arg in enumerate(ctor.args):
+                lines.append(f"{body}{arg} = args[{i}] if nargin > {i} else None")
+
+            if ctor.outputs:
+                obj_var = ctor.outputs[0]
+                lines.append(f"{body}{obj_var} = self")
+
+            for stmt in ctor.body:
+                self._append_stmt(lines, stmt)
+        else:
+            lines.append(f"{body}pass")
 
-            # 2. Build Python __init__
-            lines.append(f"{self.indent()}def __init__(self, *args):")
-            self.current_py_line += 1
-            self.indent_level += 1
-            
-            lines.append(f"{self.indent()}nargin = len(args)")
-            self.current_py_line += 1
-
-            # Initialize Properties
-            if node.properties:
-                for p in node.properties:
-                    lines.append(f"{self.indent()}self.{p} = None")
-                    self.current_py_line += 1
-
-            # Transpile Constructor Body
-            if ctor:
-                # Unpack args manually
-                for i, arg in enumerate(ctor.args):
-                    lines.append(f"{self.indent()}{arg} = args[{i}] if nargin > {i} else None")
-                    self.current_py_line += 1
-
-                if ctor.outputs:
-                    obj_var = ctor.outputs[0]
-                    lines.append(f"{self.indent()}{obj_var} = self")
-                    self.current_py_line += 1
-                
-                for stmt in ctor.body:
-                    self._append_stmt(lines, stmt)
-            else:
-                lines.append(f"{self.indent()}pass")
-                self.current_py_line += 1
-
-            self.indent_level -= 1 # Exit __init__
-
-            # 3. Transpile Other Methods
-            for m in node.methods:
-                if m == ctor: continue
-
-                lines.append(f"\n{self.indent()}def {m.name}(self, *args):")
-                self.current_py_line += 2 # Newline + def line
-                self.indent_level += 1
-
-                # Calculate nargin (includes implicit self)
-                lines.append(f"{self.indent()}nargin = 1 + len(args)")
-                self.current_py_line += 1
-
-                if m.args:
-                    obj_var = m.args[0]
-                    lines.append(f"{self.indent()}{obj_var} = self")
-                    self.current_py_line += 1
-                    
-                    # Unpack remaining args (skip self at index 0)
-                    for i, arg in enumerate(m.args[1:]):
-                        if arg == "varargin":
-                             lines.append(f"{self.indent()}varargin = cell(list(args[{i}:]))")
-                             self.current_py_line += 1
-                             break
-                        lines.append(f"{self.indent()}{arg} = args[{i}] if len(args) > {i} else None")
-                        self.current_py_line += 1
-
-                for stmt in m.body:
-                    self._append_stmt(lines, stmt)
-
-                if m.outputs:
-                    ret = ", ".join(m.outputs)
-                    lines.append(f"{self.indent()}return {ret}")
-                    self.current_py_line += 1
-
-                self.indent_level -= 1
-
-            self.indent_level -= 1 # Exit class
-            return "\n".join(lines)
+        self.indent_level -= 1 # Exit __init__
 
-        # ---------------- FunctionDef ----------------
-        if isinstance(node, FunctionDef):
-            header = f"def {node.name}(*args):"
-            self.indent_level += 1
-            body_lines = []
-            
-            # 1. Calculate nargin
-            body_lines.append(self.indent() + "nargin = len(args)")
-
-            # 2. Unpack arguments manually
-            for i, arg_name in enumerate(node.args):
-                if arg_name == "varargin":
-                    # varargin captures remaining args into a cell array
-                    body_lines.append(self.indent() + f"varargin = cell(list(args[{i}:]))")
-                    break
-                else:
-                    # Support optional args by checking nargin
-                    body_lines.append(self.indent() + f"{arg_name} = args[{i}] if nargin > {i} else None")
+        # 3. Transpile Other Methods
+        for m in node.methods:
+            if m == ctor: continue
 
-            # 3. Generate Body
-            for stmt in node.body:
-                self._append_stmt(body_lines, stmt)
-            
-            # GENERATE RETURN INSIDE FUNCTION SCOPE
-            if node.outputs:
-                ret = ", ".join(node.outputs)
-                body_lines.append(self.indent() + f"return {ret}")
+            lines.append("")
+            lines.append(f"{member}def {m.name}(self, *args):")
+            self.indent_level += 1
 
-            self.indent_level -= 1 # Exit function
+            # Calculate nargin (includes implicit self)
+            lines.append(f"{body}nargin = 1 + len(args)")
 
-            return header + "\n" + "\n".join(body_lines)
+            if m.args:
+                obj_var = m.args[0]
+                lines.append(f"{body}{obj_var} = self")
 
-        # ---------------- MultiAssign ----------------
-        if isinstance(node, MultiAssign):
-            lhs = ", ".join(node.targets)
-            rhs = self.generate(node.value)
-            return f"{self.indent()}{lhs} = {rhs}"
+                # Unpack remaining args (skip self at index 0)
+                for i, arg in enumerate(m.args[1:]):
+                    if arg == "varargin":
+                         lines.append(f"{body}varargin = cell(list(args[{i}:]))")
+                         break
+                    lines.append(f"{body}{arg} = args[{i}] if len(args) > {i} else None")
 
-        # ---------------- Assign ----------------
-        if isinstance(node, Assign):
-            # 1. Generate RHS
-            rhs = self.generate(node.value)
-            
-            # 2. Check for Indexed Assignment: A(1) = val
-            if isinstance(node.target, Call): 
-                 func_node = node.target.func
-                 
-                 # Extract name directly if it's a Variable to avoid auto-call syntax (e.g. 'clc()')
-                 if isinstance(func_node, Variable):
-                     func_str = func_node.name
-                 else:
-                     func_str = self.generate(func_node)
-                     
-                 args = ", ".join(self.generate(a) for a in node.target.args)
-                 
-                 # Use raw value for set_val
-                 val_raw = self.generate(node.value) 
-                 
-                 assign_stmt = f"{func_str}.set_val({val_raw}, {args})"
-
-                 # [FIX] Handle Implicit Initialization: A(4) = 3
-                 # If 'A' is a simple variable, we must ensure it exists.
-                 if isinstance(func_node, Variable):
-                     indent = self.indent()
-                     sub = indent + "    "
-                     return (
-                         f"{indent}try:\n"
-                         f"{sub}{func_str}\n"
-                         f"{indent}except NameError:\n"
-                         f"{sub}{func_str} = mat([])\n"
-                         f"{indent}{assign_stmt}"
-                     )
-                 
-                 return f"{self.indent()}{assign_stmt}"
-
-            # 3. Normal Assignment
-            target_str = ""
-            if isinstance(node.target, Member):
-                target_str = f"{self.generate(node.target.target)}.{node.target.field}"
-            else:
-                target_str = self.generate(node.target) if not isinstance(node.target, str) else node.target
+            for stmt in m.body:
+                self._append_stmt(lines, stmt)
 
-            # 4. Force Copy Logic (Pass-by-value emulation)
-            if isinstance(node.value, (Variable, Member)):
-                 rhs = f"{rhs}.copy() if hasattr({rhs}, 'copy') else {rhs}"
-            
-            return f"{self.indent()}{target_str} = {rhs}"
-
-        # ---------------- Return ----------------
-        if isinstance(node, Return):
-            if node.value is None:
-                return self.indent() + "return"
-            return self.indent() + f"return {self.generate(node.value)}"
-
-        # ---------------- Binary Operators ----------------
-        if isinstance(node, BinOp):
-            l = self.generate(node.left)
-            r = self.generate(node.right)
-            
-            if node.op == '&&': return f"({l} and {r})"
-            if node.op == '||': return f"({l} or {r})"
-            if node.op == '~=': return f"({l} != {r})"
-            
-            if node.op == '.*': return f"({l}).emul({r})"
-            if node.op == './': return f"({l}).ediv({r})"
-            if node.op == '.^': return f"({l}).epow({r})"
-            if node.op == '^':  return f"({l} ** {r})"
-            if node.op == '\\': return f"({l}.mldivide({r}))"
-            
-            return f"({l} {node.op} {r})"
+            if m.outputs:
+                ret = ", ".join(m.outputs)
+                lines.append(f"{body}return {ret}")
 
-        # ---------------- Unary Operators ----------------
-        if isinstance(node, UnaryOp):
-            val = self.generate(node.operand)
-            if node.op == '~': return f"(~{val})"
-            return f"({node.op}{val})"
+            self.indent_level -= 1
 
-        # ---------------- IfBlock ----------------
-        if isinstance(node, IfBlock):
-            lines = []
-            for i, (cond, body) in enumerate(node.conditions):
-                tag = "if" if i == 0 else "elif"
-                lines.append(f"{self.indent()}{tag} {self.generate(cond)}:")
-                self.indent_level += 1
-                if body:
-                    for stmt in body:
-                        self._append_stmt(lines, stmt)
-                else:
-                    lines.append(self.indent() + "pass")
-                self.indent_level -= 1
+        self.indent_level -= 1 # Exit class
 
-            if node.else_body is not None:
-                lines.append(f"{self.indent()}else:")
-                self.indent_level += 1
-                for stmt in node.else_body:
-                    self._append_stmt(lines, stmt)
-                self.indent_level -= 1
+    # ---------------- FunctionDef ----------------
+    def _emit_function(self, lines, node):
+        lines.append(f"{self.indent()}def {node.name}(*args):")
+        self.indent_level += 1
+        body = self.indent()
 
-            return "\n".join(lines)
+        # 1. Calculate nargin
+        lines.append(body + "nargin = len(args)")
 
-        # ---------------- TryBlock ----------------
-        if isinstance(node, TryBlock):
-            lines = [f"{self.indent()}try:"]
-            self.indent_level += 1
-            if node.try_body:
-                for stmt in node.try_body:
-                    self._append_stmt(lines, stmt)
+        # 2. Unpack arguments manually
+        for i, arg_name in enumerate(node.args):
+            if arg_name == "varargin":
+                # varargin captures remaining args into a cell array
+                lines.append(body + f"varargin = cell(list(args[{i}:]))")
+                break
             else:
-                lines.append(self.indent() + "pass")
-            self.indent_level -= 1
-            
-            var = node.catch_var if node.catch_var else "ans" 
-            lines.append(f"{self.indent()}except Exception as {var}:")
-            
+                # Support optional args by checking nargin
+                lines.append(body + f"{arg_name} = args[{i}] if nargin > {i} else None")
+
+        # 3. Generate Body
+        for stmt in node.body:
+            self._append_stmt(lines, stmt)
+
+        # GENERATE RETURN INSIDE FUNCTION SCOPE
+        if node.outputs:
+            ret = ", ".join(node.outputs)
+            lines.append(body + f"return {ret}")
+
+        self.indent_level -= 1 # Exit function
+
+    def _emit_body(self, lines, body):
+        """Appends a block body one level deeper ('pass' if it is empty)."""
+        self.indent_level += 1
+        if body:
+            for stmt in body:
+                self._append_stmt(lines, stmt)
+        else:
+            lines.append(self.indent() + "pass")
+        self.indent_level -= 1
+
+    # ---------------- IfBlock ----------------
+    def _emit_if(self, lines, node):
+        indent = self.indent()
+        for i, (cond, body) in enumerate(node.conditions):
+            tag = "if" if i == 0 else "elif"
+            lines.append(f"{indent}{tag} {self.generate(cond)}:")
+            self._emit_body(lines, body)
+
+        if node.else_body is not None:
+            lines.append(f"{indent}else:")
             self.indent_level += 1
-            if node.catch_body:
-                for stmt in node.catch_body:
-                    self._append_stmt(lines, stmt)
-            else:
-                lines.append(self.indent() + "pass")
+            for stmt in node.else_body:
+                self._append_stmt(lines, stmt)
             self.indent_level -= 1
-            
-            return "\n".join(lines)
 
-        # ---------------- SwitchBlock ----------------
-        if isinstance(node, SwitchBlock):
-            switch_var = "_switch_val" 
-            lines = [f"{self.indent()}{switch_var} = {self.generate(node.expression)}"]
-            
-            for i, (case_expr, body) in enumerate(node.cases):
-                tag = "if" if i == 0 else "elif"
-                
-                if isinstance(case_expr, CellArray):
-                    vals = []
-                    for row in case_expr.rows:
-                        for item in row:
-                            vals.append(self.generate(item))
-                    val_str = f"({', '.join(vals)})"
-                    cond = f"{switch_var} in {val_str}"
-                else:
-                    val_str = self.generate(case_expr)
-                    cond = f"{switch_var} == {val_str}"
-                
-                lines.append(f"{self.indent()}{tag} {cond}:")
-                
-                self.indent_level += 1
-                if body:
-                    for stmt in body:
-                        self._append_stmt(lines, stmt)
-                else:
-                    lines.append(self.indent() + "pass")
-                self.indent_level -= 1
-                
-            if node.otherwise_body:
-                lines.append(f"{self.indent()}else:")
-                self.indent_level += 1
-                for stmt in node.otherwise_body:
-                    self._append_stmt(lines, stmt)
-                self.indent_level -= 1
-                
-            return "\n".join(lines)
+    # ---------------- TryBlock ----------------
+    def _emit_try(self, lines, node):
+        indent = self.indent()
+        lines.append(f"{indent}try:")
+        self._emit_body(lines, node.try_body)
+
+        var = node.catch_var if node.catch_var else "ans" 
+        lines.append(f"{indent}except Exception as {var}:")
+        self._emit_body(lines, node.catch_body)
+
+    # ---------------- SwitchBlock ----------------
+    def _emit_switch(self, lines, node):
+        indent = self.indent()
+        switch_var = "_switch_val" 
+        lines.append(f"{indent}{switch_var} = {self.generate(node.expression)}")
+
+        for i, (case_expr, body) in enumerate(node.cases):
+            tag = "if" if i == 0 else "elif"
+
+            if isinstance(case_expr, CellArray):
+                vals = []
+                for row in case_expr.rows:
+                    for item in row:
+                        vals.append(self.generate(item))
+                val_str = f"({', '.join(vals)})"
+                cond = f"{switch_var} in {val_str}"
+            else:
+                val_str = self.generate(case_expr)
+                cond = f"{switch_var} == {val_str}"
 
-        # ---------------- ForLoop ----------------
-        if isinstance(node, ForLoop):
-            header = f"{self.indent()}for {node.var} in {self.generate(node.iterable)}:"
-            self.indent_level += 1
-            body = []
-            for stmt in node.body:
-                self._append_stmt(body, stmt)
-            self.indent_level -= 1
-            return header + "\n" + "\n".join(body)
+            lines.append(f"{indent}{tag} {cond}:")
+            self._emit_body(lines, body)
 
-        # ---------------- WhileLoop ----------------
-        if isinstance(node, WhileLoop):
-            header = f"{self.indent()}while {self.generate(node.condition)}:"
+        if node.otherwise_body:
+            lines.append(f"{indent}else:")
             self.indent_level += 1
-            body = []
-            for stmt in node.body:
-                self._append_stmt(body, stmt)
+            for stmt in node.otherwise_body:
+                self._append_stmt(lines, stmt)
             self.indent_level -= 1
-            return header + "\n" + "\n".join(body)
-
-        # ---------------- Break / Continue ----------------
-        if isinstance(node, Break): return self.indent() + "break"
-        if isinstance(node, Continue): return self.indent() + "continue"
-
-        # ---------------- Globals ----------------
-        if isinstance(node, GlobalDecl):
-            return f"{self.indent()}global {', '.join(node.names)}"
-
-        # ---------------- Command ----------------
-        if isinstance(node, Command):
-            args = ", ".join(repr(a) for a in node.args)
-            return f"{self.indent()}{node.name}({args})"
-
-        # ---------------- Range ----------------
-        if isinstance(node, Range):
-            s = self.generate(node.start)
-            e = self.generate(node.end)
-            st = self.generate(node.step) if node.step else "1"
-            return f"arange({s}, {e}, {st})"
-
-        # ---------------- Call ----------------
-        if isinstance(node, Call):
-            if isinstance(node.func, str):
-                func_str = node.func
-            elif isinstance(node.func, Variable):
-                func_str = node.func.name
-            else:
-                func_str = self.generate(node.func)
-            
-            args = ", ".join(self.generate(a) for a in node.args)
-            return f"{func_str}({args})"
-
-        # ---------------- Member ----------------
-        if isinstance(node, Member):
-            target = self.generate(node.target)
-            return f"{target}.{node.field}"
-
-        # ---------------- Index (Legacy) ----------------
-        if isinstance(node, Index):
-            parts = []
-            for a in node.args:
-                if isinstance(a, String) and a.value == ':':
-                    parts.append(":")
-                elif isinstance(a, Range):
-                    s = self.generate(a.start)
-                    e = self.generate(a.end)
-                    if a.step:
-                        st = self.generate(a.step)
-                        parts.append(f"slice({s}, {e}, {st})")
-                    else:
-                        parts.append(f"slice({s}, {e})")
+
+    # ---------------- ForLoop ----------------
+    def _emit_for(self, lines, node):
+        lines.append(f"{self.indent()}for {node.var} in {self.generate(node.iterable)}:")
+        self.indent_level += 1
+        for stmt in node.body:
+            self._append_stmt(lines, stmt)
+        self.indent_level -= 1
+
+    # ---------------- WhileLoop ----------------
+    def _emit_while(self, lines, node):
+        lines.append(f"{self.indent()}while {self.generate(node.condition)}:")
+        self.indent_level += 1
+        for stmt in node.body:
+            self._append_stmt(lines, stmt)
+        self.indent_level -= 1
+
+    # ---------------- Program ----------------
+    def _gen_program(self, node):
+        lines = []
+        for s in node.stmts:
+            self._append_stmt(lines, s)
+        return "\n".join(lines)
+
+    # ---------------- MultiAssign ----------------
+    def _gen_multi_assign(self, node):
+        lhs = ", ".join(node.targets)
+        rhs = self.generate(node.value)
+        return f"{self.indent()}{lhs} = {rhs}"
+
+    # ---------------- Assign ----------------
+    def _emit_assign(self, lines, node):
+        # 1. Generate RHS
+        rhs = self.generate(node.value)
+
+        # 2. Check for Indexed Assignment: A(1) = val
+        if isinstance(node.target, Call): 
+             func_node = node.target.func
+
+             # Extract name directly if it's a Variable to avoid auto-call syntax (e.g. 'clc()')
+             if isinstance(func_node, Variable):
+                 func_str = func_node.name
+             else:
+                 func_str = self.generate(func_node)
+
+             args = ", ".join(self.generate(a) for a in node.target.args)
+
+             # Use raw value for set_val (the RHS generated above)
+             assign_stmt = f"{func_str}.set_val({rhs}, {args})"
+
+             # [FIX] Handle Implicit Initialization: A(4) = 3
+             # If 'A' is a simple variable, we must ensure it exists.
+             if isinstance(func_node, Variable):
+                 indent = self.indent()
+                 sub = indent + "    "
+                 lines.append(f"{indent}try:")
+                 lines.append(f"{sub}{func_str}")
+                 lines.append(f"{indent}except NameError:")
+                 lines.append(f"{sub}{func_str} = mat([])")
+
+             lines.append(f"{self.indent()}{assign_stmt}")
+             return
+
+        # 3. Normal Assignment
+        target_str = ""
+        if isinstance(node.target, Member):
+            target_str = f"{self.generate(node.target.target)}.{node.target.field}"
+        else:
+            target_str = self.generate(node.target) if not isinstance(node.target, str) else node.target
+
+        # 4. Force Copy Logic (Pass-by-value emulation)
+        # _cp evaluates the source once and copies MatlabArrays
+        if isinstance(node.value, (Variable, Member)):
+             rhs = f"_cp({rhs})"
+
+        lines.append(f"{self.indent()}{target_str} = {rhs}")
+
+    # ---------------- Return ----------------
+    def _gen_return(self, node):
+        if node.value is None:
+            return self.indent() + "return"
+        return self.indent() + f"return {self.generate(node.value)}"
+
+    # ---------------- Binary Operators ----------------
+    def _gen_binop(self, node):
+        l = self.generate(node.left)
+        r = self.generate(node.right)
+
+        if node.op == '&&': return f"({l} and {r})"
+        if node.op == '||': return f"({l} or {r})"
+        if node.op == '~=': return f"({l} != {r})"
+
+        if node.op == '.*': return f"({l}).emul({r})"
+        if node.op == './': return f"({l}).ediv({r})"
+        if node.op == '.^': return f"({l}).epow({r})"
+        if node.op == '^':  return f"({l} ** {r})"
+        if node.op == '\\': return f"({l}.mldivide({r}))"
+
+        return f"({l} {node.op} {r})"
+
+    # ---------------- Unary Operators ----------------
+    def _gen_unaryop(self, node):
+        val = self.generate(node.operand)
+        if node.op == '~': return f"(~{val})"
+        return f"({node.op}{val})"
+
+    # ---------------- Break / Continue ----------------
+    def _gen_break(self, node):
+        return self.indent() + "break"
+
+    def _gen_continue(self, node):
+        return self.indent() + "continue"
+
+    # ---------------- Globals ----------------
+    def _gen_global(self, node):
+        return f"{self.indent()}global {', '.join(node.names)}"
+
+    # ---------------- Command ----------------
+    def _gen_command(self, node):
+        args = ", ".join(repr(a) for a in node.args)
+        return f"{self.indent()}{node.name}({args})"
+
+    # ---------------- Range ----------------
+    def _gen_range(self, node):
+        s = self.generate(node.start)
+        e = self.generate(node.end)
+        st = self.generate(node.step) if node.step else "1"
+        return f"arange({s}, {e}, {st})"
+
+    # ---------------- Call ----------------
+    def _gen_call(self, node):
+        if isinstance(node.func, str):
+            func_str = node.func
+        elif isinstance(node.func, Variable):
+            func_str = node.func.name
+        else:
+            func_str = self.generate(node.func)
+
+        args = ", ".join(self.generate(a) for a in node.args)
+        return f"{func_str}({args})"
+
+    # ---------------- Member ----------------
+    def _gen_member(self, node):
+        target = self.generate(node.target)
+        return f"{target}.{node.field}"
+
+    # ---------------- Index (Legacy) ----------------
+    def _gen_index(self, node):
+        parts = []
+        for a in node.args:
+            if isinstance(a, String) and a.value == ':':
+                parts.append(":")
+            elif isinstance(a, Range):
+                s = self.generate(a.start)
+                e = self.generate(a.end)
+                if a.step:
+                    st = self.generate(a.step)
+                    parts.append(f"slice({s}, {e}, {st})")
                 else:
-                    parts.append(self.generate(a))
-            return f"{self.generate(node.target)}[{', '.join(parts)}]"
-
-        # ---------------- Anonymous Function ----------------
-        if isinstance(node, AnonymousFunc):
-            args = ", ".join(node.args)
-            body = self.generate(node.body)
-            return f"(lambda {args}: {body})"
-
-        # ---------------- Matrix / Cell ----------------
-        if isinstance(node, Matrix):
-            rows = ", ".join([f"[{', '.join(self.generate(x) for x in r)}]" for r in node.rows])
-            return f"mat([{rows}])"
-
-        if isinstance(node, CellArray):
-            rows = ", ".join([f"[{', '.join(self.generate(x) for x in r)}]" for r in node.rows])
-            return f"cell([{rows}])"
-
-        # ---------------- Terminals ----------------
-        if isinstance(node, Number): return node.value
-        
-        if isinstance(node, String):
-            if node.value == ':':
-                return "colon"
-            return repr(node.value)
-            
-        if isinstance(node, Variable): 
-            if node.name in AUTO_CALL_COMMANDS:
-                return f"{node.name}()"
-            return node.name
+                    parts.append(f"slice({s}, {e})")
+            else:
+                parts.append(self.generate(a))
+        return f"{self.generate(node.target)}[{', '.join(parts)}]"
 
-        return ""
+    # ---------------- Anonymous Function ----------------
+    def _gen_anonymous(self, node):
+        args = ", ".join(node.args)
+        body = self.generate(node.body)
+        return f"(lambda {args}: {body})"
 
+    # ---------------- Matrix / Cell ----------------
+    def _gen_matrix(self, node):
+        rows = ", ".join([f"[{', '.join(self.generate(x) for x in r)}]" for r in node.rows])
+        return f"mat([{rows}])"
 
-def transpile(code: str):
+    def _gen_cell(self, node):
+        rows = ", ".join([f"[{', '.join(self.generate(x) for x in r)}]" for r in node.rows])
+        return f"cell([{rows}])"
+
+    # ---------------- Terminals ----------------
+    def _gen_number(self, node):
+        return node.value
+
+    def _gen_string(self, node):
+        if node.value == ':':
+            return "colon"
+        return repr(node.value)
+
+    def _gen_variable(self, node):
+        if node.name in AUTO_CALL_COMMANDS:
+            return f"{node.name}()"
+        return node.name
+
+
+# source -> (python_code, line_map, func_name); bounded LRU
+_TRANSPILE_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+_TRANSPILE_CACHE_SIZE = 256
+
+def transpile_unit(code: str):
     """
-    Returns: (python_code, line_map)
+    Returns: (python_code, line_map, func_name)
+    func_name is the name of the leading top-level function definition,
+    or None for scripts, so callers need not re-parse the output to tell.
+    Repeated sources are served from a cache; line_map is a fresh copy.
     """
+    hit = _TRANSPILE_CACHE.get(code)
+    if hit is None:
+        hit = _transpile_unit_uncached(code)
+        _TRANSPILE_CACHE[code] = hit
+        if len(_TRANSPILE_CACHE) > _TRANSPILE_CACHE_SIZE:
+            _TRANSPILE_CACHE.popitem(last=False)
+    else:
+        _TRANSPILE_CACHE.move_to_end(code)
+    py_code, line_map, func_name = hit
+    return py_code, dict(line_map), func_name
+
+def _transpile_unit_uncached(code: str):
     if not code.strip():
-        return "", {}
+        return "", {}, None
     try:
-        tokens = Tokenizer(code).tokenize()
-        tree = Parser(tokens).parse()
+        tree = parse_source(code)
         
         compiler = ASTCompiler()
+        func_name = None
         
         # Manually drive the top-level generation to capture lines
         if isinstance(tree, Program):
@@ -469,10 +510,21 @@ def transpile(code: str):
             for stmt in tree.stmts:
                 compiler._append_stmt(lines, stmt)
             py_code = "\n".join(lines)
+            if tree.stmts and isinstance(tree.stmts[0], FunctionDef):
+                func_name = tree.stmts[0].name
         else:
             py_code = compiler.generate(tree)
+            if isinstance(tree, FunctionDef):
+                func_name = tree.name
             
-        return py_code, compiler.line_map
+        return py_code, compiler.line_map, func_name
         
     except Exception as e:
-        return f"raise SyntaxError({repr(str(e))})", {}
\ No newline at end of file
+        return f"raise SyntaxError({repr(str(e))})", {}, None
+
+def transpile(code: str):
+    """
+    Returns: (python_code, line_map)
+    """
+    py_code, line_map, _ = transpile_unit(code)
+    return py_code, line_map
@@ -1,41 +1,58 @@
+import importlib
+
 from .arrays import (
     MatlabArray, mat, zeros, ones, eye, linspace, arange,
     sparse, full, colon
 )
 
-from .linalg import (
-    inv, det, eig, rank, norm, lu, svd, qr, pinv, null, orth, eigs
-)
-
-from .statistics import (
-    mean, std, min_func, max_func, sum_func,
-    corrcoef, cov, histcounts, nlinfit
-)
+# Everything else loads on first attribute access (PEP 562), so importing
+# any mathexlab.math submodule no longer pulls in scipy.optimize, the
+# physics tables and the whole engineering toolbox up front.
+# name -> module that defines it
+_LAZY = {}
+for _module, _names in (
+    (".linalg", (
+        "inv", "det", "eig", "rank", "norm", "lu", "svd", "qr", "pinv",
+        "null", "orth", "eigs",
+    )),
+    (".statistics", (
+        "mean", "std", "min_func", "max_func", "sum_func",
+        "corrcoef", "cov", "histcounts", "nlinfit",
+    )),
+    (".calculus", ("diff", "int_func")),
+    # Optimization module
+    (".optim", ("fminsearch", "fzero", "lsqcurvefit", "fmincon", "linprog")),
+    # [FIX] Physics Module and Constants
+    (".physics", (
+        "physconst", "convtemp", "convlength", "convmass", "convforce",
+        "convpres", "convenergy",
+        "PhysicalConstants", "c", "h", "hbar", "G", "k", "e", "g",
+    )),
+    # [FIX] Engineering Toolbox (ODES, Signal, Interp)
+    ("mathexlab.toolbox", (
+        "ode45", "ode23", "ode15s", "bvp4c", "pdepe",
+        "fft", "ifft", "fftshift", "ifftshift", "spectrogram", "pwelch", "findpeaks",
+        "interp1", "interp2", "griddata", "meshgrid",
+        "trapz", "cumtrapz", "integral",
+        "roots", "polyval", "gradient", "cross", "dot",
+        "sphere", "cylinder",
+    )),
+):
+    for _name in _names:
+        _LAZY[_name] = _module
+del _module, _names, _name
 
-from .calculus import diff, int_func
-
-# Import Optimization module
-try:
-    from .optim import fminsearch, fzero, lsqcurvefit, fmincon, linprog
-except ImportError:
-    pass
-
-# [FIX] Import Physics Module and Constants
-from .physics import (
-    physconst, convtemp, convlength, convmass, convforce, convpres, convenergy,
-    PhysicalConstants, c, h, hbar, G, k, e, g
-)
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        value = getattr(importlib.import_module(module, __name__), name)
+    except ImportError as e:
+        # Optional dependency missing: the name is simply not available
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from e
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
 
-# [FIX] Import Engineering Toolbox (ODES, Signal, Interp)
-try:
-    # Use relative import from toolbox package
-    from mathexlab.toolbox import (
-        ode45, ode23, ode15s, bvp4c, pdepe,
-        fft, ifft, fftshift, ifftshift, spectrogram, pwelch, findpeaks,
-        interp1, interp2, griddata, meshgrid,
-        trapz, cumtrapz, integral,
-        roots, polyval, gradient, cross, dot,
-        sphere, cylinder
-    )
-except ImportError:
-    pass
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | _LAZY.keys())
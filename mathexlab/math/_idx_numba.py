@@ -0,0 +1,37 @@
+import numpy as np
+from numba import njit
+
+# ==========================================================
+# JIT KERNELS: MATLAB index vectors
+# ==========================================================
+@njit(cache=True)
+def normalize_idx(idx):
+    """
+    1-based numeric index vector -> (0-based int64 copy, max + 1, any
+    index < 1). One fused pass replaces NumPy's cast, subtract, max and
+    any passes; min/max are kept branch-free so the loop vectorizes.
+    """
+    n = idx.size
+    out = np.empty(n, dtype=np.int64)
+    lo = np.int64(0)
+    hi = np.int64(-1)
+    if n:
+        lo = np.int64(idx[0]) - 1
+        hi = lo
+    for i in range(n):
+        v = np.int64(idx[i]) - 1
+        out[i] = v
+        lo = min(lo, v)
+        hi = max(hi, v)
+    return out, hi + 1, lo < 0
+
+# ==========================================================
+# JIT KERNELS: truth tests
+# ==========================================================
+@njit(cache=True)
+def all_nonzero(a):
+    """np.all for a 1-D array, but stops at the first zero."""
+    for i in range(a.size):
+        if a[i] == 0:
+            return False
+    return True
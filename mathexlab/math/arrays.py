@@ -4,6 +4,7 @@ import scipy.linalg
 import scipy.sparse
 import scipy.sparse.linalg
 import warnings  # [CRITICAL] Required for error suppression
+import importlib
 from typing import Union
 
 # Update types to include SciPy sparse matrices
@@ -31,6 +32,56 @@ def _to_data(x):
     return x
 
 
+def _as_slice(idx, dim_len):
+    """
+    slice equivalent to a non-empty, in-bounds, step-1 run of 0-based
+    indices, or None if idx is anything else (left to np.ix_).
+    """
+    n = idx.size
+    if n == 0:
+        return None
+    first = int(idx[0])
+    if first < 0 or first + n > dim_len:
+        return None
+    if n > 1 and not (np.diff(idx) == 1).all():
+        return None
+    return slice(first, first + n)
+
+
+# Index vectors longer than this go through the Numba kernel (when numba is
+# installed). The first call per dtype compiles (~0.5 s cold, ~0.1 s per
+# extra dtype) and saves only a few microseconds on short vectors, so the
+# kernels are reserved for arrays where the fused pass pays off.
+# The kernel module is imported on first use: numba is slow to import.
+_JIT_MIN_SIZE = 4096
+_idx_kernels = None
+
+def _kernels():
+    """The Numba kernel module, or False when numba is not installed."""
+    global _idx_kernels
+    if _idx_kernels is None:
+        try:
+            _idx_kernels = importlib.import_module("mathexlab.math._idx_numba")
+        except ImportError:
+            _idx_kernels = False
+    return _idx_kernels
+
+def _zero_based(arr):
+    """
+    1-based MATLAB index array -> (0-based int array of the same shape,
+    max + 1 or 0 if empty, whether any index is below 1).
+    """
+    if arr.size > _JIT_MIN_SIZE and arr.dtype.kind in "fiu":
+        kernels = _kernels()
+        if kernels:
+            idx, hi, neg = kernels.normalize_idx(arr.ravel())
+            return idx.reshape(arr.shape), hi, neg
+    idx = arr.astype(int) - 1
+    if idx.size == 0:
+        return idx, 0, False
+    return idx, int(idx.max()) + 1, bool((idx < 0).any())
+
+
 def _to_numpy(x):
     """
     Helper to force data into a dense Numpy array.
@@ -42,6 +93,29 @@ def _to_numpy(x):
     return np.asarray(d)
 
 
+def _idx_from_arg(arg):
+    """
+    Like _to_numpy, for index arguments. A sparse logical mask becomes its
+    1-based positions (column-major, as a column) straight from nonzero(),
+    so a large mask is never expanded to a dense bool buffer.
+    """
+    d = _to_data(arg)
+    if not scipy.sparse.issparse(d):
+        return np.asarray(d)
+    rows = d.shape[0]
+    if d.dtype == bool:
+        r, c = d.nonzero()
+        pos = np.sort(c.astype(np.int64) * rows + r)
+        return (pos + 1).reshape(-1, 1)
+    if d.nnz == rows * d.shape[1]:
+        # Fully populated: CSC data is already in column-major order
+        d = d.tocsc()
+        d.sort_indices()
+        return d.data.reshape(d.shape, order='F')
+    # Implicit zeros are invalid indices; let the dense path report them
+    return d.toarray()
+
+
 class MatlabArray:
     """
     MATLAB-like numerical array.
@@ -50,9 +124,11 @@ class MatlabArray:
     # -----------------------------------------------------
     # CONSTRUCTOR
     # -----------------------------------------------------
-    def __init__(self, data: ArrayLike):
+    def __init__(self, data: ArrayLike, copy: bool = True):
+        # copy=False wraps ndarrays the caller owns (e.g. fresh I/O buffers)
+        # without duplicating them
         if isinstance(data, MatlabArray):
-            self._data = data._data.copy()
+            self._data = data._data.copy() if copy else data._data
         elif scipy.sparse.issparse(data):
             self._data = data
         elif isinstance(data, (list, tuple)):
@@ -73,8 +149,10 @@ class MatlabArray:
                     self._data = np.block(unwrapped)
                 except Exception:
                     self._data = np.array(data)
-        else:
+        elif copy:
             self._data = np.array(data)
+        else:
+            self._data = np.asarray(data)
 
         # [FIX] Only cast to complex if explicit string type, otherwise respect input
         if hasattr(self._data, 'dtype') and self._data.dtype.kind in ('U', 'S'):
@@ -101,6 +179,10 @@ class MatlabArray:
             return self._data.toarray()
         return np.asarray(self._data, dtype=dtype)
     
+    def copy(self):
+        # Independent buffer: 'b = a' must not alias a's data
+        return MatlabArray(self._data.copy(), copy=False)
+
     def __float__(self):
         val = self._data.item()
         if isinstance(val, complex):
@@ -118,7 +200,13 @@ class MatlabArray:
         # MATLAB behavior: True only if ALL elements are non-zero
         if self.is_sparse:
              return self.nnz == self.size 
-        return np.all(self._data).item()
+        d = self._data
+        if d.size > _JIT_MIN_SIZE and d.dtype.kind in "biufc":
+            kernels = _kernels()
+            if kernels:
+                # Early exit on the first zero instead of scanning everything
+                return kernels.all_nonzero(d.ravel(order='K'))
+        return np.all(d).item()
     
     def __iter__(self):
         rows, cols = self.shape
@@ -143,6 +231,16 @@ class MatlabArray:
     def is_sparse(self):
         return scipy.sparse.issparse(self._data)
 
+    def _as_csr(self):
+        """
+        Sparse data as CSR, converted in place on first use so repeated
+        products and solves don't redo the conversion (e.g. COO after a
+        reshape, CSC after a transpose).
+        """
+        if self._data.format != 'csr':
+            self._data = self._data.tocsr()
+        return self._data
+
     @property
     def shape(self):
         return self._data.shape
@@ -175,15 +273,23 @@ class MatlabArray:
     # -----------------------------------------------------
     def __repr__(self):
         if self.is_sparse:
-            d = self._data.tocoo()
-            if d.nnz == 0:
+            d = self._data
+            nnz = d.nnz
+            if nnz == 0:
                 return f"All zero sparse: {self.shape[0]}x{self.shape[1]}"
             limit = 20
-            lines = [f"<Sparse {self.shape} with {d.nnz} stored elements>"]
-            for i in range(min(d.nnz, limit)):
-                lines.append(f"  ({d.row[i]+1}, {d.col[i]+1})\t{d.data[i]}")
-            if d.nnz > limit:
-                lines.append(f"  ... and {d.nnz - limit} more")
+            nz = min(nnz, limit)
+            if d.format == 'csr':
+                # Only the first nz entries: no nnz-sized COO conversion
+                rows = np.searchsorted(d.indptr, np.arange(nz), side='right') - 1
+                cols, vals = d.indices[:nz], d.data[:nz]
+            else:
+                d = d.tocoo()
+                rows, cols, vals = d.row[:nz], d.col[:nz], d.data[:nz]
+            lines = [f"<Sparse {self.shape} with {nnz} stored elements>"]
+            lines.extend(f"  ({r+1}, {c+1})\t{v}" for r, c, v in zip(rows, cols, vals))
+            if nnz > limit:
+                lines.append(f"  ... and {nnz - limit} more")
             return "\n".join(lines)
 
         if self.size == 0:
@@ -200,6 +306,18 @@ class MatlabArray:
     # -----------------------------------------------------
     # INDEXING: MATLAB Style ()
     # -----------------------------------------------------
+    def _linear_sub(self):
+        """
+        Row count for mapping 0-based column-major linear indices k to
+        subscripts (k % rows, k // rows), or 0 when the data is not a
+        non-empty 2-D ndarray. Reads and writes then touch only the
+        addressed elements instead of a flatten(order='F') copy.
+        """
+        d = self._data
+        if type(d) is np.ndarray and d.ndim == 2:
+            return d.shape[0]
+        return 0
+
     def __call__(self, *args):
         if not args:
             return self
@@ -216,15 +334,21 @@ class MatlabArray:
             if isinstance(arg, str) and arg == 'end':
                 if self.is_sparse:
                     return MatlabArray(self._data.reshape((-1,1))[self.size-1, 0])
+                if self._linear_sub():
+                    return MatlabArray(self._data[-1, -1])
                 return MatlabArray(self._data.flatten(order='F')[self.size - 1])
                 
-            val = _to_numpy(arg)
+            val = _idx_from_arg(arg)
             
             if np.isscalar(val) or (isinstance(val, np.ndarray) and val.ndim == 0):
                 idx = int(val) - 1
                 if self.is_sparse:
                      d = self._data.reshape((-1, 1))
                      return MatlabArray(d[idx, 0])
+                rows = self._linear_sub()
+                if rows:
+                    c, r = divmod(idx, rows)
+                    return MatlabArray(self._data[r, c])
                 return MatlabArray(self._data.flatten(order='F')[idx])
 
             arr = np.asarray(val)
@@ -235,38 +359,56 @@ class MatlabArray:
                      return MatlabArray(d[idx])
                 return MatlabArray(self._data.flatten(order='F')[idx].reshape(-1, 1))
             else:
-                idx = arr.astype(int) - 1
+                idx = _zero_based(arr)[0]
                 if self.is_sparse:
                      d = self._data.reshape((-1, 1))
                      return MatlabArray(d[idx, 0])
+                rows = self._linear_sub()
+                if rows:
+                    c, r = divmod(idx, rows)
+                    return MatlabArray(self._data[r, c])
                 return MatlabArray(self._data.flatten(order='F')[idx].reshape(arr.shape))
 
         # CASE 2: N-Dimensional Indexing (A(i, j))
+        # ':', in-bounds scalars and contiguous ranges become slices: if every
+        # dim is one, NumPy's basic indexing takes a view (copied by the
+        # constructor) instead of gathering through an np.ix_ mesh
         grid_indices = []
+        dims = []
         for i, arg in enumerate(args):
             dim_len = self.shape[i] if i < len(self.shape) else 1
+            dims.append(dim_len)
             
             if arg is colon:
-                grid_indices.append(np.arange(dim_len))
+                grid_indices.append(slice(None))
                 continue
                 
             if isinstance(arg, str) and arg == 'end':
-                grid_indices.append(np.array([dim_len - 1]))
+                idx = dim_len - 1
+                grid_indices.append(slice(idx, dim_len) if idx >= 0 else np.array([idx]))
                 continue
                 
-            val = _to_numpy(arg)
+            val = _idx_from_arg(arg)
             if np.isscalar(val) or (isinstance(val, np.ndarray) and val.ndim == 0):
-                grid_indices.append(np.array([int(val) - 1]))
+                idx = int(val) - 1
+                grid_indices.append(slice(idx, idx + 1) if 0 <= idx < dim_len else np.array([idx]))
                 continue
                 
             arr = np.asarray(val)
             if arr.dtype == bool:
-                grid_indices.append(np.nonzero(arr)[0])
+                idx = np.nonzero(arr)[0]
             else:
-                grid_indices.append(arr.astype(int) - 1)
+                idx = _zero_based(arr)[0].flatten()
+            sl = _as_slice(idx, dim_len)
+            grid_indices.append(idx if sl is None else sl)
 
         try:
-            ix_args = [x.flatten() for x in grid_indices]
+            if all(type(x) is slice for x in grid_indices):
+                return MatlabArray(self._data[tuple(grid_indices)])
+            ix_args = [
+                np.arange(*x.indices(d)) if type(x) is slice else x.flatten()
+                for x, d in zip(grid_indices, dims)
+            ]
             mesh = np.ix_(*ix_args)
             return MatlabArray(self._data[mesh])
         except IndexError:
@@ -300,7 +442,7 @@ class MatlabArray:
                 required_shape.append(idx + 1)
                 continue
 
-            val = _to_numpy(arg)
+            val = _idx_from_arg(arg)
             if isinstance(val, np.ndarray) and val.dtype == bool:
                 py_indices.append(val)
                 required_shape.append(0) 
@@ -319,13 +461,10 @@ class MatlabArray:
                      py_indices.append(arr)
                      required_shape.append(0)
                 else:
-                    int_idxs = arr.astype(int) - 1
-                    if np.any(int_idxs < 0): raise IndexError("Index must be positive.")
+                    int_idxs, hi, neg = _zero_based(arr)
+                    if neg: raise IndexError("Index must be positive.")
                     py_indices.append(int_idxs)
-                    if int_idxs.size > 0:
-                        required_shape.append(int_idxs.max() + 1)
-                    else:
-                        required_shape.append(0)
+                    required_shape.append(hi)
                 continue
             raise TypeError(f"Invalid index type: {type(arg)}")
 
@@ -344,6 +483,16 @@ class MatlabArray:
                 idx = py_indices[0]
                 if isinstance(idx, np.ndarray): idx = idx.flatten(order='F')
                 if isinstance(val_data, np.ndarray): val_data = val_data.flatten()
+
+                # Integer positions are written in place through subscripts;
+                # ':' and logical masks stay on the flat path
+                rows = self._linear_sub()
+                is_int = isinstance(idx, (int, np.integer)) or (
+                    isinstance(idx, np.ndarray) and idx.dtype.kind in "iu")
+                if rows and is_int:
+                    c, r = divmod(idx, rows)
+                    self._data[r, c] = val_data
+                    return
                 
                 flat = self._data.flatten(order='F')
                 flat[idx] = val_data
@@ -363,13 +512,28 @@ class MatlabArray:
             if is_linear:
                  req_size = required_shape[0]
                  if req_size > current_size:
-                     flat_old = self._data.flatten(order='F')
-                     flat_new = np.zeros(req_size, dtype=self._data.dtype)
-                     flat_new[:current_size] = flat_old
+                     # Copy the old data and zero only the grown tail (with
+                     # np.zeros' fill value, so char arrays pad with '')
+                     flat_new = np.empty(req_size, dtype=self._data.dtype)
+                     flat_new[:current_size].reshape(current_shape_tuple, order='F')[...] = self._data
+                     flat_new[current_size:] = np.zeros((), dtype=flat_new.dtype)
+
+                     # Indices are already resolved: write straight into the new buffer
+                     idx = py_indices[0]
+                     if isinstance(idx, np.ndarray): idx = idx.flatten(order='F')
+                     if isinstance(val_data, np.ndarray): val_data = val_data.flatten()
+                     try:
+                         flat_new[idx] = val_data
+                         fused = True
+                     except (IndexError, ValueError):
+                         fused = False
+
                      if self.shape[1] == 1 and self.shape[0] > 0:
                          self._data = flat_new.reshape(-1, 1, order='F')
                      else:
                          self._data = flat_new.reshape(1, -1, order='F')
+                     if fused:
+                         return
                      
                      if self._data.shape != current_shape_tuple or self._data.size != current_size:
                         self.set_val(value, *args)
@@ -387,10 +551,27 @@ class MatlabArray:
             if tuple(new_shape) == current_shape_tuple:
                 raise e
             
-            expanded = np.zeros(new_shape, dtype=self._data.dtype)
             source_slices = tuple(slice(0, s) for s in current_shape_tuple)
-            expanded[source_slices] = self._data
+            if len(new_shape) == len(current_shape_tuple):
+                # Zero only the grown region of each dim (np.zeros' fill
+                # value for the dtype: '' for char, 0 for cells)
+                expanded = np.empty(new_shape, dtype=self._data.dtype)
+                pad = np.zeros((), dtype=expanded.dtype)
+                expanded[source_slices] = self._data
+                for dim, old in enumerate(current_shape_tuple):
+                    if new_shape[dim] > old:
+                        expanded[(slice(None),) * dim + (slice(old, None),)] = pad
+            else:
+                expanded = np.zeros(new_shape, dtype=self._data.dtype)
+                expanded[source_slices] = self._data
             self._data = expanded
+
+            if len(py_indices) > 1:
+                try:
+                    expanded[tuple(py_indices)] = val_data
+                    return
+                except (IndexError, ValueError):
+                    pass
             self.set_val(value, *args)
 
     # -----------------------------------------------------
@@ -434,8 +615,8 @@ class MatlabArray:
 
     def __mul__(self, o):
         with np.errstate(all='ignore'):
-            A = self._data
-            B = _to_data(o)
+            A = self._as_csr() if self.is_sparse else self._data
+            B = o._as_csr() if isinstance(o, MatlabArray) and o.is_sparse else _to_data(o)
             dimA = A.ndim if hasattr(A, 'ndim') else 0
             dimB = B.ndim if hasattr(B, 'ndim') else 0
             is_scalar_A = (dimA == 0) or (hasattr(A, 'size') and A.size == 1)
@@ -465,7 +646,7 @@ class MatlabArray:
     def mldivide(self, o):
         with np.errstate(all='ignore'):
             b = _to_data(o)
-            A = self._data
+            A = self._as_csr() if self.is_sparse else self._data
             if hasattr(A, 'ndim') and A.ndim == 2:
                 try:
                     if scipy.sparse.issparse(A):
@@ -549,16 +730,32 @@ def sparse(i, j=None, v=None, m=None, n=None):
         if scipy.sparse.issparse(val): return MatlabArray(val)
         return MatlabArray(scipy.sparse.csr_matrix(val))
 
-    idx_i = _to_numpy(i).flatten() - 1
-    idx_j = _to_numpy(j).flatten() - 1
-    vals  = _to_numpy(v).flatten()
+    rows = _to_numpy(i).ravel()
+    cols = _to_numpy(j).ravel()
+    vals  = _to_numpy(v).ravel()
 
-    if m is None: m = int(idx_i.max()) + 1
-    if n is None: n = int(idx_j.max()) + 1
+    if m is None: m = int(rows.max())
+    if n is None: n = int(cols.max())
+
+    # Build the triplets in SciPy's own index type (int32 when it fits),
+    # shifted in place, so the COO -> CSR step casts nothing again
+    hi = max(int(m), int(n), int(rows.max(initial=0)), int(cols.max(initial=0)))
+    idx_dtype = np.int32 if hi <= np.iinfo(np.int32).max else np.int64
+    idx_i = rows.astype(idx_dtype)
+    idx_j = cols.astype(idx_dtype)
+    np.subtract(idx_i, 1, out=idx_i)
+    np.subtract(idx_j, 1, out=idx_j)
 
     mat_data = scipy.sparse.csr_matrix((vals, (idx_i, idx_j)), shape=(int(m), int(n)))
     return MatlabArray(mat_data)
 
+def _cp(x):
+    """Copy-on-assign for 'b = a' and 'b = s.f' (emitted by the transpiler)."""
+    if type(x) is MatlabArray:
+        return x.copy()
+    copy = getattr(x, 'copy', None)
+    return copy() if copy is not None else x
+
 def full(A: MatlabArray):
     if not isinstance(A, MatlabArray): return MatlabArray(np.array(A))
     if not A.is_sparse: return A
@@ -1,15 +1,24 @@
 # mathexlab/math/functions.py
+import sys
 import numpy as np
 import scipy.special
-import sympy 
 from .arrays import MatlabArray
 
+# Bound by _is_symbolic: a symbolic value can only exist once sympy has been
+# imported (by syms & co.), so numeric sessions never pay for loading it
+sympy = None
+
 def _unwrap(x):
     """Extract data from MatlabArray or return as-is."""
     return x._data if isinstance(x, MatlabArray) else x
 
 def _is_symbolic(x):
     """Check if x is a SymPy object (symbol, expression) or contains them."""
+    global sympy
+    if sympy is None:
+        sympy = sys.modules.get("sympy")
+        if sympy is None:
+            return False
     if isinstance(x, (sympy.Basic, sympy.Symbol)):
         return True
     if isinstance(x, np.ndarray) and x.dtype == object:
@@ -18,12 +18,18 @@ Rules:
     - No pyplot usage
 """
 
-from typing import Optional, Dict, Union
+from __future__ import annotations
+
+from typing import Optional, Dict, Union, TYPE_CHECKING
 
 from .state import plot_manager
-from .mpl_backend import PlotWidget, HeadlessPlotWidget
 from .engine import PlotEngine
 
+# mpl_backend imports Qt at module level: it is loaded by the first
+# figure, so headless sessions that never plot never load PySide6
+if TYPE_CHECKING:
+    from .mpl_backend import PlotWidget, HeadlessPlotWidget
+
 # ------------------------------------------------------------------
 # Internal registry
 # ------------------------------------------------------------------
@@ -57,6 +63,7 @@ def _create_widget():
     """Factory to create appropriate widget based on engine mode."""
     # Ensure engine is initialized to check mode
     PlotEngine.initialize()
+    from .mpl_backend import PlotWidget, HeadlessPlotWidget
     
     # If in test or CLI mode, use headless
     if PlotEngine._mode in ("test", "cli"):
@@ -77,6 +77,11 @@ def _map_matlab_kwargs(kwargs):
 # BASE HANDLE
 # ============================================================
 
+# Every handle class (filled in as subclasses are defined); the executor
+# checks plot results against this with a single set lookup
+HANDLE_TYPES: set = set()
+
+
 class GraphicsHandle:
     """
     Base class for all graphics handles.
@@ -85,6 +90,10 @@ class GraphicsHandle:
     MATLAB-style property access.
     """
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        HANDLE_TYPES.add(cls)
+
     def __init__(self, artist: Any, *, parent=None):
         self._artist = artist
         self._parent = parent
@@ -238,6 +247,8 @@ class TextHandle(GraphicsHandle): pass
 class AxesHandle(GraphicsHandle): pass
 class FigureHandle(GraphicsHandle): pass
 
+HANDLE_TYPES.add(GraphicsHandle)
+
 
 # ============================================================
 # MATLAB-STYLE FREE FUNCTIONS
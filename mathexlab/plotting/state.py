@@ -51,6 +51,7 @@ class PlotStateManager:
     _immediate_draw: bool
     _figure_creator: Optional[Callable[[], None]]
     _draw_event: threading.Event  # [FIX] Sync event
+    _gui_generation: int
 
     def __new__(cls):
         if cls._instance is None:
@@ -62,6 +63,8 @@ class PlotStateManager:
             inst._last_draw_request = 0.0
             inst._immediate_draw = False
             inst._figure_creator = None
+            # Bumped on every draw request; lets the kernel skip idle GUI work
+            inst._gui_generation = 0
             
             # [FIX] Event to block kernel until UI finishes drawing
             inst._draw_event = threading.Event()
@@ -410,6 +413,16 @@ class PlotStateManager:
             # We are the Worker Thread. Wait for UI to finish drawing.
             self._draw_event.wait(timeout=2.0)
 
+    @property
+    def gui_generation(self) -> int:
+        """Counter of draw requests; changes whenever plotting touched the GUI."""
+        return self._gui_generation
+
+    @property
+    def gui_attached(self) -> bool:
+        """True once a GUI has registered a figure creator (not headless)."""
+        return self._figure_creator is not None
+
     def notify_draw_complete(self):
         """Called by PlotEngine after a draw is finished to wake up the kernel."""
         self._draw_event.set()
@@ -432,6 +445,7 @@ class PlotStateManager:
     # ------------------------------------------------------------
     def _mark_dirty(self, *, immediate: bool = False):
         self._dirty = True
+        self._gui_generation += 1
         if immediate:
             self._immediate_draw = True
 
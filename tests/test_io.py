@@ -0,0 +1,209 @@
+import numpy as np
+import pytest
+from mathexlab.io.datareader import readmatrix
+
+
+def test_readmatrix_skips_header(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("a,b,c\n1,2,3\n4,5,6.5\n")
+
+    M = readmatrix(str(path))
+    assert M.shape == (2, 3)
+    assert np.allclose(M._data, [[1, 2, 3], [4, 5, 6.5]])
+
+
+def test_readmatrix_streams_large_files(tmp_path, monkeypatch):
+    import mathexlab.io.datareader as datareader
+    monkeypatch.setattr(datareader, "_STREAM_THRESHOLD", 0)
+    monkeypatch.setattr(datareader, "_CHUNK_ROWS", 2)
+
+    path = tmp_path / "big.csv"
+    rows = "\n".join(f"{i},{i * 2}" for i in range(7))
+    path.write_text("x,y\n" + rows + "\n")
+
+    M = readmatrix(str(path))
+    assert M.shape == (7, 2)
+    assert np.allclose(M._data[:, 1], np.arange(7) * 2)
+
+    M = readmatrix(str(path), names=["a", "b"])
+    assert M.shape == (7, 2)
+
+    # A row wider than the probed width is an error, not a silent shift
+    monkeypatch.setattr(datareader, "_PROBE_ROWS", 3)
+    monkeypatch.setattr(datareader, "_CHUNK_ROWS", 3)
+    path.write_text("x,y\n" + rows + "\n7,14,99\n")
+    with pytest.raises(IOError, match="more than 2 fields"):
+        readmatrix(str(path))
+
+
+def test_read_mfile_refreshes_on_change(tmp_path):
+    import os
+    from mathexlab.io.mfile import read_mfile
+
+    path = tmp_path / "script.m"
+    path.write_text("x = 1;\r\n")
+    assert read_mfile(str(path)) == "x = 1;\n"
+    assert read_mfile(str(path)) == "x = 1;\n"
+
+    path.write_text("x = 22;\n")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert read_mfile(str(path)) == "x = 22;\n"
+
+
+def test_save_workspace_keeps_arrays(tmp_path):
+    import scipy.io
+    from mathexlab.kernel.session import KernelSession
+    from mathexlab.io.saver import save_workspace
+
+    s = KernelSession()
+    s.execute("A = [1 2; 3 4];")
+    path = str(tmp_path / "ws.mat")
+    save_workspace(s, path)
+
+    saved = scipy.io.loadmat(path)
+    assert np.array_equal(saved["A"], [[1, 2], [3, 4]])
+    assert "zeros" not in saved
+
+
+@pytest.mark.parametrize("ext", [".mat", ".npz", ".h5"])
+def test_workspace_roundtrip_formats(tmp_path, ext):
+    from mathexlab.kernel.session import KernelSession
+    from mathexlab.io.saver import save_workspace, load_workspace
+
+    if ext == ".h5":
+        pytest.importorskip("h5py")
+    s = KernelSession()
+    s.execute("A = [1 2; 3 4];")
+    path = str(tmp_path / f"ws{ext}")
+    save_workspace(s, path)
+
+    s2 = KernelSession()
+    load_workspace(s2, path)
+    assert np.array_equal(s2.globals["A"]._data, [[1, 2], [3, 4]])
+
+
+@pytest.mark.parametrize("ext", [".mat", ".npz", ".h5"])
+def test_load_workspace_selected_names(tmp_path, ext):
+    from mathexlab.kernel.session import KernelSession
+    from mathexlab.io.saver import save_workspace, load_workspace
+
+    if ext == ".h5":
+        pytest.importorskip("h5py")
+    s = KernelSession()
+    s.execute("A = [1 2];")
+    s.execute("B = [3 4];")
+    path = str(tmp_path / f"ws{ext}")
+    save_workspace(s, path)
+
+    s2 = KernelSession()
+    load_workspace(s2, path, variable_names=["B"])
+    assert "B" in s2.globals and "A" not in s2.globals
+
+
+def test_loadmat_wraps_structs(tmp_path):
+    import scipy.io
+    from mathexlab.io.datareader import loadmat
+    from mathexlab.math.structs import MatlabStruct
+
+    path = str(tmp_path / "s.mat")
+    scipy.io.savemat(path, {"A": np.eye(2), "s": {"x": 1.0}})
+
+    S = loadmat(path)
+    assert np.array_equal(S.A._data, np.eye(2))
+    assert isinstance(S.s, MatlabStruct)
+    assert float(S.s.x) == 1.0
+
+
+@pytest.mark.parametrize("use_arrow", [True, False])
+def test_writematrix_roundtrip(tmp_path, monkeypatch, use_arrow):
+    from mathexlab.io import exporter
+    from mathexlab.io.datareader import readmatrix
+    if not use_arrow:
+        monkeypatch.setattr(exporter, "pa", None)
+        monkeypatch.setattr(exporter, "_WRITE_BLOCK", 2)
+
+    M = np.array([[1.5, -2.0], [1 / 3, 1e10], [0.0, 1e-7]])
+    path = tmp_path / "m.csv"
+    exporter.writematrix(M, str(path))
+
+    assert path.read_text() == (
+        "1.5,-2\n0.3333333333333333,1e+10\n0,1e-7\n"
+    )
+    assert np.array_equal(readmatrix(str(path))._data, M)
+
+
+def test_readtable_text_columns(tmp_path):
+    from mathexlab.io.datareader import readtable
+
+    path = tmp_path / "t.csv"
+    path.write_text("id,label\n1,x\n2,\n")
+    T = readtable(str(path))
+
+    assert np.array_equal(T.id._data.ravel(), [1, 2])
+    assert list(T.label._data.ravel()) == ["x", ""]
+
+
+def test_missing_file_raises_file_not_found(tmp_path):
+    from mathexlab.io.datareader import readtable, readmatrix, loadmat
+
+    missing = str(tmp_path / "missing.csv")
+    for reader in (readtable, readmatrix, loadmat):
+        with pytest.raises(FileNotFoundError):
+            reader(missing)
+
+
+def test_loadmat_v73(tmp_path):
+    h5py = pytest.importorskip("h5py")
+    from mathexlab.io.datareader import loadmat
+    from mathexlab.math.arrays import MatlabArray
+    from mathexlab.math.structs import MatlabStruct
+
+    path = str(tmp_path / "v73.mat")
+    with h5py.File(path, "w", userblock_size=512) as f:
+        A = f.create_dataset("A", data=np.array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]).T)
+        A.attrs["MATLAB_class"] = np.bytes_("double")
+        name = f.create_dataset("name", data=np.array([[ord(c)] for c in "hi"], dtype=np.uint16))
+        name.attrs["MATLAB_class"] = np.bytes_("char")
+        codes = np.array([[ord(c) for c in r] for r in ("ab", "cd")], dtype=np.uint16)
+        rows = f.create_dataset("rows", data=codes.T)
+        rows.attrs["MATLAB_class"] = np.bytes_("char")
+        s = f.create_group("s")
+        s.attrs["MATLAB_class"] = np.bytes_("struct")
+        s.create_dataset("x", data=np.array([[7.0]])).attrs["MATLAB_class"] = np.bytes_("double")
+    # MATLAB 7.3 header: text, subsystem offset, version 0x0200, endian 'IM'
+    header = b"MATLAB 7.3 MAT-file".ljust(116) + b"\0" * 8 + b"\x00\x02IM"
+    with open(path, "r+b") as fh:
+        fh.write(header)
+
+    S = loadmat(path)
+    assert np.array_equal(S.A._data, [[1, 2, 3], [4, 5, 6]])
+    assert isinstance(S.name, MatlabArray) and S.name._data.item() == "hi"
+    assert isinstance(S.rows, MatlabArray)
+    assert S.rows._data.ravel().tolist() == ["ab", "cd"]
+    assert isinstance(S.s, MatlabStruct)
+    assert S.s.x._data.item() == 7.0
+
+
+@pytest.mark.parametrize("ext", [".mat", ".npz", ".h5"])
+def test_workspace_roundtrip_with_cell(tmp_path, ext, capsys):
+    from mathexlab.kernel.session import KernelSession
+    from mathexlab.io.saver import save_workspace, load_workspace
+
+    if ext == ".h5":
+        pytest.importorskip("h5py")
+    s = KernelSession()
+    s.execute("A = [1 2]; C = {1, 'ab'}; t = 'hello'; n = 3;")
+    path = str(tmp_path / f"ws{ext}")
+    save_workspace(s, path)
+    if ext != ".mat":
+        assert "Variable 'C' not saved" in capsys.readouterr().out
+    assert [p.name for p in tmp_path.iterdir()] == [f"ws{ext}"]
+
+    s2 = KernelSession()
+    load_workspace(s2, path)
+    g = s2.globals
+    assert np.array_equal(g["A"]._data, [[1, 2]])
+    assert np.asarray(g["t"]._data).flatten()[0] == "hello"
+    assert np.asarray(g["n"]._data).flatten()[0] == 3
+    assert ("C" in g) == (ext == ".mat")
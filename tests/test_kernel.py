@@ -23,7 +23,110 @@ def test_assignment():
     assert s.globals["ans"] == 15
 
 
+def test_assignment_copies_array():
+    s = KernelSession()
+    execute("a = [1 2 3]; b = a; b(1) = 5;", s)
+    assert s.globals["a"]._data.tolist() == [[1, 2, 3]]
+    assert s.globals["b"]._data.tolist() == [[5, 2, 3]]
+
+
 def test_undefined_variable():
     s = KernelSession()
     err = execute("x", s)
     assert err is not None
+
+
+def test_tic_handle_toc():
+    s = KernelSession()
+    assert execute("t = tic;", s) is None
+    assert execute("e = toc(t);", s) is None
+    assert 0 <= s.globals["e"] < 5
+    assert execute("tic('loop'); e = toc;", s) is None
+    assert 0 <= s.globals["e"] < 5
+
+
+def test_num2str_complex_matlab_style():
+    from mathexlab.language.builtins import num2str
+    assert num2str(1 + 2j)._data.item() == "1+2i"
+    assert num2str(-1j)._data.item() == "0-1i"
+
+
+def test_who_lists_arrays_not_builtins(capsys):
+    s = KernelSession()
+    execute("A = [1 2; 3 4];", s)
+    capsys.readouterr()
+    execute("who", s)
+    out = capsys.readouterr().out
+    assert "A" in out.split()
+    assert "sin" not in out.split()
+
+
+def test_who_lists_variables_named_like_builtins(capsys):
+    s = KernelSession()
+    execute("x = tf(1, [1 1]);", s)
+    execute("step = 0.1; limit = 10; tic = 3;", s)
+    capsys.readouterr()
+    execute("who", s)
+    names = capsys.readouterr().out.split()
+    assert {"step", "limit", "tic", "x"} <= set(names)
+    assert "toc" not in names and "tf" not in names
+
+
+def test_whos_shows_variable_shadowing_builtin(capsys):
+    s = KernelSession()
+    execute("c = sparse(eye(2));", s)
+    capsys.readouterr()
+    execute("whos", s)
+    out = capsys.readouterr().out
+    assert "sparse double" in out
+    assert "pi" not in out.split()
+
+
+def test_function_file_scope_is_private(tmp_path):
+    from mathexlab.kernel.path_manager import path_manager
+    (tmp_path / "outer_fn.m").write_text(
+        "function r = outer_fn(x)\nr = helper(x) + zeros(1, 1);\nend\n"
+        "function y = helper(x)\ny = x * 2;\nend\n"
+    )
+    (tmp_path / "peek_fn.m").write_text("function y = peek_fn()\ny = wsvar;\nend\n")
+    path_manager.add_path(str(tmp_path))
+    try:
+        s = KernelSession()
+        execute("helper = 5; wsvar = 1; r = outer_fn(2);", s)
+        # The subfunction neither overwrites nor joins the workspace
+        assert s.globals["helper"] == 5
+        assert s.globals["r"] == 4
+        # Function bodies cannot see workspace variables
+        assert isinstance(execute("q = peek_fn();", s), NameError)
+    finally:
+        path_manager.remove_path(str(tmp_path))
+
+
+def test_lazy_builtin_does_not_rerun_snippet(tmp_path, capsys):
+    csv = tmp_path / "d.csv"
+    csv.write_text("1,2\n3,4\n")
+    s = KernelSession()
+    execute("x = 0;", s)
+    execute(f"x = x + 1; M = readmatrix('{csv}'); disp(x)", s)
+    assert s.globals["x"] == 1
+    assert capsys.readouterr().out.split() == ["1"]
+
+
+def test_exist_sees_file_created_by_script(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    s = KernelSession()
+    execute("a = exist('out1.mat'); save('out1.mat'); b = exist('out1.mat');", s)
+    assert (s.globals["a"], s.globals["b"]) == (0, 2)
+
+
+def test_headless_execute_does_not_load_qt():
+    import subprocess
+    import sys
+    code = (
+        "import sys\n"
+        "from mathexlab.kernel.session import KernelSession\n"
+        "KernelSession().execute('x = 1;')\n"
+        "print('PySide6.QtWidgets' in sys.modules)\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip().splitlines()[-1] == "False"
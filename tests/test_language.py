@@ -1,3 +1,5 @@
+import numpy as np
+import pytest
 from mathexlab.kernel.session import KernelSession
 from mathexlab.kernel.executor import execute
 
@@ -21,3 +23,163 @@ def test_end_index():
     execute("x = 1:5", s)
     execute("y = x(end)", s)
     assert s.globals["y"] == 5
+
+
+def test_linear_index_is_column_major():
+    s = KernelSession()
+    execute("A = [1 2 3; 4 5 6]; y = A(2); A(3) = 9;", s)
+    assert s.globals["y"] == 4
+    assert s.globals["A"]._data.tolist() == [[1, 9, 3], [4, 5, 6]]
+    execute("A(:) = 5; B = 1:4; B(:) = [9 8 7 6];", s)
+    assert s.globals["A"]._data.tolist() == [[5, 5, 5], [5, 5, 5]]
+    assert s.globals["B"]._data.tolist() == [[9, 8, 7, 6]]
+
+
+def test_growing_assignment_pads_like_zeros():
+    from mathexlab.math.arrays import MatlabArray
+    A = MatlabArray(np.array([["a", "b", "c"]]))
+    A.set_val("x", 5)
+    assert A._data.tolist() == [["a", "b", "c", "", "x"]]
+    B = MatlabArray(np.array([["a", "b"], ["c", "d"]]))
+    B.set_val("z", 3, 3)
+    assert B._data.tolist() == [["a", "b", ""], ["c", "d", ""], ["", "", "z"]]
+    C = MatlabArray(np.array([[1, "q"]], dtype=object))
+    C.set_val(7, 2, 3)
+    assert C._data.tolist() == [[1, "q", 0], [0, 0, 7]]
+    s = KernelSession()
+    execute("D = [1 2; 3 4]; D(3, 3) = 9; E = 1:2; E(4) = 5;", s)
+    assert s.globals["D"]._data.tolist() == [[1, 2, 0], [3, 4, 0], [0, 0, 9]]
+    assert s.globals["E"]._data.tolist() == [[1, 2, 0, 5]]
+
+
+@pytest.mark.parametrize("idx", [
+    np.arange(1, 41, dtype=float).reshape(5, 8),
+    np.array([3.0, 1.9, 7.5, 2.0] * 10),
+    np.arange(40, 0, -1, dtype=np.int32),
+    np.arange(1, 41, dtype=np.uint16),
+    np.array([], dtype=float),
+    np.array([], dtype=np.int64).reshape(0, 3),
+    np.array([5.0, 0.0, 2.0, -3.0] * 10),
+    np.array([0.5, 1.0] * 20),
+], ids=["float2d", "fractional", "int32", "uint16", "empty", "empty2d",
+        "below_one", "truncates_to_zero"])
+def test_zero_based_kernel_matches_numpy(monkeypatch, idx):
+    pytest.importorskip("numba")
+    from mathexlab.math import arrays
+    monkeypatch.setattr(arrays, "_JIT_MIN_SIZE", -1)
+    monkeypatch.setattr(arrays, "_idx_kernels", None)
+    fast, fast_hi, fast_neg = arrays._zero_based(idx)
+    assert arrays._idx_kernels
+    monkeypatch.setattr(arrays, "_idx_kernels", False)
+    slow, slow_hi, slow_neg = arrays._zero_based(idx)
+
+    assert fast.shape == slow.shape == idx.shape
+    assert np.array_equal(fast, slow)
+    assert (fast_hi, fast_neg) == (slow_hi, slow_neg)
+
+
+_ones = np.ones((6, 8))
+_zero_last = np.ones((6, 8))
+_zero_last[-1, -1] = 0
+
+
+@pytest.mark.parametrize("data", [
+    _ones,
+    _zero_last,
+    np.full((6, 8), np.nan),
+    np.ones((6, 8), dtype=bool),
+    ~np.eye(6, 8, dtype=bool),
+    np.full((6, 8), 1j),
+    np.where(np.eye(6, 8), 0j, 1 + 0j),
+    np.arange(1, 49, dtype=np.int8).reshape(6, 8),
+    np.asfortranarray(_zero_last),
+    _zero_last[:, ::2],
+    _zero_last[:, 1:].T,
+], ids=["ones", "zero_last", "nan", "bool", "bool_zero", "complex",
+        "complex_zero", "int8", "fortran", "strided", "strided_zero"])
+def test_bool_kernel_matches_np_all(monkeypatch, data):
+    from mathexlab.math import arrays
+    A = arrays.MatlabArray(np.zeros((1, 1)))
+    A._data = data
+    expected = bool(np.all(data))
+    monkeypatch.setattr(arrays, "_JIT_MIN_SIZE", 1)
+    assert bool(A) is expected
+    monkeypatch.setattr(arrays, "_idx_kernels", False)
+    assert bool(A) is expected
+
+
+def test_transpile_unit_reports_function_name():
+    from mathexlab.language.transpiler import transpile_unit
+    _, _, name = transpile_unit("function y = f(x)\ny = x + 1;\nend\n")
+    assert name == "f"
+    _, _, name = transpile_unit("x = 1;\n")
+    assert name is None
+
+
+def test_operator_text_in_string_literal():
+    s = KernelSession()
+    execute("a = '-'; b = '~';", s)
+    assert s.globals["a"] == "-"
+    assert s.globals["b"] == "~"
+
+
+def test_punctuation_tokens_keep_their_line():
+    from mathexlab.language.tokenizer import Tokenizer
+    toks = [t for t in Tokenizer("a(1);\nb(2);\n").tokenize() if t.type == "("]
+    assert [t.line for t in toks] == [1, 2]
+
+
+def test_transpile_cache_returns_private_line_map():
+    from mathexlab.language.transpiler import transpile
+    src = "a = 1;\nb = a + 1;\n"
+    py1, map1 = transpile(src)
+    map1[999] = 1
+    py2, map2 = transpile(src)
+    assert py1 == py2
+    assert 999 not in map2
+
+
+def test_transpile_many_uses_disk_cache(tmp_path):
+    from mathexlab.language import batch
+    paths = []
+    for i in range(3):
+        p = tmp_path / f"f{i}.m"
+        p.write_text(f"function y = f{i}(x)\ny = x + {i};\nend\n")
+        paths.append(str(p))
+    cache = tmp_path / "cache"
+
+    first = batch.transpile_many(paths, max_workers=2, cache_dir=str(cache))
+    assert [first[p][2] for p in paths] == ["f0", "f1", "f2"]
+    assert len(list(cache.glob("*.pkl"))) == 3
+
+    again = batch.transpile_many(paths, max_workers=1, cache_dir=str(cache))
+    assert again == first
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_transpile_many_reports_failures_per_file(tmp_path, monkeypatch, workers):
+    from mathexlab.language import batch
+    good = tmp_path / "g.m"
+    good.write_text("function y = g(x)\ny = x;\nend\n")
+    bad = tmp_path / "b.m"
+    bad.write_text("y = 1;\n")
+    missing = str(tmp_path / "missing.m")
+    paths = [str(good), missing, str(bad)]
+    cache = tmp_path / "cache"
+    if workers == 1:
+        real = batch.transpile_unit
+        def flaky(code):
+            if code.startswith("y"):
+                raise RuntimeError("boom")
+            return real(code)
+        monkeypatch.setattr(batch, "transpile_unit", flaky)
+
+    out = batch.transpile_many(paths, max_workers=workers, cache_dir=str(cache))
+    assert list(out) == paths
+    assert out[str(good)][2] == "g"
+    assert isinstance(out[missing], OSError)
+    if workers == 1:
+        assert isinstance(out[str(bad)], RuntimeError)
+        assert len(list(cache.glob("*.pkl"))) == 1
+    else:
+        assert len(list(cache.glob("*.pkl"))) == 2
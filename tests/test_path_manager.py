@@ -0,0 +1,12 @@
+from mathexlab.kernel import path_manager as pm
+
+
+def test_resolve_sees_new_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    mgr = pm.PathManager()
+
+    assert mgr.resolve("later_fn") is None
+
+    (tmp_path / "later_fn.m").write_text("x = 1;\n")
+    assert mgr.resolve("later_fn") == str(tmp_path / "later_fn.m")
+    assert mgr.resolve("LATER_FN") == str(tmp_path / "later_fn.m")
@@ -43,4 +43,11 @@ def test_linear_solve():
     x = S.mldivide(b)
     
     assert x._data[0,0] == 2
-    assert x._data[1,0] == 3
\ No newline at end of file
+    assert x._data[1,0] == 3
+def test_sparse_logical_mask_index():
+    A = MatlabArray([[1, 2, 3], [4, 5, 6]])
+    mask = MatlabArray(scipy.sparse.csr_matrix(np.array([[True, False, True], [False, True, False]])))
+    # Column-major order, as with a dense mask
+    assert A(mask)._data.flatten().tolist() == [1, 5, 3]
+    A.set_val(0, mask)
+    assert A._data.tolist() == [[0, 2, 0], [4, 0, 6]]